@@ -4,23 +4,64 @@ Created on Jul 9, 2017
 @author: Viktor Simjanoski
 Some correctness checks.
 '''
-import itertools
-
-def assert_rotations_and_distances(rotations, distance_func):
-    "Make sure that the distance between 2 points does not change under a rotation"
-    for rot in rotations:
-        for a, b in itertools.combinations(rot.mapping.keys(), 2):
-            a_image = rot[a]
-            b_image = rot[b]
-            assert abs(distance_func(a, b) - distance_func(a_image, b_image)) < 1e-15
-            if len(a) == 2 and len(b) == 2:
-                ab = a.lower() + b.lower()
-                ba = b.lower() + a.lower()
-                if ab in rot.mapping:
-                    assert (rot[ab] == a_image.lower() + b_image.lower() or
-                            rot[ab] == b_image.lower() + a_image.lower()), \
-                    'a={} b={} ab={} rot[ab]={} a_image={} b_image={}'.format(
-                        a, b, ab, rot[ab], a_image, b_image)
-                elif ba in rot.mapping:
-                    assert (rot[ba] == a_image.lower() + b_image.lower() or
-                            rot[ba] == b_image.lower() + a_image.lower())
+import numpy as np
+from povs_isomeriser.distance_matrix import compile_distance_matrix
+from povs_isomeriser.rotation_group import RotationGroup
+
+
+def _edge_index(vertices):
+    """
+    For the vertices named by 2 characters (like 'A1'), the edge vertex between two of them is
+    named by their lowercase names concatenated in either order (like 'a1b2').
+    Returns the (n, n) int array with the index of the edge vertex between vertices i and j,
+    or -1 if there is none.
+    """
+    index = {v: ix for ix, v in enumerate(vertices)}
+    edges = np.full((len(vertices), len(vertices)), -1, dtype=np.intp)
+    for ix0, a in enumerate(vertices):
+        for ix1, b in enumerate(vertices):
+            if isinstance(a, str) and isinstance(b, str) and len(a) == 2 and len(b) == 2:
+                edge = index.get(a.lower() + b.lower(), index.get(b.lower() + a.lower()))
+                if edge is not None:
+                    edges[ix0, ix1] = edge
+    return edges
+
+
+def assert_rotations_and_distances(rotations, distance_func, tol=1e-15, distances=None):
+    """
+    Make sure that the distance between 2 points does not change under a rotation, and that the
+    edge vertex between 2 vertices (see _edge_index) is rotated into the edge vertex between their images.
+    All the rotations are checked at once: with perms the stacked permutations, the distance matrix
+    rotated by every rotation is distances[perms[:, :, None], perms[:, None, :]], which must equal
+    distances within tol. distances is the precompiled distance matrix of distance_func, if available.
+    rotations is a list of rotations or a RotationGroup, whose stacked permutations are used as they are.
+    """
+    if isinstance(rotations, RotationGroup):
+        vertices = rotations[0].vertices
+        perms = rotations.perms
+    else:
+        rotations = list(rotations)
+        vertices = rotations[0].vertices
+        assert all(rot.vertices == vertices for rot in rotations)
+        perms = np.array([rot.perm for rot in rotations], dtype=np.intp).reshape(len(rotations), len(vertices))
+    if distances is None:
+        distances = compile_distance_matrix(vertices, distance_func)
+    failures = []
+
+    rotated = distances[perms[:, :, None], perms[:, None, :]]
+    for rot_ix, a, b in np.argwhere(np.triu(np.abs(rotated - distances) >= tol, 1)):
+        failures.append('rotation {} moves {}-{} ({}) to {}-{} ({})'.format(
+            rot_ix, vertices[a], vertices[b], distances[a, b], vertices[perms[rot_ix, a]],
+            vertices[perms[rot_ix, b]], rotated[rot_ix, a, b]))
+
+    edges = _edge_index(vertices)
+    starts, ends = np.nonzero(np.triu(edges >= 0, 1))
+    edge_images = perms[:, edges[starts, ends]]
+    expected_images = edges[perms[:, starts], perms[:, ends]]
+    for rot_ix, pair_ix in np.argwhere(edge_images != expected_images):
+        a, b = starts[pair_ix], ends[pair_ix]
+        failures.append('rotation {} moves {}-{} to {}-{} but {} to {}'.format(
+            rot_ix, vertices[a], vertices[b], vertices[perms[rot_ix, a]], vertices[perms[rot_ix, b]],
+            vertices[edges[a, b]], vertices[edge_images[rot_ix, pair_ix]]))
+
+    assert not failures, '\n'.join(failures)
@@ -0,0 +1,37 @@
+'''
+Created on Oct 18, 2026
+
+Writing files atomically: the content goes to a temporary file in the same folder, which then
+replaces the file in one step, so readers (and concurrent runs sharing a cache or a shard
+folder) see either the old file or the whole new one, and a failed write leaves nothing behind.
+'''
+import contextlib
+import os
+import tempfile
+
+
+def default_permissions():
+    """
+    The permissions open() gives a new file: 0o666 without the bits of the process umask.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='wb'):
+    """
+    Yields a file opened with mode ('wb' or 'w') whose content replaces path when the block ends
+    without an exception. tempfile.mkstemp makes files readable by their owner only, so the file
+    gets the permissions of a file made with open() instead (see default_permissions).
+    """
+    handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        os.fchmod(handle, default_permissions())
+        with os.fdopen(handle, mode) as out_file:
+            yield out_file
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -4,14 +4,32 @@ Created on Jul 7, 2017
 @author: Viktor Simjanoski
 '''
 import itertools
+import numpy as np
 
 
-def average_distance(points, distance_func):
+def average_distance(points, distance_func, check=False):
     """
     Given a set of points and their pairwise distances, it calculates the average distances
     between a pair of points, averaged over all C(num_points, 2) pairs.
+    The distances are assumed to be a metric, which should be checked once per geometry with
+    distance_matrix.validate_distance_matrix. check=True asserts symmetry and the triangle
+    inequality for these points on every call, which is only meant for debugging.
     """
-    
+    if check:
+        _assert_metric(points, distance_func)
+
+    # actual calculation happens below
+    total_dist = 0.0
+    all_pairs = list(itertools.combinations(points, 2))
+    for p0, p1 in all_pairs:
+        total_dist += distance_func(p0, p1)
+    if all_pairs:
+        return float(total_dist) / len(all_pairs)
+    else:
+        return 0.0
+
+
+def _assert_metric(points, distance_func):
     for p0, p1 in itertools.combinations(points, 2):  # assert symmetry
         assert abs(distance_func(p0, p1) - distance_func(p1, p0)) < 1e-7, \
          '{} {} {} {}'.format(p0, p1, distance_func(p0, p1), distance_func(p1, p0))
@@ -23,13 +41,20 @@ def average_distance(points, distance_func):
             p1, p2), '{p0}-{p1}={d01}  {p0}-{p2}={d02}  {p1}-{p2}={d12}'.format(
                 p0=p0, p1=p1, p2=p2, d01=distance_func(p0, p1), d02=distance_func(p0, p2),
                 d12=distance_func(p1, p2))
-    
-    # actual calculation happens below
-    total_dist = 0.0
-    all_pairs = list(itertools.combinations(points, 2))
-    for p0, p1 in all_pairs:
-        total_dist += distance_func(p0, p1)
-    if all_pairs:
-        return float(total_dist) / len(all_pairs)
-    else:
+
+
+def average_distance_from_matrix(indices, distances):
+    """
+    The same average as average_distance, for the points with the given indices into the
+    precompiled distance matrix distances (see distance_matrix.compile_distance_matrix):
+    the mean of the upper triangle of the submatrix of the points.
+    The pairs are added one after the other in the order of itertools.combinations (np.cumsum
+    does not reorder the additions like np.sum does), so the result is bit for bit the same as
+    average_distance gives for the points in the order of their indices.
+    """
+    indices = np.asarray(indices, dtype=np.intp)
+    if len(indices) < 2:
         return 0.0
+    upper_rows, upper_columns = np.triu_indices(len(indices), 1)
+    pair_distances = distances[indices[upper_rows], indices[upper_columns]]
+    return float(np.cumsum(pair_distances)[-1]) / len(pair_distances)
@@ -0,0 +1,119 @@
+'''
+Created on Oct 18, 2026
+
+Vectorized canonicalization of whole blocks of colorings with numpy. The masks are the
+same as the ones of BitmaskColorings (the coloring string read as a binary number), so the
+results match the pure-Python path exactly.
+'''
+import itertools
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 1 << 15
+
+
+def permutation_matrix(colorings):
+    """
+    The permutations of all the rotations of colorings (a BitmaskColorings object) stacked into
+    a (num_rotations, num_vertices) array, in the order of colorings.rotations.
+    """
+    return colorings.perms
+
+
+def pack_keys(colors):
+    """
+    Packs the last axis of an array of 0/1 colors into uint64 masks, the first vertex being
+    the most significant bit.
+    """
+    num_vertices = colors.shape[-1]
+    assert num_vertices <= 64, num_vertices
+    packed = np.packbits(colors, axis=-1, bitorder='big').astype(np.uint64)
+    num_bytes = packed.shape[-1]
+    keys = np.zeros(packed.shape[:-1], dtype=np.uint64)
+    for ix in range(num_bytes):
+        keys = (keys << np.uint64(8)) | packed[..., ix]
+    return keys >> np.uint64(8 * num_bytes - num_vertices)
+
+
+def unpack_keys(keys, num_vertices):
+    """
+    The inverse of pack_keys: a (len(keys), num_vertices) uint8 array of colors.
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    shifts = np.arange(num_vertices - 1, -1, -1, dtype=np.uint64)
+    return ((keys[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+def canonical_keys(colors, perms):
+    """
+    colors is a (num_colorings, num_vertices) array of 0/1 colors and perms the stacked permutation
+    matrix. All rotations are applied at once with fancy indexing (the rotated coloring takes the
+    color of vertex perm[ix] into vertex ix), and the canonical key of every coloring is the
+    minimum of the packed keys of its rotations.
+    """
+    return pack_keys(colors[:, perms]).min(axis=1)
+
+
+def combination_blocks(num_vertices, zeros, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yields the combinations of zeros vertex indices, in sorted order, as (block_size, zeros)
+    arrays (the last block may be shorter).
+    """
+    if zeros == 0:  # the single empty combination
+        yield np.zeros((1, 0), dtype=np.intp)
+        return
+    combinations = itertools.combinations(range(num_vertices), zeros)
+    while True:
+        block = np.fromiter(itertools.chain.from_iterable(itertools.islice(combinations, block_size)),
+                            dtype=np.intp)
+        if len(block) == 0:
+            return
+        yield block.reshape(-1, zeros)
+
+
+def zeros_to_colors(zero_indices, num_vertices):
+    """
+    A (len(zero_indices), num_vertices) uint8 array of colors with zeros at the given indices.
+    """
+    colors = np.ones((len(zero_indices), num_vertices), dtype=np.uint8)
+    colors[np.arange(len(zero_indices))[:, None], zero_indices] = 0
+    return colors
+
+
+def batch_unique_masks(colorings, zeros, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    The canonical mask of every orbit of colorings with the given number of zeros, as a sorted
+    uint64 array, where colorings is a BitmaskColorings object. The combinations are processed in
+    blocks of block_size rows, which bounds the peak memory to about
+    block_size * num_rotations * num_vertices bytes.
+    """
+    perms = permutation_matrix(colorings)
+    representatives = [np.zeros(0, dtype=np.uint64)]
+    for block in combination_blocks(colorings.num_vertices, zeros, block_size):
+        colors = zeros_to_colors(block, colorings.num_vertices)
+        representatives.append(np.unique(canonical_keys(colors, perms)))
+    return np.unique(np.concatenate(representatives))
+
+
+def stabilizer_matrix(colorings, masks, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    A (len(masks), num_rotations) bool array whose row i is True for the rotations (numbered like
+    the rotations of colorings) that leave masks[i] unchanged, i.e. for its stabilizer.
+    All the rotations of a block of masks are applied at once, like in canonical_keys.
+    """
+    perms = permutation_matrix(colorings)
+    masks = np.asarray(masks, dtype=np.uint64)
+    stabilizers = np.zeros((len(masks), len(perms)), dtype=bool)
+    for start in range(0, len(masks), block_size):
+        keys = masks[start:start + block_size]
+        colors = unpack_keys(keys, colorings.num_vertices)
+        stabilizers[start:start + len(keys)] = pack_keys(colors[:, perms]) == keys[:, None]
+    return stabilizers
+
+
+def orbit_sizes(colorings, masks, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    The number of colorings in the orbit of every mask, as a uint32 array: the order of the group
+    divided by the order of the stabilizer of the mask.
+    """
+    stabilizer_orders = stabilizer_matrix(colorings, masks, block_size).sum(axis=1)
+    return (len(colorings.rotations) // stabilizer_orders).astype(np.uint32)
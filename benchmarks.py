@@ -0,0 +1,231 @@
+'''
+Created on Oct 18, 2026
+
+Benchmarks of the stages of a run, per geometry and per number of zeros:
+    group       building the rotation group from its generators (all_rotations_combos)
+    check       checking the rotations against the distances (assert_rotations_and_distances)
+    tables      building the enumeration tables (BitmaskColorings)
+    enumerate   finding the canonical colorings of a level, with their orbit sizes and the running
+                sums of their distances (orderly_colorings)
+    score       the average distances of the colorings of a level from scratch, in the order of the
+                original float sum (PairDistances), to compare with the running sums of enumerate
+    write       ranking a level into its result table and writing its text file (write_level)
+on the built-in geometries and on larger synthetic cages made from the coordinates of polyhedra
+(see coordinates.py). The results are written as JSON, and compared with a baseline file:
+python -m povs_isomeriser.benchmarks --out bench.json --baseline old_bench.json
+'''
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from povs_isomeriser.assert_rotations_and_distances import assert_rotations_and_distances
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.coordinates import generators, write_coordinates_spec
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances, PairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.colorings_driver import write_level
+
+_PHI = (1 + 5 ** 0.5) / 2
+
+
+def _signed(point):
+    """
+    All the sign changes of the non-zero coordinates of a point.
+    """
+    options = [(c, -c) if c else (c,) for c in point]
+    return set(itertools.product(*options))
+
+
+def _cyclic(point):
+    return [point, point[1:] + point[:1], point[2:] + point[:2]]
+
+
+def cage_coordinates(name):
+    """
+    The vertices of a polyhedron: cube (8), icosahedron (12), truncated_octahedron (24),
+    icosidodecahedron (30) or truncated_icosahedron (60).
+    """
+    if name == 'cube':
+        points = _signed((1, 1, 1))
+    elif name == 'icosahedron':
+        points = set(p for c in _cyclic((0, 1, _PHI)) for p in _signed(c))
+    elif name == 'truncated_octahedron':
+        points = set(p for c in itertools.permutations((0, 1, 2)) for p in _signed(c))
+    elif name == 'icosidodecahedron':
+        points = set(p for base in ((0, 0, _PHI), (0.5, _PHI / 2, _PHI ** 2 / 2))
+                     for c in _cyclic(base) for p in _signed(c))
+    elif name == 'truncated_icosahedron':
+        points = set(p for base in ((0, 1, 3 * _PHI), (1, 2 + _PHI, 2 * _PHI), (_PHI, 2, _PHI ** 3))
+                     for c in _cyclic(base) for p in _signed(c))
+    else:
+        raise Exception('Unknown cage {}'.format(name))
+    return np.array(sorted(points), dtype=np.float64)
+
+
+# (geometry, max zeros): the built-in geometries and the cages, with levels that run in seconds
+DEFAULT_CASES = [('rbc', 9), ('pseudo_rbc', 9), ('cube', 4), ('icosahedron', 6),
+                 ('truncated_octahedron', 8), ('icosidodecahedron', 6), ('truncated_icosahedron', 4)]
+
+
+def _case_geometry(name):
+    """
+    The compiled Geometry of a built-in geometry or of a cage (through a spec written from its
+    coordinates, see coordinates.py).
+    """
+    if name in ('rbc', 'pseudo_rbc'):
+        return load_geometry(name, False)
+    coords = cage_coordinates(name)
+    names = ['v{:02d}'.format(ix) for ix in range(len(coords))]
+    spec_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(spec_dir, name + '.json')
+        write_coordinates_spec(path, name, names, coords)
+        return load_geometry(path, False)
+    finally:
+        shutil.rmtree(spec_dir)
+
+
+def _case_tables(name):
+    """
+    (generators, rotations, distances) of a built-in geometry or a cage.
+    """
+    geometry = _case_geometry(name)
+    return generators(geometry.group), geometry.rotations, geometry.distances
+
+
+class _Recorder(object):
+    def __init__(self, memory):
+        self.memory = memory
+        self.results = []
+
+    def measure(self, geometry, stage, zeros, func, *args):
+        """
+        Runs func(*args), records its time (and the peak of the memory it allocates) and returns
+        its result.
+        """
+        if self.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*args)
+        seconds = time.perf_counter() - start
+        peak = None
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.results.append({'geometry': geometry, 'stage': stage, 'zeros': zeros,
+                             'seconds': seconds, 'peak_bytes': peak})
+        return result
+
+
+def run_case(recorder, name, max_zeros, out_dir):
+    geometry = _case_geometry(name)
+    geometry.folder_name = out_dir
+    rotations, distances = geometry.rotations, geometry.distances
+    group = recorder.measure(name, 'group', None, all_rotations_combos, generators(geometry.group))
+    assert group == set(rotations), name
+    recorder.measure(name, 'check', None, assert_rotations_and_distances, rotations, None, 1e-15, distances)
+    colorings = recorder.measure(name, 'tables', None, BitmaskColorings, rotations)
+    pair_distances = PairDistances(distances)
+    levels = orderly_scored_levels(colorings, ExactPairDistances(distances), max_zeros)
+    for zeros in range(1, max_zeros + 1):
+        level_zeros, enumerated = recorder.measure(name, 'enumerate', zeros, next, levels)
+        assert level_zeros == zeros
+        scored_masks = recorder.measure(name, 'score', zeros, lambda: [
+            (mask, pair_distances.average_distance(colorings.zero_indices(mask)), orbit_size)
+            for mask, _, orbit_size in enumerated])
+        with contextlib.redirect_stdout(io.StringIO()):
+            recorder.measure(name, 'write', zeros, write_level, geometry, colorings, zeros, scored_masks)
+        for result in recorder.results[-3:]:
+            result['colorings'] = len(enumerated)
+
+
+def run_benchmarks(cases=DEFAULT_CASES, repeat=1, memory=False):
+    """
+    Runs the benchmarks repeat times and returns the results, with the best time of every stage.
+    """
+    best = {}
+    for _ in range(repeat):
+        recorder = _Recorder(memory)
+        out_dir = tempfile.mkdtemp()
+        try:
+            for name, max_zeros in cases:
+                run_case(recorder, name, max_zeros, out_dir)
+        finally:
+            shutil.rmtree(out_dir)
+        for result in recorder.results:
+            key = (result['geometry'], result['stage'], result['zeros'])
+            if key not in best or result['seconds'] < best[key]['seconds']:
+                best[key] = result
+    return {'created': datetime.datetime.now().isoformat(), 'python': platform.python_version(),
+            'numpy': np.__version__, 'machine': platform.machine(), 'repeat': repeat, 'memory': memory,
+            'results': list(best.values())}
+
+
+def compare(results, baseline, threshold=1.25, min_seconds=0.01):
+    """
+    The list of (geometry, stage, zeros, seconds, baseline seconds) of the stages that are more
+    than threshold times slower than in the baseline, leaving out the ones that take less than
+    min_seconds in both.
+    """
+    if results['memory'] != baseline['memory']:
+        raise Exception('Timings with and without --memory cannot be compared')
+    baseline_seconds = {(r['geometry'], r['stage'], r['zeros']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        key = (result['geometry'], result['stage'], result['zeros'])
+        if key not in baseline_seconds:
+            continue
+        seconds, old_seconds = result['seconds'], baseline_seconds[key]
+        if max(seconds, old_seconds) >= min_seconds and seconds > threshold * old_seconds:
+            regressions.append(key + (seconds, old_seconds))
+    return regressions
+
+
+def _print_table(results):
+    totals = {}
+    for result in results['results']:
+        key = (result['geometry'], result['stage'])
+        totals[key] = totals.get(key, 0.0) + result['seconds']
+    for (geometry, stage), seconds in totals.items():
+        print ('{:24} {:10} {:9.4f}s'.format(geometry, stage, seconds))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', help='the JSON file to write the results to')
+    parser.add_argument('--baseline', help='a JSON file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='how many times slower than the baseline is a regression (default 1.25)')
+    parser.add_argument('--repeat', type=int, default=1, help='keep the best of this many runs (default 1)')
+    parser.add_argument('--memory', action='store_true',
+                        help='also record the peak memory of every stage (with tracemalloc, which slows them down)')
+    parser.add_argument('--cases', nargs='+', metavar='NAME:MAX_ZEROS',
+                        help='the geometries (built-in or cages) and their max zeros (default: {})'.format(
+                            ' '.join('{}:{}'.format(*case) for case in DEFAULT_CASES)))
+    args = parser.parse_args()
+    cases = DEFAULT_CASES
+    if args.cases:
+        cases = [(case.split(':')[0], int(case.split(':')[1])) for case in args.cases]
+    results = run_benchmarks(cases, args.repeat, args.memory)
+    _print_table(results)
+    if args.out:
+        with open(args.out, 'w') as out_file:
+            json.dump(results, out_file, indent=1)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for geometry, stage, zeros, seconds, old_seconds in regressions:
+            print ('Regression: {} {} zeros={} {:.4f}s (baseline {:.4f}s)'.format(geometry, stage, zeros, seconds, old_seconds))
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,95 @@
+'''
+Created on Oct 18, 2026
+
+Checkpoints of the orderly enumeration (see orderly_colorings), so that an interrupted run can be
+resumed instead of starting over. A checkpoint records the hash of the geometry, the levels whose
+output files are written, the representatives of the last finished level (the parents of the
+next level), and for the level in progress the number of parents already processed and the
+representatives found so far, with their orbit sizes. The masks are stored as uint64 arrays in an .npz file, which is
+replaced atomically.
+'''
+import os
+import time
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.orderly_colorings import counting_orbit_size, orderly_children
+
+CHECKPOINT_FILE_NAME = 'checkpoint.npz'
+
+
+def write_checkpoint(path, geometry_hash, max_zeros, finished, parents, next_parent, children):
+    """
+    finished is the number of levels whose output is written, parents the masks of the
+    representatives of level finished, next_parent the number of them already processed and
+    children the (mask, orbit_size) found from them.
+    """
+    with atomic_write(path) as out_file:
+        np.savez(out_file, geometry_hash=geometry_hash, max_zeros=max_zeros, finished=finished,
+                 parents=np.array(parents, dtype=np.uint64), next_parent=next_parent,
+                 children=np.array([mask for mask, _ in children], dtype=np.uint64),
+                 children_orbit_sizes=np.array([orbit_size for _, orbit_size in children], dtype=np.uint32))
+
+
+def load_checkpoint(path, geometry_hash, max_zeros):
+    """
+    Returns (finished, parents, next_parent, children) of a checkpoint, as write_checkpoint takes
+    them, after checking that it is for the same geometry and number of levels.
+    """
+    with np.load(path) as data:
+        if str(data['geometry_hash']) != geometry_hash:
+            raise Exception('The checkpoint {} is for a different geometry'.format(path))
+        if int(data['max_zeros']) != max_zeros:
+            raise Exception('The checkpoint {} is for {} zeros, not {}'.format(path, int(data['max_zeros']), max_zeros))
+        return (int(data['finished']), [int(mask) for mask in data['parents']], int(data['next_parent']),
+                list(zip(data['children'].tolist(), data['children_orbit_sizes'].tolist())))
+
+
+def checkpointed_scored_levels(colorings, pair_distances, max_zeros, path, geometry_hash, interval=60.0,
+                               resume=False, clock=time.monotonic, instrumentation=None):
+    """
+    Like orderly_colorings.orderly_scored_levels, but writes a checkpoint to path at the end of every
+    level and every interval seconds during a level. A level counts as finished once the next one is
+    asked for, that is once the caller has written its output. With resume, the levels that were
+    finished are skipped and the level in progress continues where the checkpoint left it.
+    The checkpoint is removed when all the levels are finished.
+    With instrumentation, the counters and the progress are kept like orderly_scored_levels keeps them.
+    """
+    assert colorings.num_vertices <= 64, 'masks are stored as uint64'
+    if resume and os.path.exists(path):
+        finished, parent_masks, next_parent, sized_children = load_checkpoint(path, geometry_hash, max_zeros)
+    else:
+        finished, parent_masks, next_parent, sized_children = 0, [colorings.full_mask], 0, []
+
+    def with_totals(mask, orbit_size=None):
+        zero_indices = colorings.zero_indices(mask)
+        return mask, zero_indices, pair_distances.total(zero_indices), orbit_size
+
+    canonical_orbit_size = None
+    if instrumentation is not None:
+        canonical_orbit_size = counting_orbit_size(colorings, instrumentation)
+    sized = lambda masks: [(mask, orbit_size) for mask, _, _, orbit_size in masks]
+    parents = [with_totals(mask) for mask in parent_masks]
+    children = [with_totals(mask, orbit_size) for mask, orbit_size in sized_children]
+    for zeros in range(finished + 1, max_zeros + 1):
+        last_checkpoint = clock()
+        for parent_ix in range(next_parent, len(parents)):
+            if clock() - last_checkpoint >= interval:
+                write_checkpoint(path, geometry_hash, max_zeros, zeros - 1, [mask for mask, _, _, _ in parents],
+                                 parent_ix, sized(children))
+                last_checkpoint = clock()
+            if instrumentation is not None:
+                instrumentation.progress('enumerate', instrumentation.counters['representatives'] + len(children),
+                                         instrumentation.totals.get('representatives'))
+            parent, parent_indices, parent_total, _ = parents[parent_ix]
+            children.extend(orderly_children(colorings, parent, parent_indices, parent_total, pair_distances,
+                                             canonical_orbit_size))
+        write_checkpoint(path, geometry_hash, max_zeros, zeros - 1, [mask for mask, _, _, _ in parents], len(parents),
+                         sized(children))
+        if instrumentation is not None:
+            instrumentation.count('representatives', len(children))
+        yield zeros, [(mask, pair_distances.average(total, zeros), orbit_size)
+                      for mask, _, total, orbit_size in children]
+        write_checkpoint(path, geometry_hash, max_zeros, zeros, [mask for mask, _, _, _ in children], 0, [])
+        parents, children, next_parent = children, [], 0
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,315 @@
+'''
+Created on Oct 18, 2026
+
+Runs the colorings of a geometry spec (see geometry.py): enumerating and scoring the levels,
+ranking the colorings, writing the output files and parsing the command line. rbc_colorings.py
+and pseudo_rbc_colorings.py run the built-in specs; any other spec file runs with
+python -m povs_isomeriser.colorings_driver path/to/spec.json
+'''
+import argparse
+import collections
+import contextlib
+import datetime
+import os
+import sys
+import numpy as np
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.checkpoint import CHECKPOINT_FILE_NAME, checkpointed_scored_levels
+from povs_isomeriser.cycle_index import count_colorings_by_zeros
+from povs_isomeriser.distance_aggregate import DEFAULT_BINS, aggregate_levels, aggregates_file_name, write_aggregates
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.instrumentation import Instrumentation
+from povs_isomeriser.isomer_index import write_index
+from povs_isomeriser.orderly_colorings import orderly_scored_streams
+from povs_isomeriser.parallel_colorings import parallel_scored_levels
+from povs_isomeriser.ranked_output import RankedColorings
+from povs_isomeriser.result_cache import DEFAULT_MAX_BYTES, ResultCache, result_key
+from povs_isomeriser.result_files import (fill_result_table, result_dtype, result_file_name, text_rows,
+                                          write_results)
+from povs_isomeriser.shard_colorings import run_shard, merged_scored_levels
+
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+
+def scored_levels(colorings, distances, max_zeros, processes=1, instrumentation=None):
+    """
+    Yields (zeros, scored_masks) for zeros from 1 to max_zeros, where scored_masks yields the
+    (mask, average_distance, orbit_size) of the canonical masks with that many zeros. With
+    processes=1 the levels are generated in this process, one from the other (see
+    orderly_colorings), and scored_masks streams them as they are generated, so it must be used up
+    before the next level is asked for. Otherwise the levels are lists made on a pool of processes
+    (see parallel_colorings), which gives exactly the same result.
+    The instrumentation counters are only kept with processes=1.
+    """
+    if processes != 1:
+        return parallel_scored_levels(colorings.group, distances, range(1, max_zeros + 1), processes)
+    return orderly_scored_streams(colorings, ExactPairDistances(distances), max_zeros, instrumentation)
+
+
+def write_colorings(folder_name, file_prefix, zeros, unique_colorings, decimals, count=None):
+    """
+    Writes the ranked (label, average_distance) colorings with the given number of zeros to
+    folder_name/file_prefix_{zeros}zeros_{number of colorings}.txt. unique_colorings can be
+    anything that yields them in order, with a len or with their number given as count.
+    """
+    count = len(unique_colorings) if count is None else count
+    file_name = '{}_{}zeros_{}.txt'.format(file_prefix, zeros, count)
+    with open(f'{folder_name}/{file_name}', 'w') as out_file:
+        for ix, coloring in enumerate(unique_colorings, 1):
+            out_file.write('{}. {} {}\n'.format(ix, coloring[0], np.round(coloring[1], decimals)))
+        print (f'Writing {count} colorings with {zeros} zeros to {file_name}')
+    sys.stdout.flush()
+    return file_name
+
+
+def write_level(geometry, colorings, zeros, scored_masks, top=None, smallest=False, min_dist=None, binary=False,
+                index=False, table=None):
+    """
+    Ranks the (mask, average_distance, orbit_size) scored_masks of a level into its result table (see
+    result_files) and writes the text file of the level to geometry.folder_name, with the labels
+    made while ranking; with binary, the table is also written next to the text file, and with
+    index, the isomer index of the level (see isomer_index). A table that was already made (by a
+    result cache, say) is written as it is, and then scored_masks is not used. Returns the table.
+    """
+    label = lambda mask: geometry.indices_to_string(colorings.zero_indices(mask))
+    if table is None:
+        ranked = RankedColorings(label, top, smallest, min_dist).extend(scored_masks)
+        table = np.zeros(len(ranked), dtype=result_dtype(len(geometry.class_names)))
+        rows = fill_result_table(table, colorings, geometry, ranked.rows())
+    else:
+        rows = text_rows(table, label)
+    write_colorings(geometry.folder_name, geometry.file_prefix, zeros, rows, geometry.decimals, count=len(table))
+    if binary:
+        write_results(os.path.join(geometry.folder_name, result_file_name(geometry.file_prefix, zeros, len(table))),
+                      table, geometry, zeros)
+    if index:
+        write_index(geometry.folder_name, geometry, zeros, table)
+    return table
+
+
+def geometry_colorings(geometry, processes=1, shard_dir=None, top=None, smallest=False, min_dist=None,
+                       binary=False, index=False, instrumentation=None, checkpoint_interval=None, resume=False,
+                       cache=None):
+    """
+    Constructs all the different colorings of a compiled geometry with 1 to geometry.max_zeros
+    zeros and writes them to geometry.folder_name, one file per number of zeros.
+    If shard_dir is given, the levels are merged from the partial results of a sharded run
+    (see geometry_shard) instead of being enumerated.
+    top, smallest and min_dist select the colorings that are written, see RankedColorings.
+    Every level is ranked into a result table and written by write_level; with binary, the table
+    is also written next to the text file, and with index, the isomer index of the level, which
+    needs all the colorings of the level, so it cannot be combined with top or min_dist.
+    With instrumentation (see instrumentation.py), the stages are timed and the counters and
+    the progress are reported.
+    With checkpoint_interval (in seconds), the enumeration is checkpointed to the output folder
+    (see checkpoint.py), and with resume, a run that was interrupted continues from its checkpoint:
+    the levels that were written are skipped.
+    With cache (a result_cache.ResultCache), the ranked levels are looked up in the cache and the
+    missing ones stored in it; when all of them are there, nothing is enumerated. With cache or
+    resume, the files of an existing output folder are written over.
+    """
+    if index and (top is not None or min_dist is not None):
+        raise Exception('The isomer index needs all the colorings of a level, '
+                        'so it cannot be written with top or min_dist')
+    folder_name = geometry.folder_name
+    checkpoint_path = os.path.join(folder_name, CHECKPOINT_FILE_NAME)
+    if os.path.isdir(folder_name) and not resume and cache is None:
+        print (f"The output directory {folder_name} alredy exists, you can see it inside this folder.\nPlease rename it"+
+                   " or delete it if you want to regenerate the output, or pass --resume to continue an interrupted run"+
+                   " or --result-cache to write it again from the cache.\nOtherwise I am not doing anything. Exiting now.")
+        return
+    if resume and os.path.isdir(folder_name) and not os.path.exists(checkpoint_path):
+        print (f"There is no checkpoint in {folder_name}, so there is nothing to resume. Exiting now.")
+        return
+    if resume and checkpoint_interval is None:
+        checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL
+    with _stage(instrumentation, 'tables'):
+        colorings = BitmaskColorings(geometry.group)
+        expected_counts = count_colorings_by_zeros(colorings.group)
+    # number of zeros is number of vertices in a particular color, then ones is the number of the other color
+    # you can think of it as blue color=zero red color=one
+    cached = {}
+    if cache is not None:
+        keys = {zeros: result_key(geometry, zeros, top, smallest, min_dist) for zeros in range(1, geometry.max_zeros + 1)}
+        cached = {zeros: cache.get(key) for zeros, key in keys.items()}
+    if cached and all(table is not None for table in cached.values()):
+        levels = ((zeros, None) for zeros in range(1, geometry.max_zeros + 1))  # nothing to enumerate
+    elif checkpoint_interval is not None:
+        if processes != 1 or shard_dir is not None:
+            raise Exception('Only runs in a single process can be checkpointed and resumed')
+        levels = checkpointed_scored_levels(colorings, ExactPairDistances(geometry.distances), geometry.max_zeros,
+                                            checkpoint_path, geometry.hash, checkpoint_interval, resume,
+                                            instrumentation=instrumentation)
+    elif shard_dir is None:
+        levels = scored_levels(colorings, geometry.distances, geometry.max_zeros, processes, instrumentation)
+    else:
+        levels = merged_scored_levels(colorings, shard_dir, geometry.hash)
+    if instrumentation is not None:
+        total = sum(expected_counts[1:geometry.max_zeros + 1])
+        instrumentation.totals['representatives'] = total
+        levels = instrumentation.timed_streams('enumerate', levels,
+                                               lambda zeros: {'zeros': zeros, 'colorings': expected_counts[zeros]})
+    os.makedirs(folder_name, exist_ok=True)
+    done = 0
+    counts = collections.Counter()
+    for zeros, scored_masks in levels:
+        with _stage(instrumentation, 'write', zeros=zeros):
+            table = write_level(geometry, colorings, zeros, _counted(scored_masks, counts, zeros), top, smallest,
+                                min_dist, binary, index, cached.get(zeros))
+            if cached.get(zeros) is None:
+                assert counts[zeros] == expected_counts[zeros], (counts[zeros], expected_counts[zeros])
+                if cache is not None:
+                    cache.put(keys[zeros], table, geometry, zeros)
+        if instrumentation is not None:
+            done += expected_counts[zeros]
+            instrumentation.count('orbit_members', int(table['orbit_size'].sum()))
+            instrumentation.progress('levels', done, total, force=True)
+    if cache is not None:
+        print ('Result cache: {hits} hits, {misses} misses, {writes} writes, {evictions} evictions'.format(**cache.stats()))
+    if instrumentation is not None:
+        instrumentation.summary()
+
+
+def geometry_aggregates(geometry, processes=1, num_bins=DEFAULT_BINS):
+    """
+    Writes the distance aggregates of every level of a geometry (see distance_aggregate) to
+    geometry.folder_name/{file_prefix}_distances.json instead of the lists of colorings, which are
+    never made. Returns the aggregates, by number of zeros.
+    """
+    path = os.path.join(geometry.folder_name, aggregates_file_name(geometry.file_prefix))
+    if os.path.exists(path):
+        print (f"The file {path} alredy exists.\nPlease rename it or delete it if you want to regenerate it."+
+               "\nOtherwise I am not doing anything. Exiting now.")
+        return None
+    colorings = BitmaskColorings(geometry.group)
+    expected_counts = count_colorings_by_zeros(colorings.group)
+    aggregates = {}
+    for zeros, aggregate in aggregate_levels(colorings, geometry.distances, geometry.max_zeros, processes, num_bins):
+        assert aggregate.count == expected_counts[zeros], (aggregate.count, expected_counts[zeros])
+        aggregates[zeros] = aggregate
+        print ('{} colorings with {} zeros: average distances from {} to {}, {} distinct'.format(
+            aggregate.count, zeros, np.round(aggregate.minimum, geometry.decimals),
+            np.round(aggregate.maximum, geometry.decimals), len(aggregate.ties)))
+        sys.stdout.flush()
+    os.makedirs(geometry.folder_name, exist_ok=True)
+    write_aggregates(path, aggregates, geometry.name, geometry.decimals)
+    print (f'Writing the distance aggregates to {path}')
+    return aggregates
+
+
+def _counted(scored_masks, counts, zeros):
+    """
+    Yields the scored masks of a level, keeping their running total in counts[zeros].
+    """
+    for scored in scored_masks or ():
+        counts[zeros] += 1
+        yield scored
+
+
+def _stage(instrumentation, name, **fields):
+    if instrumentation is None:
+        return contextlib.nullcontext()
+    return instrumentation.stage(name, **fields)
+
+
+def geometry_shard(geometry, shard, num_shards, shard_dir, processes=1):
+    """
+    Runs only shard number shard (counting from 0) of num_shards of the enumeration and writes
+    its partial result to shard_dir. Once all the shards are done,
+    geometry_colorings(geometry, shard_dir=shard_dir) writes the output files.
+    """
+    colorings = BitmaskColorings(geometry.group)
+    path = run_shard(colorings, geometry.distances, range(1, geometry.max_zeros + 1), shard, num_shards,
+                     shard_dir, processes=processes, geometry_hash=geometry.hash)
+    print (f'Writing shard {shard} of {num_shards} to {path}')
+
+
+def run(geometry, args):
+    """
+    Runs a geometry in the mode given on the command line (see parse_args).
+    """
+    print ("Started at ", datetime.datetime.now())
+    with contextlib.ExitStack() as stack:
+        instrumentation = None
+        if args.instrument is not None:
+            stream = sys.stderr if args.instrument == '-' else stack.enter_context(open(args.instrument, 'w'))
+            instrumentation = Instrumentation(stream, args.progress_interval)
+        cache = None
+        if args.result_cache is not None:
+            cache = ResultCache(args.result_cache or None, int(args.result_cache_size * (1 << 20)))
+        if args.shard is not None:
+            geometry_shard(geometry, args.shard[0], args.shard[1], args.shard_dir, processes=args.processes)
+        elif args.aggregate:
+            geometry_aggregates(geometry, processes=args.processes, num_bins=args.bins)
+        else:
+            geometry_colorings(geometry, processes=args.processes, shard_dir=args.merge, top=args.top,
+                               smallest=args.smallest, min_dist=args.min_distance, binary=args.binary,
+                               index=args.index, instrumentation=instrumentation,
+                               checkpoint_interval=args.checkpoint, resume=args.resume, cache=cache)
+    print ("Finished at ", datetime.datetime.now())
+
+
+def parse_args(description, argv=None, geometry_arg=False):
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    if geometry_arg:
+        parser.add_argument('geometry', help='the name of a built-in geometry or the path of a spec file')
+        parser.add_argument('--cache-dir', help='where the compiled specs are kept '
+                            '(default: $POVS_ISOMERISER_CACHE or ~/.cache/povs_isomeriser)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='number of worker processes (0 for one per CPU, default 1)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--shard', type=_shard_arg, metavar='I/N',
+                      help='only run shard I of N (counting from 0) and write its partial result to --shard-dir')
+    mode.add_argument('--merge', metavar='SHARD_DIR',
+                      help='write the output files from the partial results of all the shards in SHARD_DIR')
+    mode.add_argument('--aggregate', action='store_true',
+                      help='only write the distribution of the average distances of every level, not the colorings '
+                      '(see distance_aggregate.py)')
+    parser.add_argument('--shard-dir', default='shards', help='where --shard writes (default: shards)')
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS,
+                        help='the number of histogram bins of --aggregate (default {})'.format(DEFAULT_BINS))
+    parser.add_argument('--top', type=int, metavar='K',
+                        help='only write the K most dispersed colorings of every level')
+    parser.add_argument('--smallest', action='store_true', help='rank from the least dispersed colorings instead')
+    parser.add_argument('--min-distance', type=float, metavar='D',
+                        help='only write the colorings with an average distance of at least D')
+    parser.add_argument('--binary', action='store_true',
+                        help='also write every level as a binary result file (see result_files.py)')
+    parser.add_argument('--index', action='store_true',
+                        help='also write the isomer index of every level (see isomer_index.py), '
+                        'which needs all the colorings, so not with --top or --min-distance')
+    parser.add_argument('--checkpoint', type=float, metavar='SECONDS',
+                        help='checkpoint the enumeration to the output folder every SECONDS and after every level')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run from the checkpoint in its output folder')
+    parser.add_argument('--result-cache', nargs='?', const='', metavar='DIR',
+                        help='look the ranked levels up in a result cache and store the missing ones there '
+                        '(default DIR: the results folder of the spec cache, see result_cache.py)')
+    parser.add_argument('--result-cache-size', type=float, default=DEFAULT_MAX_BYTES / (1 << 20), metavar='MB',
+                        help='the size cap of the result cache (default {})'.format(DEFAULT_MAX_BYTES >> 20))
+    parser.add_argument('--instrument', metavar='FILE',
+                        help='write counters, stage timings and progress as JSON lines to FILE (- for stderr)')
+    parser.add_argument('--progress-interval', type=float, default=5.0, metavar='SECONDS',
+                        help='the least time between two progress reports (default 5)')
+    args = parser.parse_args(argv)
+    if args.index and (args.top is not None or args.min_distance is not None):
+        parser.error('--index needs all the colorings of every level, '
+                     'so it cannot be used with --top or --min-distance')
+    return args
+
+
+def _shard_arg(value):
+    try:
+        shard, num_shards = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected I/N, got {}'.format(value))
+    if not 0 <= shard < num_shards:
+        raise argparse.ArgumentTypeError('expected 0 <= I < N, got {}'.format(value))
+    return shard, num_shards
+
+
+if __name__ == '__main__':
+    args = parse_args(__doc__, geometry_arg=True)
+    run(load_geometry(args.geometry, args.cache_dir), args)
@@ -3,7 +3,6 @@ Created on Jul 3, 2017
 
 @author: Viktor Simjanoski
 '''
-import itertools
 from povs_isomeriser.rotation import Rotation
 
 def compose_rotations(rotations):
@@ -15,26 +14,37 @@ def compose_rotations(rotations):
     
     assert isinstance(rotations, (list, tuple)), rotations
     assert all(isinstance(rot, Rotation) for rot in rotations)
-    keys = tuple(sorted(rotations[0].mapping.keys()))
+    table = rotations[0].table
     for rot in rotations:  # all have same elements
-        assert keys == tuple(sorted(rot.mapping.keys()))
-        
-    mapping = {k:k for k in keys}
-    for rot in reversed(rotations):
-        mapping = {k:rot[v] for k, v in mapping.items()}
-    return Rotation(mapping)
+        assert rot.table is table
+
+    composed = Rotation.identity(table)
+    for rot in rotations:
+        composed = composed * rot
+    return composed
 
 def all_rotations_combos(base_rotations):
     """
     Generate all possible different combinations that can be obtained by combining base_rtations.
     base_rotations is a list of Rotation objectss. 
+    The group is built as the closure of base_rotations: starting from the identity, every
+    newly found rotation is multiplied by each base rotation (breadth first), until no new
+    rotations appear. This costs about len(group) * len(base_rotations) compositions.
     """
     assert isinstance(base_rotations, (list, tuple))
-    all_rotations = set()
-    for rotations in itertools.permutations(base_rotations):
-        powers = [list(range(rot.degree)) for rot in rotations]
-        powers_combos = itertools.product(*powers)
-        for powers_combo in powers_combos:
-            powered_rotations = [rot.power(p) for rot, p in zip(rotations, powers_combo)]
-            all_rotations.add(compose_rotations(powered_rotations))
+    assert all(isinstance(rot, Rotation) for rot in base_rotations)
+    table = base_rotations[0].table
+    assert all(rot.table is table for rot in base_rotations)
+    identity = Rotation.identity(table)
+    all_rotations = set([identity])
+    frontier = [identity]
+    while frontier:
+        new_rotations = []
+        for rot in frontier:
+            for base_rot in base_rotations:
+                composed = base_rot * rot
+                if composed not in all_rotations:
+                    all_rotations.add(composed)
+                    new_rotations.append(composed)
+        frontier = new_rotations
     return all_rotations
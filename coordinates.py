@@ -0,0 +1,213 @@
+'''
+Created on Oct 18, 2026
+
+Deriving a geometry from the Cartesian coordinates of the substitution sites instead of typing
+the rotations and the distances in by hand. The distance matrix is the matrix of Euclidean
+distances, the rotation group is the proper-rotation point group of the sites (found by matching
+candidate rotations against the coordinates within a tolerance) and the site classes are the
+orbits of the group. The result is written as a spec file (see geometry.py):
+python -m povs_isomeriser.coordinates cluster.xyz name spec.json --elements O
+'''
+import argparse
+import numpy as np
+from povs_isomeriser.rotation import Rotation, VertexTable
+from povs_isomeriser.rotation_group import RotationGroup
+from povs_isomeriser.geometry import write_spec
+
+DEFAULT_TOL = 1e-3
+
+
+def read_xyz(path, elements=None):
+    """
+    Reads an XYZ file (number of atoms, comment line, then one 'element x y z' line per atom).
+    Returns (names, species, coords) for the atoms of the given elements (all by default): the
+    names number the atoms of each element in file order (O1, O2, ...), species is the list of
+    their elements and coords the (num atoms, 3) array of their coordinates.
+    """
+    with open(path) as xyz_file:
+        lines = xyz_file.read().splitlines()
+    num_atoms = int(lines[0].split()[0])
+    names, species, coords = [], [], []
+    counts = {}
+    for line in lines[2:2 + num_atoms]:
+        element, x, y, z = line.split()[:4]
+        counts[element] = counts.get(element, 0) + 1
+        if elements is None or element in elements:
+            names.append('{}{}'.format(element, counts[element]))
+            species.append(element)
+            coords.append((float(x), float(y), float(z)))
+    assert len(names) > 0, 'No atoms of {} in {}'.format(elements, path)
+    return names, species, np.array(coords, dtype=np.float64)
+
+
+def coordinate_distances(coords):
+    """
+    The matrix of the Euclidean distances between all the points.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    return np.linalg.norm(coords[:, np.newaxis, :] - coords[np.newaxis, :, :], axis=-1)
+
+
+def _frame(p, q):
+    """
+    The orthonormal frame (as the rows of a matrix) built from two non-collinear vectors.
+    """
+    e1 = p / np.linalg.norm(p)
+    e2 = q - np.dot(q, e1) * e1
+    e2 = e2 / np.linalg.norm(e2)
+    return np.array([e1, e2, np.cross(e1, e2)])
+
+
+def _match(rotated, centered, species, tol):
+    """
+    The permutation taking every point to the point it is rotated onto, or None if some point is
+    not rotated onto a point of the same species.
+    """
+    gaps = np.linalg.norm(rotated[:, np.newaxis, :] - centered[np.newaxis, :, :], axis=-1)
+    perm = gaps.argmin(axis=1)
+    if (gaps[np.arange(len(perm)), perm] > tol).any() or len(set(perm.tolist())) < len(perm):
+        return None
+    if any(species[ix] != species[image] for ix, image in enumerate(perm.tolist())):
+        return None
+    return perm
+
+
+def point_group_permutations(coords, species=None, tol=DEFAULT_TOL):
+    """
+    The proper rotations about the centroid that map the points onto themselves (within tol, and
+    every point onto a point of the same species), as the sorted list of their permutations:
+    perm[i] is the index of the point that point i is rotated onto.
+    A rotation is fixed by the images of two non-collinear points p and q, so the candidates are
+    the pairs (p', q') with the lengths and angle of (p, q); each candidate rotation is checked
+    against all the points at once.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    species = list(species) if species is not None else [None] * len(coords)
+    centered = coords - coords.mean(axis=0)
+    norms = np.linalg.norm(centered, axis=1)
+    scale = max(norms.max(), 1.0)
+    p_ix = int(norms.argmax())
+    p = centered[p_ix]
+    crosses = np.linalg.norm(np.cross(centered, p), axis=1) / scale
+    assert crosses.max() > tol, 'The points are collinear, the rotation group is infinite'
+    q_ix = int(crosses.argmax())
+    q = centered[q_ix]
+    frame = _frame(p, q)
+
+    perms = set()
+    for p_image in np.flatnonzero(np.abs(norms - norms[p_ix]) <= tol):
+        for q_image in np.flatnonzero(np.abs(norms - norms[q_ix]) <= tol):
+            if (species[p_image] != species[p_ix] or species[q_image] != species[q_ix]
+                    or abs(np.dot(centered[p_image], centered[q_image]) - np.dot(p, q)) > tol * scale):
+                continue
+            if np.linalg.norm(np.cross(centered[p_image], centered[q_image])) / scale <= tol:
+                continue
+            rotation = _frame(centered[p_image], centered[q_image]).T @ frame
+            perm = _match(centered @ rotation.T, centered, species, tol)
+            if perm is not None:
+                perms.add(tuple(perm.tolist()))
+    return sorted(perms)
+
+
+def symmetrize_distances(distances, perms):
+    """
+    Makes the distance matrix exactly symmetric and exactly invariant under the rotations: all the
+    pairs in an orbit of the group get the distance of the first pair of the orbit, so that float
+    noise in the coordinates does not split ties between equivalent pairs.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    num_vertices = len(distances)
+    pair_ids = np.arange(num_vertices * num_vertices).reshape(num_vertices, num_vertices)
+    orbit_ids = pair_ids.copy()
+    for perm in perms:
+        perm = np.asarray(perm)
+        orbit_ids = np.minimum(orbit_ids, pair_ids[np.ix_(perm, perm)])
+    orbit_ids = np.minimum(orbit_ids, orbit_ids.T)
+    return distances.ravel()[orbit_ids]
+
+
+def generators(rotations):
+    """
+    A small set of rotations that generates the group of rotations: the rotations are taken from
+    the highest degree down, and one is kept if it is not in the group of the ones kept so far.
+    rotations is a RotationGroup or a closed set of rotations.
+    """
+    group = RotationGroup.of(rotations)
+    kept = []
+    generated = set([0])
+    for element in sorted(range(len(group)), key=lambda element: (-group.orders[element], group[element].perm)):
+        if element not in generated:
+            kept.append(element)
+            generated = set(group.subgroup(kept))
+    return [group[element] for element in kept]
+
+
+def site_classes(rotations):
+    """
+    The orbits of the vertices under the group of rotations, as sorted lists of vertices, in the
+    order of their first vertex. rotations is a RotationGroup or a closed set of rotations.
+    """
+    group = RotationGroup.of(rotations)
+    vertices = group[0].vertices
+    orbit_of = {}
+    orbits = []
+    for ix, vertex in enumerate(vertices):
+        if vertex not in orbit_of:
+            orbit = sorted(set(vertices[image] for image in group.perms[:, ix].tolist()))
+            orbits.append(orbit)
+            for member in orbit:
+                orbit_of[member] = len(orbits) - 1
+    return orbits
+
+
+def geometry_from_coordinates(names, coords, species=None, tol=DEFAULT_TOL):
+    """
+    The rotations (all of the group), the distance matrix (indexed like the sorted names) and the
+    site classes of the points with the given names and coordinates.
+    """
+    assert len(set(names)) == len(names), 'The names of the points must be different'
+    order = sorted(range(len(names)), key=lambda ix: names[ix])
+    coords = np.asarray(coords, dtype=np.float64)[order]
+    species = [species[ix] for ix in order] if species is not None else None
+    table = VertexTable.get(names)
+    perms = point_group_permutations(coords, species, tol)
+    group = RotationGroup(Rotation.from_permutation(perm, table) for perm in perms)
+    distances = symmetrize_distances(coordinate_distances(coords), perms)
+    return group.elements, distances, site_classes(group)
+
+
+def write_coordinates_spec(path, name, names, coords, species=None, tol=DEFAULT_TOL, class_names=None,
+                           decimals=None, output=None):
+    """
+    Writes the spec file of the points with the given names and coordinates. The site classes are
+    named class_names (by default 1, 2, ...) and their vertices are labelled 1, 2, ... in order.
+    With decimals, the distances are rounded to that many decimals.
+    Returns the spec.
+    """
+    rotations, distances, orbits = geometry_from_coordinates(names, coords, species, tol)
+    class_names = class_names or [str(ix) for ix in range(1, len(orbits) + 1)]
+    assert len(class_names) == len(orbits), 'There are {} site classes: {}'.format(len(orbits), orbits)
+    if decimals is not None:
+        distances = np.round(distances, decimals)
+    return write_spec(path, name,
+                      [(class_name, {vertex: label for label, vertex in enumerate(orbit, 1)})
+                       for class_name, orbit in zip(class_names, orbits)],
+                      generators(rotations), distances=distances, group_order=len(rotations), output=output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('xyz', help='the XYZ file of the cluster')
+    parser.add_argument('name', help='the name of the geometry')
+    parser.add_argument('spec', help='the spec file to write')
+    parser.add_argument('--elements', nargs='+', help='the elements of the substitution sites (default: all atoms)')
+    parser.add_argument('--tol', type=float, default=DEFAULT_TOL,
+                        help='how far a rotated site may be from a site (default: {})'.format(DEFAULT_TOL))
+    parser.add_argument('--class-names', nargs='+', help='the names of the site classes (default: 1, 2, ...)')
+    parser.add_argument('--decimals', type=int, help='round the distances to this many decimals')
+    args = parser.parse_args()
+    names, species, coords = read_xyz(args.xyz, args.elements)
+    spec = write_coordinates_spec(args.spec, args.name, names, coords, species, args.tol, args.class_names,
+                                  args.decimals)
+    print ('Found {} rotations and {} site classes of {} sites, wrote {}'.format(
+        spec['group_order'], len(spec['site_classes']), len(names), args.spec))
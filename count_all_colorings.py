@@ -3,33 +3,219 @@ Created on Jul 3, 2017
 
 @author: Viktor Simjanoski
 '''
-import sys
 import itertools
+import numpy as np
+from povs_isomeriser.batch_colorings import batch_unique_masks
+from povs_isomeriser.rotation_group import RotationGroup
 
-def count_all_colorings(all_rotations, zeros, ones):
+
+class BitmaskColorings(object):
+    """
+    Colorings with 2 colors ('0' and '1') of the vertices that all_rotations act on, encoded
+    as integer masks. The mask of a coloring is its coloring string (the colors of the sorted
+    vertices) read as a binary number, so the first vertex is the most significant bit and
+    the vertices colored '1' are the set bits.
+    Every rotation is precompiled into byte lookup tables that move the bits of a mask, so
+    rotating a coloring is a handful of integer operations. The canonical representative of
+    an orbit is its minimum mask, which is also the coloring that is found first when the
+    combinations of zero indices are iterated in sorted order.
+    all_rotations is a RotationGroup, which is used as it is, or a set of rotations; either way
+    the rotations are sorted by their permutations, so they are numbered like the elements of a
+    RotationGroup. The orbits and the canonical masks are only meaningful if the rotations are
+    closed under composition (so the identity is one of them), but a plain set is not checked:
+    its RotationGroup, whose Cayley table is not needed to rotate colorings, is only built (and
+    raises if the set is not closed) when the group attribute is first used.
+    """
+    def __init__(self, all_rotations):
+        if isinstance(all_rotations, RotationGroup):
+            self._group = all_rotations
+            self.rotations = all_rotations.elements
+            self.perms = all_rotations.perms
+        else:
+            self._group = None
+            self.rotations = sorted(all_rotations, key=lambda rot: rot.perm)
+            self.perms = np.array([rot.perm for rot in self.rotations], dtype=np.intp)
+        self.vertices = self.rotations[0].vertices
+        self.num_vertices = len(self.vertices)
+        self.full_mask = (1 << self.num_vertices) - 1
+        self._bits = [1 << (self.num_vertices - 1 - ix) for ix in range(self.num_vertices)]
+        self._tables = [self._bit_tables(perm) for perm in self.perms.tolist()]
+
+    @property
+    def group(self):
+        """
+        The RotationGroup of the rotations, which raises an Exception if they are not closed.
+        """
+        if self._group is None:
+            self._group = RotationGroup(self.rotations)
+        return self._group
+
+    def _bit_tables(self, perm):
+        """
+        The rotated coloring takes the color of vertex perm[ix] into vertex ix. For every byte
+        of the mask, tabulate where the bits of all 256 possible values of that byte end up.
+        """
+        n = self.num_vertices
+        destination = [0] * n
+        for ix, p in enumerate(perm):  # the bit of vertex p moves to the bit of vertex ix
+            destination[n - 1 - p] = n - 1 - ix
+        tables = []
+        for shift in range(0, n, 8):
+            bits = destination[shift:shift + 8]
+            table = [0] * 256
+            for value in range(256):
+                for bit, bit_destination in enumerate(bits):
+                    if (value >> bit) & 1:
+                        table[value] |= 1 << bit_destination
+            tables.append((shift, table))
+        return tables
+
+    def to_mask(self, zero_indices):
+        mask = self.full_mask
+        for ix in zero_indices:
+            mask ^= self._bits[ix]
+        return mask
+
+    def zero_indices(self, mask):
+        return tuple(ix for ix, bit in enumerate(self._bits) if not mask & bit)
+
+    def to_string(self, mask):
+        return format(mask, '0{}b'.format(self.num_vertices))
+
+    def to_coloring(self, mask):
+        """
+        The coloring in the form count_all_colorings returns it: a tuple of (vertex, color) pairs
+        sorted by vertex.
+        """
+        return tuple(zip(self.vertices, self.to_string(mask)))
+
+    def rotate(self, mask, rotation_index):
+        rotated = 0
+        for shift, table in self._tables[rotation_index]:
+            rotated |= table[(mask >> shift) & 255]
+        return rotated
+
+    def orbit(self, mask):
+        orbit = set()
+        for tables in self._tables:
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            orbit.add(rotated)
+        return orbit
+
+    def orbit_and_stabilizer(self, mask):
+        """
+        The orbit of mask and its stabilizer, the sorted element numbers of the rotations that
+        leave it unchanged, found in the same pass over the rotations. The size of the orbit is
+        the order of the group divided by the order of the stabilizer.
+        """
+        orbit = set()
+        stabilizer = []
+        for element, tables in enumerate(self._tables):
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            orbit.add(rotated)
+            if rotated == mask:
+                stabilizer.append(element)
+        return orbit, tuple(stabilizer)
+
+    def canonical(self, mask):
+        return min(self.orbit(mask))
+
+    def is_canonical(self, mask):
+        for tables in self._tables:
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            if rotated < mask:
+                return False
+        return True
+
+    def is_canonical_counted(self, mask):
+        """
+        Like is_canonical, but returns (is_canonical, the number of rotations applied).
+        """
+        for applied, tables in enumerate(self._tables, 1):
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            if rotated < mask:
+                return False, applied
+        return True, len(self._tables)
+
+    def canonical_orbit_size(self, mask):
+        """
+        The size of the orbit of mask if it is canonical, and 0 otherwise. The rotations that
+        leave a canonical mask unchanged are counted in the same pass as is_canonical makes, and
+        the size of the orbit is the order of the group divided by their number.
+        """
+        fixed = 0
+        for tables in self._tables:
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            if rotated < mask:
+                return 0
+            if rotated == mask:
+                fixed += 1
+        return len(self._tables) // fixed
+
+    def canonical_orbit_size_counted(self, mask):
+        """
+        Like canonical_orbit_size, but returns (orbit size or 0, the number of rotations applied).
+        """
+        fixed = 0
+        for applied, tables in enumerate(self._tables, 1):
+            rotated = 0
+            for shift, table in tables:
+                rotated |= table[(mask >> shift) & 255]
+            if rotated < mask:
+                return 0, applied
+            if rotated == mask:
+                fixed += 1
+        return len(self._tables) // fixed, len(self._tables)
+
+    def unique_masks(self, zeros):
+        """
+        Yields the canonical mask of every orbit of colorings with the given number of zeros,
+        in the order of their sorted zero indices.
+        """
+        for zero_indices in itertools.combinations(range(self.num_vertices), zeros):
+            mask = self.to_mask(zero_indices)
+            if self.is_canonical(mask):
+                yield mask
+
+
+def count_all_colorings(all_rotations, zeros, ones, block_size=None, stabilizers=False):
     """
     Counts all distinct colorings subject to all_rotiations, with a specific
-    numbers of zeros and ones. Assumes there are 2 colors.
+    numbers of zeros and ones. Assumes there are 2 colors, and that all_rotations are closed
+    under composition (see BitmaskColorings).
+    Returns the set of unique colorings, as tuples of (vertex, color) pairs, and the set of
+    the coloring strings of all their rotations. With stabilizers, also returns a dictionary
+    mapping every unique coloring to its (orbit size, stabilizer), see orbit_and_stabilizer.
+    If block_size is given, the colorings are canonicalized with numpy, block_size combinations
+    at a time (see batch_colorings.batch_unique_masks).
     """
-    vertices = sorted(list(all_rotations)[0].mapping.keys())
-    assert (rot.mapping.keys() == vertices for rot in all_rotations)
-    vertices = sorted(vertices)
-    colors = ['0'] * zeros + ['1'] * ones
-    assert len(colors) == len(vertices), '{} vs {}'.format(colors, vertices)
+    colorings = BitmaskColorings(all_rotations)
+    assert zeros + ones == colorings.num_vertices, '{} + {} vs {}'.format(
+        zeros, ones, colorings.vertices)
+    if block_size is None:
+        masks = colorings.unique_masks(zeros)
+    else:
+        masks = (int(mask) for mask in batch_unique_masks(colorings, zeros, block_size))
     unique_colorings = set()
     all_colorings = set()
-    for zero_indices in sorted(list(itertools.combinations(range(len(colors)), zeros))):
-        colors_perm=['1']*len(colors)
-        for ix in zero_indices:
-            colors_perm[ix]='0'
-        sys.stdout.flush()
-        coloring = {v:c for v, c in zip(vertices, colors_perm)}
-        coloring_str = ''.join(vc[1] for vc in sorted(coloring.items(), key=lambda pair: pair[0]))
-        if coloring_str not in all_colorings:
-            unique_colorings.add(tuple(sorted(coloring.items(), key=lambda pair:pair[0])))
-            for rot in all_rotations:
-                rotated_coloring = {v:coloring[rot[v]] for v, c in coloring.items()}
-                rotated_coloring = ''.join(vc[1] for vc in sorted(rotated_coloring.items(), key=lambda pair: pair[0]))
-                all_colorings.add(rotated_coloring)
+    orbit_stabilizers = {}
+    for mask in masks:
+        coloring = colorings.to_coloring(mask)
+        unique_colorings.add(coloring)
+        orbit, stabilizer = colorings.orbit_and_stabilizer(mask)
+        all_colorings.update(colorings.to_string(rotated) for rotated in orbit)
+        if stabilizers:
+            orbit_stabilizers[coloring] = (len(orbit), stabilizer)
+    if stabilizers:
+        return unique_colorings, all_colorings, orbit_stabilizers
     return unique_colorings, all_colorings
-                 
@@ -0,0 +1,102 @@
+'''
+Created on Oct 18, 2026
+
+Counting distinct colorings with Burnside's lemma and Polya's cycle index, without
+enumerating them.
+'''
+import collections
+from povs_isomeriser.rotation_group import RotationGroup
+
+
+def cycle_index(all_rotations):
+    """
+    The cycle index of the group all_rotations, as a dictionary mapping a cycle type
+    (the cycle lengths of a rotation, in decreasing order) to the number of rotations of that
+    type. The coefficients of the cycle index polynomial are these numbers divided by len(all_rotations).
+    """
+    if isinstance(all_rotations, RotationGroup):
+        return all_rotations.cycle_index()
+    return dict(collections.Counter(rot.cycle_type for rot in all_rotations))
+
+
+def _fixed_colorings(cycle_type, num_colors):
+    """
+    The number of colorings fixed by a rotation of the given cycle type, for every color multiset:
+    the coefficients of the product over the cycles of (x_1^length + ... + x_num_colors^length).
+    Returns a dictionary mapping tuples of color counts to numbers of colorings.
+    """
+    polynomial = {(0,) * num_colors: 1}
+    for length in cycle_type:
+        product = collections.defaultdict(int)
+        for counts, coefficient in polynomial.items():
+            for color in range(num_colors):
+                new_counts = list(counts)
+                new_counts[color] += length
+                product[tuple(new_counts)] += coefficient
+        polynomial = product
+    return polynomial
+
+
+def pattern_inventory(all_rotations, num_colors=2):
+    """
+    Substitutes x_1 + ... + x_num_colors into the cycle index. Returns a dictionary mapping every
+    color multiset, as a tuple of color counts, to the number of distinct colorings subject to
+    all_rotations that use exactly those counts.
+    """
+    inventory = collections.defaultdict(int)
+    for cycle_type, num_rotations in cycle_index(all_rotations).items():
+        for counts, fixed in _fixed_colorings(cycle_type, num_colors).items():
+            inventory[counts] += num_rotations * fixed
+    group_order = len(all_rotations)
+    for counts, total in inventory.items():
+        assert total % group_order == 0, (counts, total, group_order)
+        inventory[counts] = total // group_order
+    return dict(inventory)
+
+
+def count_colorings(all_rotations, color_counts):
+    """
+    The number of distinct colorings subject to all_rotations, where color number i is used
+    color_counts[i] times. For 2 colors, color_counts is (zeros, ones).
+    """
+    num_vertices = len(next(iter(all_rotations)).perm)
+    assert sum(color_counts) == num_vertices, '{} vs {}'.format(color_counts, num_vertices)
+    total = 0
+    for cycle_type, num_rotations in cycle_index(all_rotations).items():
+        total += num_rotations * _count_fixed(cycle_type, color_counts)
+    assert total % len(all_rotations) == 0
+    return total // len(all_rotations)
+
+
+def _count_fixed(cycle_type, color_counts):
+    """
+    The number of ways to color the cycles so that color i is used exactly color_counts[i] times.
+    """
+    ways = {tuple(color_counts): 1}
+    for length in cycle_type:
+        remaining = collections.defaultdict(int)
+        for counts, num_ways in ways.items():
+            for color, count in enumerate(counts):
+                if count >= length:
+                    new_counts = counts[:color] + (count - length,) + counts[color + 1:]
+                    remaining[new_counts] += num_ways
+        ways = remaining
+    return ways.get((0,) * len(color_counts), 0)
+
+
+def count_colorings_by_zeros(all_rotations):
+    """
+    For 2 colors, a list whose element number zeros is the number of distinct colorings
+    with that many zeros, for zeros from 0 to the number of vertices.
+    """
+    num_vertices = len(next(iter(all_rotations)).perm)
+    counts = [0] * (num_vertices + 1)
+    for cycle_type, num_rotations in cycle_index(all_rotations).items():
+        polynomial = [1] + [0] * num_vertices  # product of (1 + x^length) over the cycles
+        for length in cycle_type:
+            for degree in range(num_vertices, length - 1, -1):
+                polynomial[degree] += polynomial[degree - length]
+        for zeros, fixed in enumerate(polynomial):
+            counts[zeros] += num_rotations * fixed
+    assert all(count % len(all_rotations) == 0 for count in counts)
+    return [count // len(all_rotations) for count in counts]
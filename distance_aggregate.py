@@ -0,0 +1,187 @@
+'''
+Created on Oct 18, 2026
+
+Summaries of the average distances of a level: the number of colorings, the smallest and the
+largest average distance, the exact number of colorings with every distinct average distance (the
+ties of the ranked files) and a histogram with fixed bins. An aggregate does not depend on the
+number of colorings, only on the number of distinct distances, and aggregates of parts of a level
+merge into the aggregate of the whole level, so the levels are aggregated from ranges of their
+combinations (see parallel_colorings) without keeping any level, in one process or in many.
+'''
+import collections
+import functools
+import json
+import multiprocessing
+import os
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.parallel_colorings import map_ranges, rank_ranges
+
+DEFAULT_BINS = 100
+_CHUNK_SIZE = 1 << 14
+
+
+class DistanceAggregate(object):
+    """
+    The aggregate of average distances, with num_bins equal histogram bins from low to high.
+    Distances outside [low, high] are counted in underflow and overflow.
+    """
+    def __init__(self, low, high, num_bins=DEFAULT_BINS):
+        assert low < high and num_bins > 0, (low, high, num_bins)
+        self.low = float(low)
+        self.high = float(high)
+        self.num_bins = num_bins
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self.ties = collections.Counter()
+        self.histogram = np.zeros(num_bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @classmethod
+    def for_distances(cls, distances, num_bins=DEFAULT_BINS):
+        """
+        An empty aggregate whose bins span all the possible average distances of a distance matrix:
+        from its smallest to its largest distance between different vertices.
+        """
+        off_diagonal = distances[~np.eye(len(distances), dtype=bool)]
+        low, high = float(off_diagonal.min()), float(off_diagonal.max())
+        return cls(low, high if high > low else low + 1.0, num_bins)
+
+    def bin_edges(self):
+        return np.linspace(self.low, self.high, self.num_bins + 1)
+
+    def add(self, dist):
+        self.update([dist])
+
+    def update(self, dists):
+        """
+        Adds a batch of average distances.
+        """
+        dists = np.asarray(dists, dtype=np.float64)
+        if len(dists) == 0:
+            return self
+        self.count += len(dists)
+        low, high = float(dists.min()), float(dists.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        values, counts = np.unique(dists, return_counts=True)
+        self.ties.update(dict(zip(values.tolist(), counts.tolist())))
+        inside = (dists >= self.low) & (dists <= self.high)
+        self.underflow += int((dists < self.low).sum())
+        self.overflow += int((dists > self.high).sum())
+        bin_ix = ((dists[inside] - self.low) / (self.high - self.low) * self.num_bins).astype(np.intp)
+        self.histogram += np.bincount(np.minimum(bin_ix, self.num_bins - 1), minlength=self.num_bins)
+        return self
+
+    def merge(self, other):
+        """
+        Adds the counts of another aggregate with the same bins.
+        """
+        if (other.low, other.high, other.num_bins) != (self.low, self.high, self.num_bins):
+            raise Exception('Aggregates with different bins cannot be merged')
+        if other.count:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.count += other.count
+        self.ties.update(other.ties)
+        self.histogram += other.histogram
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def to_dict(self):
+        """
+        A JSON-serializable form of the aggregate, with the ties sorted by decreasing distance.
+        The distances are written exactly (json writes the shortest repr of a float).
+        """
+        return {'count': self.count, 'minimum': self.minimum, 'maximum': self.maximum,
+                'low': self.low, 'high': self.high, 'num_bins': self.num_bins,
+                'histogram': self.histogram.tolist(), 'underflow': self.underflow, 'overflow': self.overflow,
+                'ties': [[dist, count] for dist, count in sorted(self.ties.items(), reverse=True)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls(data['low'], data['high'], data['num_bins'])
+        aggregate.count = data['count']
+        aggregate.minimum = data['minimum']
+        aggregate.maximum = data['maximum']
+        aggregate.ties = collections.Counter({dist: count for dist, count in data['ties']})
+        aggregate.histogram = np.array(data['histogram'], dtype=np.int64)
+        aggregate.underflow = data['underflow']
+        aggregate.overflow = data['overflow']
+        return aggregate
+
+
+def aggregate_scored_masks(low, high, num_bins, zeros, scored_masks):
+    """
+    The DistanceAggregate of a list of (mask, average_distance, orbit_size); with
+    functools.partial over the bins, this is the summarize function of parallel_colorings.map_ranges.
+    """
+    return DistanceAggregate(low, high, num_bins).update([dist for _, dist, _ in scored_masks])
+
+
+def aggregate_levels(colorings, distances, max_zeros, processes=1, num_bins=DEFAULT_BINS):
+    """
+    Yields (zeros, aggregate) for zeros from 1 to max_zeros, the DistanceAggregate of the average
+    distances of the canonical colorings with that many zeros. No level is kept: the combinations
+    are split into ranges of _CHUNK_SIZE ranks, whose aggregates are made (in this process with
+    processes=1, otherwise in the workers of a pool, see parallel_colorings.map_ranges) and merged,
+    so the memory stays the same whatever the size of the levels.
+    """
+    empty = DistanceAggregate.for_distances(distances, num_bins)
+    processes = processes or multiprocessing.cpu_count()
+    tasks = [(zeros, start, stop) for zeros in range(1, max_zeros + 1)
+             for start, stop in rank_ranges(colorings.num_vertices, zeros, _CHUNK_SIZE)]
+    num_tasks = collections.Counter(zeros for zeros, _, _ in tasks)
+    summarize = functools.partial(aggregate_scored_masks, empty.low, empty.high, num_bins)
+    aggregate = DistanceAggregate(empty.low, empty.high, num_bins)
+    done = 0
+    for (zeros, _, _), partial in zip(tasks, map_ranges(colorings.group, distances, tasks, processes, summarize)):
+        aggregate.merge(partial)
+        done += 1
+        if done == num_tasks[zeros]:
+            yield zeros, aggregate
+            aggregate = DistanceAggregate(empty.low, empty.high, num_bins)
+            done = 0
+
+
+def aggregates_file_name(file_prefix):
+    return '{}_distances.json'.format(file_prefix)
+
+
+def write_aggregates(path, aggregates, geometry_name, decimals=None):
+    """
+    Writes the aggregates of the levels, a dictionary mapping the number of zeros to a
+    DistanceAggregate, to a JSON file, atomically.
+    """
+    levels = []
+    for zeros in sorted(aggregates):
+        level = dict(zeros=zeros, **aggregates[zeros].to_dict())
+        if decimals is not None:
+            level['rounded_ties'] = _rounded_ties(aggregates[zeros].ties, decimals)
+        levels.append(level)
+    with atomic_write(path, 'w') as out_file:  # one level per line
+        out_file.write('{{"geometry": {}, "levels": [\n{}\n]}}\n'.format(
+            json.dumps(geometry_name), ',\n'.join(json.dumps(level) for level in levels)))
+
+
+def _rounded_ties(ties, decimals):
+    """
+    The ties as they show in the text files, where the distances are rounded to decimals.
+    """
+    rounded = collections.Counter()
+    for dist, count in ties.items():
+        rounded[float(np.round(dist, decimals))] += count
+    return [[dist, count] for dist, count in sorted(rounded.items(), reverse=True)]
+
+
+def read_aggregates(path):
+    """
+    The dictionary mapping the number of zeros to the DistanceAggregate of a file written by
+    write_aggregates.
+    """
+    with open(path) as in_file:
+        data = json.load(in_file)
+    return {level['zeros']: DistanceAggregate.from_dict(level) for level in data['levels']}
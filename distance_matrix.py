@@ -0,0 +1,134 @@
+'''
+Created on Oct 18, 2026
+
+Compiling a distance function into a matrix over the vertex index table, so that distances
+can be looked up by vertex index instead of being recomputed.
+'''
+import numpy as np
+
+
+def compile_distance_matrix(vertices, distance_func):
+    """
+    Evaluates distance_func once for every ordered pair of different vertices and returns the
+    (len(vertices), len(vertices)) float array of distances, indexed like vertices. The diagonal is 0.
+    """
+    num_vertices = len(vertices)
+    distances = np.zeros((num_vertices, num_vertices), dtype=np.float64)
+    for ix0, v0 in enumerate(vertices):
+        for ix1, v1 in enumerate(vertices):
+            if ix0 != ix1:
+                distances[ix0, ix1] = distance_func(v0, v1)
+    return distances
+
+
+def matrix_distance_func(vertices, distances):
+    """
+    The inverse of compile_distance_matrix: a distance function of two vertices that looks
+    the distance up in the matrix.
+    """
+    index = {v: ix for ix, v in enumerate(vertices)}
+    return lambda v0, v1: float(distances[index[v0], index[v1]])
+
+
+class PairDistances(object):
+    """
+    Pairwise distance sums in floating point, added in the order of itertools.combinations of the
+    sorted indices, like average_distance.average_distance adds them, so the averages are bit for
+    bit the ones of the original float sum. In that order a sum cannot be updated one point at a
+    time, so scoring costs O(len(indices) ** 2); the enumeration scores with ExactPairDistances.
+    """
+    def __init__(self, distances):
+        self.rows = [[float(d) for d in row] for row in distances]
+
+    def total(self, indices):
+        rows = self.rows
+        total = 0.0
+        for num_points, ix in enumerate(indices):
+            row = rows[ix]
+            for other in indices[num_points + 1:]:
+                total += row[other]
+        return total
+
+    def average(self, total, num_points):
+        """
+        The average distance of num_points points whose pairwise distances sum to total.
+        """
+        num_pairs = num_points * (num_points - 1) // 2
+        return total / num_pairs if num_pairs else 0.0
+
+    def average_distance(self, indices):
+        return self.average(self.total(indices), len(indices))
+
+
+class ExactPairDistances(object):
+    """
+    Pairwise distance sums in exact integer arithmetic. Every distance of the matrix is a float,
+    so it is an exact integer multiple of 2**-exponent for a large enough exponent. Sums of these
+    integers do not depend on the order of the additions, so a running sum can be updated one
+    point at a time, and the average is the correctly rounded quotient of the exact sum. Points
+    with the same multiset of pairwise distances always get exactly the same average, so the
+    ties of the output files are ordered by label and not by float rounding noise.
+    """
+    def __init__(self, distances):
+        ratios = [[float(d).as_integer_ratio() for d in row] for row in distances]
+        self.exponent = max(denominator.bit_length() - 1 for row in ratios for _, denominator in row)
+        self.rows = [[numerator << (self.exponent - denominator.bit_length() + 1)
+                      for numerator, denominator in row] for row in ratios]
+
+    def add_point(self, total, indices, new_index):
+        """
+        The sum of the pairwise distances of indices + (new_index,), given their sum total for indices.
+        """
+        row = self.rows[new_index]
+        return total + sum(row[ix] for ix in indices)
+
+    def total(self, indices):
+        total = 0
+        for num_points, ix in enumerate(indices):
+            total = self.add_point(total, indices[:num_points], ix)
+        return total
+
+    def average(self, total, num_points):
+        """
+        The average distance of num_points points whose pairwise distances sum to total.
+        """
+        num_pairs = num_points * (num_points - 1) // 2
+        return total / (num_pairs << self.exponent) if num_pairs else 0.0
+
+    def average_distance(self, indices):
+        return self.average(self.total(indices), len(indices))
+
+
+def metric_violations(distances, tol=1e-7):
+    """
+    Checks that the distance matrix is a metric. Returns the list of the index pairs (i, j), i < j,
+    for which distances[i, j] and distances[j, i] differ by tol or more, and the list of the index
+    triples (i, j, k) for which distances[i, j] + distances[j, k] < distances[i, k] - tol.
+    The triangle inequality is checked for all triples at once, one middle vertex j at a time.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    asymmetric = np.argwhere(np.triu(np.abs(distances - distances.T) >= tol, 1))
+    violations = []
+    for middle in range(len(distances)):
+        via_middle = distances[:, middle, None] + distances[None, middle, :]
+        for start, end in np.argwhere(via_middle < distances - tol):
+            if middle not in (start, end):
+                violations.append((int(start), middle, int(end)))
+    return [tuple(int(ix) for ix in pair) for pair in asymmetric], sorted(violations)
+
+
+def validate_distance_matrix(distances, vertices=None, tol=1e-7):
+    """
+    Asserts that the distance matrix is symmetric and satisfies the triangle inequality, reporting
+    the offending pairs and triples (by vertex if vertices is given, by index otherwise).
+    This only needs to run once per geometry.
+    """
+    name = (lambda ix: vertices[ix]) if vertices is not None else (lambda ix: ix)
+    asymmetric, violations = metric_violations(distances, tol)
+    assert not asymmetric, 'Asymmetric distances: ' + ', '.join(
+        '{}-{}: {} vs {}'.format(name(i), name(j), distances[i, j], distances[j, i])
+        for i, j in asymmetric)
+    assert not violations, 'Triangle inequality violated: ' + ', '.join(
+        '{}-{}-{}: {} + {} < {}'.format(name(i), name(j), name(k), distances[i, j], distances[j, k],
+                                        distances[i, k])
+        for i, j, k in violations)
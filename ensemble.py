@@ -0,0 +1,61 @@
+'''
+Created on Oct 18, 2026
+
+Boltzmann-weighted statistics over the isomers of a level. An isomer stands for all the
+substitution patterns of its orbit, so with energy E_i and orbit size g_i its weight at temperature
+T is g_i * exp(-E_i / kT), and the sum of the orbit sizes of a level is C(n, zeros). The orbit
+sizes are the orbit_size column of a result table (see result_files) or
+batch_colorings.orbit_sizes; the energies are up to the caller, for example
+-table['distance'] to favour zeros far apart. Everything is vectorized over the isomers, and over
+the temperatures when an array of temperatures is given.
+'''
+import collections
+import numpy as np
+
+BOLTZMANN_EV_PER_K = 8.617333262e-5
+
+Ensemble = collections.namedtuple('Ensemble', ['populations', 'mean_energy', 'free_energy', 'entropy'])
+
+
+def ensemble(energies, orbit_sizes, temperature, boltzmann_constant=1.0):
+    """
+    The Ensemble of a level at the given temperature (a number or an array), with
+    kT = boltzmann_constant * temperature in the units of the energies:
+        populations     the probability of every isomer (shape temperature.shape + (num isomers,))
+        mean_energy     the average energy
+        free_energy     -kT ln(Z), Z being the sum of the weights
+        entropy         -k sum(p_i ln(p_i / g_i)), the entropy over the substitution patterns
+    At temperature 0 only the isomers of the lowest energy are populated, in proportion to their
+    orbit sizes. The weights are shifted by the lowest energy, so they do not overflow.
+    """
+    energies = np.asarray(energies, dtype=np.float64)
+    orbit_sizes = np.asarray(orbit_sizes, dtype=np.float64)
+    assert energies.shape == orbit_sizes.shape and energies.ndim == 1 and len(energies), energies.shape
+    temperature = np.asarray(temperature, dtype=np.float64)
+    if (temperature < 0).any():
+        raise Exception('The temperature must not be negative')
+    kT = boltzmann_constant * temperature[..., None]
+    lowest = energies.min()
+    excess = energies - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = np.where(excess == 0, 0.0, excess / kT)  # inf above the lowest energy at T = 0
+    log_weights = np.log(orbit_sizes) - scaled
+    log_max = log_weights.max(axis=-1)
+    weights = np.exp(log_weights - log_max[..., None])
+    sums = weights.sum(axis=-1)
+    populations = weights / sums[..., None]
+    log_z = np.log(sums) + log_max  # of the weights shifted by the lowest energy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pattern_log = np.where(populations > 0, np.log(populations / orbit_sizes), 0.0)
+    return Ensemble(populations=populations,
+                    mean_energy=populations @ energies,
+                    free_energy=lowest - kT[..., 0] * log_z,
+                    entropy=-boltzmann_constant * (populations * pattern_log).sum(axis=-1))
+
+
+def ensemble_average(values, populations):
+    """
+    The average of per-isomer values (an array whose first axis is the isomers) weighted by the
+    populations of an Ensemble.
+    """
+    return np.tensordot(populations, np.asarray(values, dtype=np.float64), axes=([-1], [0]))
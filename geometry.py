@@ -0,0 +1,219 @@
+'''
+Created on Oct 18, 2026
+
+Geometries described by a spec file instead of a driver module. A spec is a JSON file with:
+    name            the name of the geometry
+    site_classes    a list of {"name": ..., "labels": {vertex: label number}}, in the order in
+                    which the classes are written in the labels of the colorings
+    generators      a list of rotations, each a {vertex: vertex} mapping like Rotation takes
+    distances       a list of [vertex, vertex, distance], one for every pair of different vertices
+    group_order     (optional) the expected number of rotations in the group
+    output          {"folder": ..., "file_prefix": ..., "decimals": ..., "max_zeros": ...}
+The spec is compiled once into an .npz file holding the closed rotation group (its sorted
+permutations and its tables of products, inverses and orders), the distance matrix and the site
+class and label arrays. The file name contains a hash of the spec's content, so a changed spec is
+compiled again, and repeat runs load the compiled arrays without building or checking anything:
+the RotationGroup is made from the stored tables, without composing any rotations.
+rbc and pseudo_rbc are built in (see the geometries folder).
+'''
+import hashlib
+import json
+import os
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.rotation import Rotation, VertexTable
+from povs_isomeriser.rotation_group import RotationGroup
+from povs_isomeriser.distance_matrix import validate_distance_matrix
+from povs_isomeriser.assert_rotations_and_distances import assert_rotations_and_distances
+
+_FORMAT_VERSION = 2
+_ARRAY_NAMES = ('perms', 'products', 'inverses', 'orders', 'distances', 'site_classes', 'labels')
+_BUILTIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geometries')
+
+
+def default_cache_dir():
+    return os.environ.get('POVS_ISOMERISER_CACHE',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'povs_isomeriser'))
+
+
+def builtin_geometries():
+    return sorted(f[:-len('.json')] for f in os.listdir(_BUILTIN_DIR) if f.endswith('.json'))
+
+
+def spec_hash(spec):
+    """
+    The sha256 of the canonical JSON form of the spec, which identifies the geometry.
+    """
+    content = json.dumps([_FORMAT_VERSION, spec], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class Geometry(object):
+    """
+    A compiled geometry: the sorted vertices, the closed rotation group (as a RotationGroup, and
+    as its list of rotations and its stacked permutations), the distance matrix (indexed like the
+    vertices) and, for every vertex, the index of its site class and its label.
+    arrays is the dictionary of the compiled arrays (see compile_spec).
+    """
+    def __init__(self, spec, geometry_hash, arrays):
+        self.spec = spec
+        self.name = spec['name']
+        self.hash = geometry_hash
+        self.table = VertexTable.get(_spec_vertices(spec))
+        self.vertices = self.table.vertices
+        self.group = RotationGroup.from_tables(
+            [Rotation.from_permutation(perm, self.table) for perm in arrays['perms'].tolist()],
+            arrays['products'], arrays['inverses'], arrays['orders'])
+        self.rotations = self.group.elements
+        self.perms = arrays['perms']
+        self.distances = arrays['distances']
+        self.class_names = [site_class['name'] for site_class in spec['site_classes']]
+        self.site_classes = arrays['site_classes']
+        self.labels = arrays['labels']
+        output = spec.get('output', {})
+        self.folder_name = output.get('folder', 'out_' + self.name)
+        self.file_prefix = output.get('file_prefix', self.name)
+        self.decimals = output.get('decimals', 8)
+        self.max_zeros = output.get('max_zeros', len(self.vertices) // 2)
+
+    def indices_to_string(self, zero_indices):
+        """
+        The label of the coloring with zeros at the given vertex indices, for example '2(1,7) 4(5)':
+        for every site class with zeros, the class name and the sorted labels of its zeros.
+        All but the last class are followed by a space.
+        """
+        labels = [[] for _ in self.class_names]
+        for ix in zero_indices:
+            labels[self.site_classes[ix]].append(int(self.labels[ix]))
+        parts = []
+        for class_ix, (name, class_labels) in enumerate(zip(self.class_names, labels)):
+            if class_labels:
+                space = ' ' if class_ix < len(self.class_names) - 1 else ''
+                parts.append('{}({}){}'.format(name, ','.join(str(label) for label in sorted(class_labels)), space))
+        return ''.join(parts)
+
+    def coloring_to_string(self, coloring):
+        """
+        The label of a coloring given as (vertex, color) pairs, like the drivers' coloring_to_string.
+        """
+        index = self.table.index
+        return self.indices_to_string([index[v] for v, c in coloring if c in (0, '0')])
+
+
+def _spec_vertices(spec):
+    return [vertex for site_class in spec['site_classes'] for vertex in site_class['labels']]
+
+
+def read_spec(geometry):
+    """
+    Reads a spec, given the name of a built-in geometry or the path of a spec file.
+    """
+    path = geometry
+    if not os.path.exists(path) and geometry in builtin_geometries():
+        path = os.path.join(_BUILTIN_DIR, geometry + '.json')
+    with open(path) as spec_file:
+        return json.load(spec_file)
+
+
+def compile_spec(spec):
+    """
+    Builds the rotation group and the distance matrix of a spec and checks them.
+    Returns the dictionary of the compiled arrays, named like _ARRAY_NAMES: the (group order,
+    num vertices) array of the sorted permutations of the rotations, the products, inverses and
+    orders tables of their RotationGroup, the distance matrix and, for every vertex, the index of
+    its site class and its label.
+    """
+    vertices = _spec_vertices(spec)
+    assert len(set(vertices)) == len(vertices), 'Every vertex must be in exactly one site class'
+    table = VertexTable.get(vertices)
+    generators = [Rotation(dict(mapping)) for mapping in spec['generators']]
+    for generator in generators:
+        assert generator.table is table, 'The generators must move the vertices of the site classes'
+    group = RotationGroup.from_generators(generators)
+    if 'group_order' in spec:
+        assert len(group) == spec['group_order'], (len(group), spec['group_order'])
+
+    distances = np.full((len(table), len(table)), np.nan)
+    np.fill_diagonal(distances, 0.0)
+    for v0, v1, dist in spec['distances']:
+        distances[table.index[v0], table.index[v1]] = dist
+        distances[table.index[v1], table.index[v0]] = dist
+    missing = np.argwhere(np.isnan(distances))
+    assert len(missing) == 0, 'Missing distances: ' + ', '.join(
+        '{}-{}'.format(table.vertices[i], table.vertices[j]) for i, j in missing if i < j)
+    validate_distance_matrix(distances, table.vertices)
+    assert_rotations_and_distances(group, None, distances=distances)
+
+    site_classes = np.zeros(len(table), dtype=np.intp)
+    labels = np.zeros(len(table), dtype=np.intp)
+    for class_ix, site_class in enumerate(spec['site_classes']):
+        for vertex, label in site_class['labels'].items():
+            site_classes[table.index[vertex]] = class_ix
+            labels[table.index[vertex]] = label
+    return {'perms': group.perms.astype(np.int32), 'products': group.products.astype(np.int32),
+            'inverses': group.inverses.astype(np.int32), 'orders': group.orders.astype(np.int32),
+            'distances': distances, 'site_classes': site_classes, 'labels': labels}
+
+
+def load_geometry(geometry, cache_dir=None):
+    """
+    The compiled Geometry of a built-in geometry name or a spec file path. The compiled arrays are
+    cached in cache_dir (default: $POVS_ISOMERISER_CACHE or ~/.cache/povs_isomeriser), under a name
+    containing the hash of the spec; cache_dir=False turns the cache off.
+    """
+    spec = read_spec(geometry)
+    geometry_hash = spec_hash(spec)
+    if cache_dir is False:
+        return Geometry(spec, geometry_hash, compile_spec(spec))
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, '{}_{}.npz'.format(spec['name'], geometry_hash[:16]))
+    if os.path.exists(path):
+        with np.load(path) as data:
+            if str(data['hash']) == geometry_hash:
+                return Geometry(spec, geometry_hash, {name: data[name] for name in _ARRAY_NAMES})
+    arrays = compile_spec(spec)
+    os.makedirs(cache_dir, exist_ok=True)
+    with atomic_write(path) as out_file:
+        np.savez(out_file, hash=geometry_hash, vertices=np.array(sorted(_spec_vertices(spec))), **arrays)
+    return Geometry(spec, geometry_hash, arrays)
+
+
+def write_spec(path, name, site_classes, generators, distance_func=None, distances=None,
+               group_order=None, output=None):
+    """
+    Writes a spec file. site_classes is a list of (class name, {vertex: label}), generators a list
+    of Rotation objects or mappings, and the distances come either from distance_func or from a
+    matrix indexed like the sorted vertices.
+    """
+    vertices = sorted(vertex for _, labels in site_classes for vertex in labels)
+    pairs = []
+    for ix0, v0 in enumerate(vertices):
+        for ix1 in range(ix0 + 1, len(vertices)):
+            v1 = vertices[ix1]
+            dist = distance_func(v0, v1) if distances is None else distances[ix0][ix1]
+            pairs.append([v0, v1, float(dist)])
+    spec = {'name': name,
+            'site_classes': [{'name': class_name, 'labels': dict(labels)} for class_name, labels in site_classes],
+            'generators': [dict(getattr(rot, 'mapping', rot)) for rot in generators],
+            'distances': pairs}
+    if group_order is not None:
+        spec['group_order'] = group_order
+    if output is not None:
+        spec['output'] = output
+    with open(path, 'w') as spec_file:
+        spec_file.write(_format_spec(spec))
+    return spec
+
+
+def _format_spec(spec):
+    """
+    JSON with one line per site class, generator and distance.
+    """
+    lines = []
+    for key, value in spec.items():
+        if isinstance(value, list):
+            items = ',\n'.join('  ' + json.dumps(item) for item in value)
+            lines.append(' {}: [\n{}\n ]'.format(json.dumps(key), items))
+        else:
+            lines.append(' {}: {}'.format(json.dumps(key), json.dumps(value)))
+    return '{\n' + ',\n'.join(lines) + '\n}\n'
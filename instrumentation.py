@@ -0,0 +1,160 @@
+'''
+Created on Oct 18, 2026
+
+Optional instrumentation of long runs: counters, per-stage timers with the peak memory of the
+process, and throttled progress reports with the rate and the estimated time left, all emitted
+as JSON lines. The functions that take an instrumentation argument do nothing extra when it is
+None (the default), and only check it outside their innermost loops.
+'''
+import collections
+import contextlib
+import json
+import sys
+import time
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+
+def peak_memory_kb():
+    """
+    The peak resident memory of the process in kilobytes, or None where it is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS
+
+
+class Instrumentation(object):
+    """
+    Collects counters and writes events as JSON lines to stream (nothing is written if stream is
+    None). Progress events are emitted at most once every progress_interval seconds, and are also
+    passed to progress_callback if it is given.
+    """
+    def __init__(self, stream=None, progress_interval=1.0, progress_callback=None, clock=time.monotonic):
+        self.stream = stream
+        self.progress_interval = progress_interval
+        self.progress_callback = progress_callback
+        self.clock = clock
+        self.counters = collections.Counter()
+        self.totals = {}
+        self.events = []
+        self._start = clock()
+        self._last_progress = {}
+        self._stream_seconds = 0.0  # spent in timed_streams, which the stages around them leave out
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def emit(self, event, **fields):
+        record = dict(event=event, elapsed=round(self.clock() - self._start, 6), **fields)
+        self.events.append(record)
+        if self.stream is not None:
+            self.stream.write(json.dumps(record) + '\n')
+            self.stream.flush()
+        return record
+
+    @contextlib.contextmanager
+    def stage(self, name, **fields):
+        """
+        Times the block and emits a stage event with its seconds and the peak memory so far. The time
+        spent in the streams of timed_streams within the block is left out, as they have their own
+        stage events.
+        """
+        start = self.clock()
+        stream_seconds = self._stream_seconds
+        yield
+        seconds = self.clock() - start - (self._stream_seconds - stream_seconds)
+        self.emit('stage', stage=name, seconds=round(seconds, 6), peak_memory_kb=peak_memory_kb(), **fields)
+
+    def timed(self, name, iterable, fields=lambda item: {}):
+        """
+        Yields the items of iterable, emitting a stage event for the time it took to make each one,
+        with the extra fields(item).
+        """
+        iterator = iter(iterable)
+        while True:
+            start = self.clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.emit('stage', stage=name, seconds=round(self.clock() - start, 6), peak_memory_kb=peak_memory_kb(),
+                      **fields(item))
+            yield item
+
+    def timed_streams(self, name, streams, fields=lambda key: {}):
+        """
+        Yields the (key, items) of streams, where items is an iterator (as itertools.groupby makes
+        them), a list or None, timing the making of the key and of every item. The stage event of a
+        key, with the extra fields(key), is emitted with the sum of these times once its items are
+        used up (at once for None), or once the next key is asked for if they are not, so a stream that is generated
+        while it is used is timed apart from the code that uses it.
+        """
+        streams = iter(streams)
+        while True:
+            timer = {'seconds': 0.0, 'done': False}
+            try:
+                key, items = self._timed_call(timer, next, streams)
+            except StopIteration:
+                return
+
+            def finish(key=key, timer=timer):
+                if not timer['done']:
+                    timer['done'] = True
+                    self.emit('stage', stage=name, seconds=round(timer['seconds'], 6),
+                              peak_memory_kb=peak_memory_kb(), **fields(key))
+            if items is None:
+                finish()
+                yield key, None
+            else:
+                yield key, self._timed_items(timer, items, finish)
+                finish()
+
+    def _timed_call(self, timer, function, *args):
+        start = self.clock()
+        try:
+            return function(*args)
+        finally:
+            seconds = self.clock() - start
+            timer['seconds'] += seconds
+            self._stream_seconds += seconds
+
+    def _timed_items(self, timer, items, finish):
+        items = iter(items)
+        while True:
+            try:
+                item = self._timed_call(timer, next, items)
+            except StopIteration:
+                finish()
+                return
+            yield item
+
+    def progress(self, name, done, total=None, force=False):
+        """
+        Reports that done of total items of stage name are done, unless the last report of the
+        stage was less than progress_interval seconds ago (and not force).
+        """
+        now = self.clock()
+        last = self._last_progress.get(name)
+        if not force and last is not None and now - last[0] < self.progress_interval:
+            return None
+        if last is None:
+            first = (now, done)
+            rate = None
+        else:
+            first = last[1]
+            rate = (done - first[1]) / (now - first[0]) if now > first[0] else None
+        self._last_progress[name] = (now, first)
+        eta = (total - done) / rate if rate and total is not None else None
+        record = self.emit('progress', stage=name, done=done, total=total,
+                           rate=None if rate is None else round(rate, 3),
+                           eta_seconds=None if eta is None else round(eta, 3))
+        if self.progress_callback is not None:
+            self.progress_callback(record)
+        return record
+
+    def summary(self):
+        return self.emit('counters', peak_memory_kb=peak_memory_kb(), **dict(self.counters))
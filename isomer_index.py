@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+Finding where a substitution pattern (the set of sites with a zero) is in the ranked list of
+its level without regenerating the level. An index file per geometry and level holds the
+canonical masks of the level, sorted, with the rank (the line number in the text file) and the
+exact average distance of each. A pattern is canonicalized under the rotation group, which
+costs one table lookup per rotation, and found with a single binary search; batches of
+patterns are canonicalized and looked up in one vectorized call.
+python -m povs_isomeriser.isomer_index rbc out_rbc A1 b1c1
+'''
+import argparse
+import os
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.batch_colorings import permutation_matrix, canonical_keys, zeros_to_colors
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orderly_colorings import orderly_scored_streams
+from povs_isomeriser.ranked_output import RankedColorings
+from povs_isomeriser.result_files import result_table
+
+
+def index_file_name(file_prefix, zeros):
+    return '{}_{}zeros.index.npz'.format(file_prefix, zeros)
+
+
+def write_index(index_dir, geometry, zeros, table):
+    """
+    Writes the index of a level to index_dir, atomically, from its result table (see result_files),
+    whose rows are in rank order. Returns the path of the file.
+    """
+    order = np.argsort(table['mask'], kind='stable')
+    os.makedirs(index_dir, exist_ok=True)
+    path = os.path.join(index_dir, index_file_name(geometry.file_prefix, zeros))
+    with atomic_write(path) as out_file:
+        np.savez(out_file, geometry_hash=geometry.hash, zeros=zeros, keys=table['mask'][order],
+                 ranks=(order + 1).astype(np.uint32), distances=table['distance'][order])
+    return path
+
+
+def build_index(geometry, zero_levels, index_dir):
+    """
+    Enumerates and ranks the given levels of a geometry like the drivers do and writes their
+    index files to index_dir.
+    """
+    colorings = BitmaskColorings(geometry.group)
+    label = lambda mask: geometry.indices_to_string(colorings.zero_indices(mask))
+    zero_levels = set(zero_levels)
+    paths = []
+    for zeros, scored_masks in orderly_scored_streams(colorings, ExactPairDistances(geometry.distances), max(zero_levels)):
+        if zeros in zero_levels:
+            ranked = RankedColorings(label).extend(scored_masks)
+            paths.append(write_index(index_dir, geometry, zeros, result_table(colorings, geometry, ranked)))
+    return paths
+
+
+class IsomerIndex(object):
+    """
+    The index files of a geometry in index_dir, loaded a level at a time when first needed.
+    """
+    def __init__(self, geometry, index_dir):
+        self.geometry = geometry
+        self.index_dir = index_dir
+        self.colorings = BitmaskColorings(geometry.group)
+        self.perms = permutation_matrix(self.colorings)
+        self._levels = {}
+
+    def _level(self, zeros):
+        if zeros not in self._levels:
+            path = os.path.join(self.index_dir, index_file_name(self.geometry.file_prefix, zeros))
+            if not os.path.exists(path):
+                raise Exception('No index for {} zeros in {}, see build_index'.format(zeros, self.index_dir))
+            with np.load(path) as data:
+                if str(data['geometry_hash']) != self.geometry.hash:
+                    raise Exception('{} is for a different geometry'.format(path))
+                self._levels[zeros] = (data['keys'], data['ranks'], data['distances'])
+        return self._levels[zeros]
+
+    def _zero_indices(self, sites):
+        index = self.geometry.table.index
+        zero_indices = sorted(index[site] for site in sites)
+        assert len(set(zero_indices)) == len(zero_indices), 'The sites of a pattern must be different'
+        return zero_indices
+
+    def lookup(self, sites):
+        """
+        The (rank, label, average_distance) of the isomer with zeros at the given sites.
+        """
+        mask = self.colorings.canonical(self.colorings.to_mask(self._zero_indices(sites)))
+        keys, ranks, distances = self._level(len(sites))
+        pos = int(np.searchsorted(keys, np.uint64(mask)))
+        assert pos < len(keys) and int(keys[pos]) == mask, 'The pattern is not in the index of {} zeros'.format(len(sites))
+        zero_indices = self.colorings.zero_indices(mask)
+        return int(ranks[pos]), self.geometry.indices_to_string(zero_indices), float(distances[pos])
+
+    def lookup_batch(self, patterns):
+        """
+        The (ranks, average_distances, canonical keys) arrays of many patterns (lists of sites).
+        The patterns of each size are canonicalized together, with all the rotations at once,
+        and looked up with one vectorized binary search.
+        """
+        patterns = [self._zero_indices(sites) for sites in patterns]
+        ranks = np.zeros(len(patterns), dtype=np.uint32)
+        distances = np.zeros(len(patterns), dtype=np.float64)
+        canonical = np.zeros(len(patterns), dtype=np.uint64)
+        sizes = np.array([len(zero_indices) for zero_indices in patterns], dtype=np.intp)
+        for zeros in np.unique(sizes).tolist():
+            rows = np.flatnonzero(sizes == zeros)
+            zero_indices = np.array([patterns[row] for row in rows], dtype=np.intp).reshape(len(rows), zeros)
+            level_keys = canonical_keys(zeros_to_colors(zero_indices, self.colorings.num_vertices), self.perms)
+            keys, level_ranks, level_distances = self._level(zeros)
+            pos = np.minimum(np.searchsorted(keys, level_keys), len(keys) - 1)
+            assert (keys[pos] == level_keys).all(), 'Some patterns are not in the index of {} zeros'.format(zeros)
+            ranks[rows] = level_ranks[pos]
+            distances[rows] = level_distances[pos]
+            canonical[rows] = level_keys
+        return ranks, distances, canonical
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('geometry', help='the name of a built-in geometry or the path of a spec file')
+    parser.add_argument('index_dir', help='the folder of the index files')
+    parser.add_argument('sites', nargs='+', help='the sites with a zero')
+    args = parser.parse_args()
+    isomer_index = IsomerIndex(load_geometry(args.geometry), args.index_dir)
+    rank, label, dist = isomer_index.lookup(args.sites)
+    print ('{}. {} {}'.format(rank, label, dist))
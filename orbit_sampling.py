@@ -0,0 +1,162 @@
+'''
+Created on Oct 18, 2026
+
+Estimating the distribution of the average distance of a level by random sampling, for cages
+whose levels are too large to enumerate. Substitution patterns (combinations of zero sites) are
+drawn uniformly at random in batches, and every pattern is weighted by the order of its stabilizer,
+which is proportional to 1 / orbit size: a pattern lands in an orbit with a probability
+proportional to the orbit size, so the weighted samples are uniform over the orbits (the isomers).
+The estimates are self-normalized importance sampling averages, with normal-approximation
+confidence intervals for the mean and the histogram and Woodruff intervals for the quantiles.
+python -m povs_isomeriser.orbit_sampling rbc 12 18 --samples 100000 --seed 1
+'''
+import argparse
+import collections
+import json
+import math
+import statistics
+import numpy as np
+from povs_isomeriser.distance_matrix import compile_distance_matrix
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.rotation_group import RotationGroup
+
+DEFAULT_BATCH_SIZE = 1 << 12
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+Estimate = collections.namedtuple('Estimate', [
+    'samples', 'effective_samples', 'mean', 'mean_interval', 'quantiles', 'quantile_values',
+    'quantile_intervals', 'bin_edges', 'histogram', 'histogram_intervals'])
+
+
+class OrbitSampler(object):
+    """
+    Draws random colorings of the vertices that all_rotations (a RotationGroup or a closed set of
+    rotations) act on, and scores them with the distances of distance_func, or with the
+    precompiled distance matrix distances. seed seeds numpy's random generator.
+    """
+    def __init__(self, all_rotations, distance_func=None, distances=None, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+        group = RotationGroup.of(all_rotations)
+        self.perms = group.perms
+        self.num_vertices = self.perms.shape[1]
+        if distances is None:
+            distances = compile_distance_matrix(group[0].vertices, distance_func)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        assert self.distances.shape == (self.num_vertices, self.num_vertices), self.distances.shape
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+
+    def sample_batch(self, zeros, size):
+        """
+        (zero_indices, average_distances, stabilizer_orders) of size random patterns with the given
+        number of zeros, zero_indices being a sorted (size, zeros) array.
+        """
+        assert 1 <= zeros <= self.num_vertices, zeros
+        keys = self.rng.random((size, self.num_vertices))
+        zero_indices = np.sort(np.argpartition(keys, zeros - 1, axis=1)[:, :zeros], axis=1)
+        num_pairs = zeros * (zeros - 1) // 2
+        if num_pairs:
+            pair_sums = self.distances[zero_indices[:, :, None], zero_indices[:, None, :]].sum(axis=(1, 2)) / 2
+            average_distances = pair_sums / num_pairs
+        else:
+            average_distances = np.zeros(size)
+        colors = np.ones((size, self.num_vertices), dtype=bool)
+        colors[np.arange(size)[:, None], zero_indices] = False
+        # the rotated coloring takes the color of vertex perm[ix] into vertex ix
+        stabilizer_orders = (colors[:, self.perms] == colors[:, None, :]).all(axis=2).sum(axis=1)
+        return zero_indices, average_distances, stabilizer_orders
+
+    def sample(self, zeros, num_samples, uniform_over='orbits'):
+        """
+        (average_distances, weights) of num_samples random patterns with the given number of zeros.
+        With uniform_over='orbits' the weights make the samples uniform over the isomers, and with
+        'patterns' they are all 1 (every substitution pattern counts once).
+        """
+        assert uniform_over in ('orbits', 'patterns'), uniform_over
+        values, weights = [], []
+        for start in range(0, num_samples, self.batch_size):
+            _, average_distances, stabilizer_orders = self.sample_batch(zeros, min(self.batch_size, num_samples - start))
+            values.append(average_distances)
+            weights.append(stabilizer_orders if uniform_over == 'orbits' else np.ones(len(average_distances)))
+        return np.concatenate(values), np.concatenate(weights).astype(np.float64)
+
+
+def estimate(values, weights, quantiles=DEFAULT_QUANTILES, bins=20, confidence=0.95):
+    """
+    The Estimate of the weighted samples: their number and effective number ((sum w)^2 / sum w^2),
+    the mean, the given quantiles and the histogram (bins is a number of equal bins between the
+    smallest and the largest sample, or the bin edges) as fractions, each with its confidence
+    interval at the given level.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    assert len(values) == len(weights) and len(values), (len(values), len(weights))
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    total = weights.sum()
+    effective = total ** 2 / (weights ** 2).sum()
+
+    mean = (weights * values).sum() / total
+    mean_error = math.sqrt((weights ** 2 * (values - mean) ** 2).sum()) / total
+    mean_interval = (mean - z * mean_error, mean + z * mean_error)
+
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    cdf = np.cumsum(weights[order]) / total
+
+    def quantile(q):
+        return sorted_values[np.minimum(np.searchsorted(cdf, np.clip(q, 0.0, 1.0)), len(values) - 1)]
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    cdf_error = z * np.sqrt(quantiles * (1 - quantiles) / effective)
+    quantile_intervals = np.stack([quantile(quantiles - cdf_error), quantile(quantiles + cdf_error)], axis=1)
+
+    if np.isscalar(bins):
+        low, high = sorted_values[0], sorted_values[-1]
+        bin_edges = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+    else:
+        bin_edges = np.asarray(bins, dtype=np.float64)
+    bin_ix = np.clip(np.searchsorted(bin_edges, values, side='right') - 1, 0, len(bin_edges) - 2)
+    inside = (values >= bin_edges[0]) & (values <= bin_edges[-1])
+    histogram = np.bincount(bin_ix[inside], weights[inside], minlength=len(bin_edges) - 1) / total
+    in_bin = (bin_ix[:, None] == np.arange(len(bin_edges) - 1)) & inside[:, None]
+    histogram_error = z * np.sqrt((weights[:, None] ** 2 * (in_bin - histogram) ** 2).sum(axis=0)) / total
+    histogram_intervals = np.stack([histogram - histogram_error, histogram + histogram_error], axis=1)
+
+    return Estimate(samples=len(values), effective_samples=effective, mean=mean, mean_interval=mean_interval,
+                    quantiles=quantiles, quantile_values=quantile(quantiles), quantile_intervals=quantile_intervals,
+                    bin_edges=bin_edges, histogram=histogram, histogram_intervals=histogram_intervals)
+
+
+def _estimate_to_json(zeros, result):
+    return {'zeros': zeros, 'samples': result.samples, 'effective_samples': result.effective_samples,
+            'mean': result.mean, 'mean_interval': list(result.mean_interval),
+            'quantiles': result.quantiles.tolist(), 'quantile_values': result.quantile_values.tolist(),
+            'quantile_intervals': result.quantile_intervals.tolist(), 'bin_edges': result.bin_edges.tolist(),
+            'histogram': result.histogram.tolist(), 'histogram_intervals': result.histogram_intervals.tolist()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('geometry', help='the name of a built-in geometry or the path of a spec file')
+    parser.add_argument('zeros', type=int, nargs='+', help='the levels (numbers of zeros) to sample')
+    parser.add_argument('--samples', type=int, default=100000, help='samples per level (default 100000)')
+    parser.add_argument('--seed', type=int, help='the seed of the random generator')
+    parser.add_argument('--patterns', action='store_true',
+                        help='weight every substitution pattern equally instead of every isomer')
+    parser.add_argument('--bins', type=int, default=20, help='the number of histogram bins (default 20)')
+    parser.add_argument('--confidence', type=float, default=0.95, help='the confidence level (default 0.95)')
+    parser.add_argument('--json', metavar='FILE', help='also write the estimates to FILE as JSON')
+    args = parser.parse_args()
+    geometry = load_geometry(args.geometry)
+    sampler = OrbitSampler(geometry.group, distances=geometry.distances, seed=args.seed)
+    estimates = []
+    for zeros in args.zeros:
+        values, weights = sampler.sample(zeros, args.samples, 'patterns' if args.patterns else 'orbits')
+        result = estimate(values, weights, bins=args.bins, confidence=args.confidence)
+        estimates.append(_estimate_to_json(zeros, result))
+        print ('{} zeros: mean {:.6f} [{:.6f}, {:.6f}], {} samples ({:.0f} effective)'.format(
+            zeros, result.mean, result.mean_interval[0], result.mean_interval[1], result.samples,
+            result.effective_samples))
+        for q, value, (low, high) in zip(result.quantiles, result.quantile_values, result.quantile_intervals):
+            print ('    quantile {:.2f}: {:.6f} [{:.6f}, {:.6f}]'.format(q, value, low, high))
+    if args.json:
+        with open(args.json, 'w') as out_file:
+            json.dump(estimates, out_file, indent=1)
@@ -0,0 +1,136 @@
+'''
+Created on Oct 18, 2026
+
+Orderly generation of the distinct colorings, level by level: the representatives with
+k zeros are built from the representatives with k - 1 zeros.
+'''
+import itertools
+
+
+def counting_orbit_size(colorings, instrumentation):
+    """
+    colorings.canonical_orbit_size, counting the combinations visited and the rotations applied
+    in the counters of instrumentation (see instrumentation.py).
+    """
+    counters = instrumentation.counters
+
+    def canonical_orbit_size(mask):
+        orbit_size, applied = colorings.canonical_orbit_size_counted(mask)
+        counters['combinations'] += 1
+        counters['rotations'] += applied
+        return orbit_size
+    return canonical_orbit_size
+
+
+def orderly_children(colorings, parent, parent_indices, parent_total, pair_distances=None, canonical_orbit_size=None):
+    """
+    The list of (mask, zero_indices, total, orbit_size) of the canonical children of a canonical
+    parent mask with zeros at parent_indices: the canonical masks with one more zero after the last
+    zero of the parent, in order. total is the exact pairwise distance sum of the zeros if
+    pair_distances is given (parent_total being the one of the parent), and None otherwise.
+    The size of the orbit comes from the same pass over the rotations as the canonicity test
+    (see BitmaskColorings.canonical_orbit_size).
+    """
+    canonical_orbit_size = canonical_orbit_size or colorings.canonical_orbit_size
+    bits = colorings._bits
+    children = []
+    start = parent_indices[-1] + 1 if parent_indices else 0
+    for ix in range(start, colorings.num_vertices):
+        child = parent ^ bits[ix]
+        orbit_size = canonical_orbit_size(child)
+        if orbit_size:
+            if pair_distances is not None:
+                total = pair_distances.add_point(parent_total, parent_indices, ix)
+            else:
+                total = None
+            children.append((child, parent_indices + (ix,), total, orbit_size))
+    return children
+
+
+def _orderly(colorings, max_zeros, pair_distances, instrumentation=None):
+    """
+    Yields (zeros, mask, zero_indices, total, orbit_size) for every canonical mask with 1 to
+    max_zeros zeros, where total is the exact sum of the pairwise distances of the zeros if
+    pair_distances (an ExactPairDistances object) is given, and None otherwise.
+    With instrumentation (see instrumentation.py), the combinations visited, the rotations
+    applied and the representatives found are counted, and the progress is reported after every
+    parent against instrumentation.totals['representatives'].
+    """
+    assert 0 <= max_zeros <= colorings.num_vertices, max_zeros
+    canonical_orbit_size = colorings.canonical_orbit_size
+    if instrumentation is not None:
+        canonical_orbit_size = counting_orbit_size(colorings, instrumentation)
+    parents = [(colorings.full_mask, (), 0 if pair_distances is not None else None, 1)]
+    for zeros in range(1, max_zeros + 1):
+        children = []
+        num_children = 0
+        for parent, parent_indices, parent_total, _ in parents:
+            if instrumentation is not None:
+                instrumentation.progress('enumerate', instrumentation.counters['representatives'] + num_children,
+                                         instrumentation.totals.get('representatives'))
+            new_children = orderly_children(colorings, parent, parent_indices, parent_total, pair_distances,
+                                            canonical_orbit_size)
+            num_children += len(new_children)
+            if zeros < max_zeros:  # the last level has no children, so it is not kept
+                children.extend(new_children)
+            for child, child_indices, total, orbit_size in new_children:
+                yield zeros, child, child_indices, total, orbit_size
+        if instrumentation is not None:
+            instrumentation.count('representatives', num_children)
+        parents = children
+
+
+def orderly_masks(colorings, max_zeros, instrumentation=None):
+    """
+    Yields (zeros, mask) for the canonical mask of every orbit of colorings with 1 to max_zeros
+    zeros, where colorings is a BitmaskColorings object. Every orbit is yielded exactly once,
+    level by level, and within a level in the order of the sorted zero indices.
+    A canonical coloring (the minimum mask of its orbit) stays canonical when its last zero is
+    turned back into a one, so every canonical coloring with k zeros is found exactly once by
+    adding a zero after the last zero of a canonical coloring with k - 1 zeros. Only the
+    representatives of the previous level are kept in memory, and those of the last level are
+    not kept at all.
+    """
+    for zeros, mask, _, _, _ in _orderly(colorings, max_zeros, None, instrumentation):
+        yield zeros, mask
+
+
+def orderly_scored_masks(colorings, pair_distances, max_zeros, instrumentation=None):
+    """
+    Like orderly_masks, but yields (zeros, mask, average_distance, orbit_size), where
+    average_distance is the average distance between the zeros and orbit_size the number of
+    colorings in the orbit of the mask. The pairwise distance sum of every representative is
+    updated from the one of its parent with a single row sum over the new zero, so scoring
+    costs O(zeros) per representative. pair_distances is an ExactPairDistances object.
+    """
+    for zeros, mask, _, total, orbit_size in _orderly(colorings, max_zeros, pair_distances, instrumentation):
+        yield zeros, mask, pair_distances.average(total, zeros), orbit_size
+
+
+def orderly_levels(colorings, max_zeros, instrumentation=None):
+    """
+    Yields (zeros, masks) for zeros from 1 to max_zeros, where masks is the list of the canonical
+    masks with that many zeros.
+    """
+    for zeros, level in itertools.groupby(orderly_masks(colorings, max_zeros, instrumentation), key=lambda pair: pair[0]):
+        yield zeros, [mask for _, mask in level]
+
+
+def orderly_scored_levels(colorings, pair_distances, max_zeros, instrumentation=None):
+    """
+    Yields (zeros, scored_masks) for zeros from 1 to max_zeros, where scored_masks is the list of
+    (mask, average_distance, orbit_size) of the canonical masks with that many zeros.
+    """
+    for zeros, scored_masks in orderly_scored_streams(colorings, pair_distances, max_zeros, instrumentation):
+        yield zeros, list(scored_masks)
+
+
+def orderly_scored_streams(colorings, pair_distances, max_zeros, instrumentation=None):
+    """
+    Like orderly_scored_levels, but scored_masks is an iterator that yields the
+    (mask, average_distance, orbit_size) of the level as they are generated, so no list of the
+    level is made. It must be used up (or left) before the next level is asked for.
+    """
+    for zeros, level in itertools.groupby(orderly_scored_masks(colorings, pair_distances, max_zeros, instrumentation),
+                                          key=lambda scored: scored[0]):
+        yield zeros, ((mask, dist, orbit_size) for _, mask, dist, orbit_size in level)
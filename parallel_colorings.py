@@ -0,0 +1,157 @@
+'''
+Created on Oct 18, 2026
+
+Enumerating the distinct colorings on a pool of processes. The work is split twice: all the
+levels (numbers of zeros) are processed at the same time, and the C(n, zeros) combinations of
+every level are split into contiguous ranges of lexicographic ranks, which the workers unrank
+and canonicalize independently.
+'''
+import functools
+import math
+import multiprocessing
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+
+
+def rank_combination(combination, num_vertices):
+    """
+    The lexicographic rank of the sorted combination among all combinations of
+    len(combination) elements of range(num_vertices).
+    """
+    rank = 0
+    start = 0
+    size = len(combination)
+    for ix, element in enumerate(combination):
+        for skipped in range(start, element):
+            rank += math.comb(num_vertices - skipped - 1, size - ix - 1)
+        start = element + 1
+    return rank
+
+
+def unrank_combination(rank, num_vertices, size):
+    """
+    The combination of size elements of range(num_vertices) with the given lexicographic rank
+    (the combinatorial number system).
+    """
+    assert 0 <= rank < math.comb(num_vertices, size), (rank, num_vertices, size)
+    combination = []
+    element = 0
+    for ix in range(size):
+        while True:
+            following = math.comb(num_vertices - element - 1, size - ix - 1)
+            if rank < following:
+                break
+            rank -= following
+            element += 1
+        combination.append(element)
+        element += 1
+    return tuple(combination)
+
+
+def combinations_range(num_vertices, size, start, stop):
+    """
+    Yields the combinations with lexicographic ranks start to stop - 1, in order.
+    """
+    if start >= stop:
+        return
+    combination = list(unrank_combination(start, num_vertices, size))
+    for _ in range(start, stop):
+        yield tuple(combination)
+        ix = size - 1  # advance to the next combination
+        while ix >= 0 and combination[ix] == num_vertices - size + ix:
+            ix -= 1
+        if ix < 0:
+            return
+        combination[ix] += 1
+        for following in range(ix + 1, size):
+            combination[following] = combination[following - 1] + 1
+
+
+def canonical_range(colorings, pair_distances, zeros, start, stop):
+    """
+    The list of (mask, average_distance, orbit_size) of the canonical colorings among the
+    combinations of zeros with lexicographic ranks start to stop - 1, in order of rank.
+    """
+    scored_masks = []
+    for zero_indices in combinations_range(colorings.num_vertices, zeros, start, stop):
+        mask = colorings.to_mask(zero_indices)
+        orbit_size = colorings.canonical_orbit_size(mask)
+        if orbit_size:
+            scored_masks.append((mask, pair_distances.average_distance(zero_indices), orbit_size))
+    return scored_masks
+
+
+def rank_ranges(num_vertices, zeros, chunk_size):
+    """
+    Splits the ranks of the C(num_vertices, zeros) combinations into contiguous (start, stop) ranges.
+    """
+    num_combinations = math.comb(num_vertices, zeros)
+    return [(start, min(start + chunk_size, num_combinations))
+            for start in range(0, num_combinations, chunk_size)]
+
+
+_worker = {}
+
+
+def _init_worker(all_rotations, distances):
+    """
+    Runs once in every worker process, so the group and the distance tables are sent to each
+    worker once instead of with every task.
+    """
+    _worker['colorings'] = BitmaskColorings(all_rotations)
+    _worker['pair_distances'] = ExactPairDistances(distances)
+
+
+def _canonical_range_task(task, summarize=None):
+    zeros, start, stop = task
+    scored_masks = canonical_range(_worker['colorings'], _worker['pair_distances'], zeros, start, stop)
+    return zeros, scored_masks if summarize is None else summarize(zeros, scored_masks)
+
+
+def map_ranges(all_rotations, distances, tasks, processes=None, summarize=None):
+    """
+    Yields canonical_range(zeros, start, stop) for every (zeros, start, stop) in tasks, in order.
+    With processes=1 the tasks run in this process, otherwise on a pool of processes
+    (processes defaults to the number of CPUs).
+    With summarize (a picklable function), summarize(zeros, scored_masks) is yielded instead,
+    and computed in the workers, so only the summaries are sent back.
+    """
+    if processes == 1:
+        colorings = BitmaskColorings(all_rotations)
+        pair_distances = ExactPairDistances(distances)
+        for zeros, start, stop in tasks:
+            scored_masks = canonical_range(colorings, pair_distances, zeros, start, stop)
+            yield scored_masks if summarize is None else summarize(zeros, scored_masks)
+        return
+    with multiprocessing.Pool(processes or multiprocessing.cpu_count(), initializer=_init_worker,
+                              initargs=(list(all_rotations), distances)) as pool:
+        task_function = functools.partial(_canonical_range_task, summarize=summarize)
+        for _, result in pool.imap(task_function, tasks):  # results come in task order
+            yield result
+
+
+def parallel_scored_levels(all_rotations, distances, zero_levels, processes=None, chunk_size=None):
+    """
+    Yields (zeros, scored_masks) for every number of zeros in zero_levels, where scored_masks is
+    the list of (mask, average_distance, orbit_size) of the canonical masks with that many zeros, in the same
+    order and with the same values as orderly_colorings.orderly_scored_levels gives them.
+    processes defaults to the number of CPUs. chunk_size is the number of combinations per task;
+    by default every level is split into about 4 tasks per process.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    num_vertices = len(next(iter(all_rotations)).perm)
+    tasks = []
+    for zeros in zero_levels:
+        level_chunk_size = chunk_size or max(1, -(-math.comb(num_vertices, zeros) // (4 * processes)))
+        tasks.extend((zeros, start, stop) for start, stop in rank_ranges(num_vertices, zeros, level_chunk_size))
+    num_tasks = {zeros: sum(1 for task in tasks if task[0] == zeros) for zeros in zero_levels}
+
+    level = []
+    done = 0
+    for (zeros, _, _), scored_masks in zip(tasks, map_ranges(all_rotations, distances, tasks, processes)):
+        level.extend(scored_masks)
+        done += 1
+        if done == num_tasks[zeros]:
+            yield zeros, level
+            level = []
+            done = 0
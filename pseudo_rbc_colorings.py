@@ -10,17 +10,12 @@ in the parent folder.
 Counting colorings for pseudo-rhombicuboctahedron. The file structure is same as rbc_colorings.py
 (please check the documentation there). Only difference is the hard-coded structure of the solid
 and the distances between various vertices.
-The run takes less than 1 minute.
+The run takes a few seconds (python -m povs_isomeriser.benchmarks times every stage).
 '''
-import datetime
-import os
-import sys
-import numpy as np
 from povs_isomeriser.rotation import Rotation
 from povs_isomeriser.compose_rotations import all_rotations_combos
-from povs_isomeriser.count_all_colorings import count_all_colorings
-from povs_isomeriser.average_distance import average_distance
-from povs_isomeriser.assert_rotations_and_distances import assert_rotations_and_distances
+from povs_isomeriser.colorings_driver import geometry_colorings, geometry_shard, parse_args, run
+from povs_isomeriser.geometry import load_geometry
 
 
 _VERTEX_LABELS = {'X1':1, 'X2':2,
@@ -198,42 +193,25 @@ def construct_pseudo_rbc_rots():
 
 
             
-def pseudo_rbc_colorings():
-    FOLDER_NAME = 'out_prbc'
-    if os.path.isdir(FOLDER_NAME):
-        print (f"The output directory {FOLDER_NAME} alredy exists, you can see it inside this folder.\nPlease rename it"+
-                   " or delete it if you want to regenerate the output.\nOtherwise I am not doing anything. Exiting now.")
-        return
-    os.mkdir(FOLDER_NAME)
-    
-    all_rots = construct_pseudo_rbc_rots()
-    assert len(all_rots) == 8, len(all_rots)
-    assert_rotations_and_distances(all_rots, distance_between_two_vertices)
-    # number of zeros is number of vertices in a particular color, then ones is the number of the other color
-    # you can think of it as blue color=zero red color=one
-    for zeros in range(1, 10):
-        sys.stdout.flush()
-        ones = 18 - zeros
-        unique_colorings, _ = count_all_colorings(all_rots, zeros, ones)
-        colorings_with_distances = []
-        for coloring in unique_colorings:    
-            zero_vertices = [p[0] for p in coloring if p[1] == '0']
-            dist = average_distance(zero_vertices, distance_between_two_vertices)
-            colorings_with_distances.append((coloring, dist))
-        unique_colorings = [(coloring_to_string(cl), dist) for cl, dist in colorings_with_distances]
-        unique_colorings = sorted(unique_colorings, key=lambda x: (-x[1], len(x[0]), x[0]))
-  
-        file_name = 'pseudo_rbc_{}zeros_{}.txt'.format(zeros, len(unique_colorings))
-        with open(f'{FOLDER_NAME}/{file_name}', 'w') as out_file:
-            for ix, coloring in enumerate(unique_colorings, 1):
-                out_file.write('{}. {} {}\n'.format(ix, coloring[0], np.round(coloring[1], 8)))
-            print (f'Writing {ix} colorings with {zeros} zeros to {file_name}')
-        sys.stdout.flush()
+def pseudo_rbc_colorings(processes=1, shard_dir=None):
+    """
+    Constructs all the different colorings from the built-in pseudo_rbc spec (geometries/pseudo_rbc.json).
+    The colors are encoded as binary digits: 0s and 1s. We create the colorings by iterating
+    over the number of zeros, which ranges from 1 to 9 (inclusive).
+    If shard_dir is given, the levels are merged from the partial results of a sharded run
+    (see pseudo_rbc_shard) instead of being enumerated.
+    """
+    geometry_colorings(load_geometry('pseudo_rbc'), processes, shard_dir)
+
+
+def pseudo_rbc_shard(shard, num_shards, shard_dir, processes=1):
+    """
+    Runs only shard number shard (counting from 0) of num_shards of the enumeration and writes
+    its partial result to shard_dir. Once all the shards are done, pseudo_rbc_colorings(shard_dir=shard_dir)
+    writes the output files.
+    """
+    geometry_shard(load_geometry('pseudo_rbc'), shard, num_shards, shard_dir, processes)
 
-    
 
-    
 if __name__ == '__main__':
-    print ("Started at ", datetime.datetime.now())
-    pseudo_rbc_colorings()
-    print ("Finished at ", datetime.datetime.now())
+    run(load_geometry('pseudo_rbc'), parse_args(__doc__))
@@ -0,0 +1,140 @@
+'''
+Created on Oct 18, 2026
+
+Ranking the colorings of a level for the output files without holding all of them, with their
+labels, in memory. The colorings come in as (mask, average_distance, orbit_size) and go out as
+(label, average_distance), sorted by decreasing distance, then by the length of the label and
+the label, which is the order of the output files. The labels are only made for the colorings
+that are written, when they are written: colorings with different distances are ordered by
+the distance alone, and only the colorings of a tie are labelled together to order them.
+'''
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
+import numpy as np
+
+DEFAULT_RUN_SIZE = 1 << 20
+_READ_BLOCK_SIZE = 1 << 12
+
+
+class RankedColorings(object):
+    """
+    Collects (mask, average_distance, orbit_size) with add and yields (label, average_distance) in rank order
+    when iterated; len gives the number of colorings that are yielded.
+    label_func makes the label of a mask. With top, only the top colorings are kept, in a heap,
+    and with smallest the ranking starts from the smallest distance instead of the largest.
+    Colorings with a distance below min_dist are left out. Otherwise all the colorings are kept:
+    every run_size of them are sorted and spilled to a file in tmp_dir, and the sorted runs are
+    merged when iterating (which removes the files, so it can only be done once), so at most
+    run_size colorings are in memory at once.
+    """
+    def __init__(self, label_func, top=None, smallest=False, min_dist=None, run_size=DEFAULT_RUN_SIZE,
+                 tmp_dir=None):
+        assert top is None or top > 0, top
+        self.label_func = label_func
+        self.top = top
+        self.sign = 1 if smallest else -1
+        self.min_dist = min_dist
+        self.run_size = run_size
+        self.tmp_dir = tmp_dir
+        self._count = 0
+        self._heap = []  # (-sign * dist, mask, orbit_size): the root is the worst coloring kept
+        self._heap_counts = {}
+        self._run = []
+        self._run_files = []
+        self._spill_dir = None
+
+    def add(self, mask, dist, orbit_size):
+        if self.min_dist is not None and dist < self.min_dist:
+            return
+        self._count += 1
+        if self.top is None:
+            self._run.append((dist, mask, orbit_size))
+            if len(self._run) >= self.run_size:
+                self._spill()
+            return
+        heap = self._heap
+        if len(heap) >= self.top and self.sign * dist > -heap[0][0]:
+            return  # worse than all the colorings kept
+        heapq.heappush(heap, (-self.sign * dist, mask, orbit_size))
+        self._heap_counts[dist] = self._heap_counts.get(dist, 0) + 1
+        # drop the worst distance once the others fill the top, keeping all the ties of the last place
+        worst = -self.sign * heap[0][0]
+        while len(heap) - self._heap_counts[worst] >= self.top:
+            while heap and -self.sign * heap[0][0] == worst:
+                heapq.heappop(heap)
+            del self._heap_counts[worst]
+            worst = -self.sign * heap[0][0]
+
+    def extend(self, scored_masks):
+        for mask, dist, orbit_size in scored_masks:
+            self.add(mask, dist, orbit_size)
+        return self
+
+    def __len__(self):
+        return self._count if self.top is None else min(self.top, self._count)
+
+    def __iter__(self):
+        return ((label, dist) for label, dist, _, _ in self.rows())
+
+    def rows(self):
+        """
+        Yields (label, average_distance, mask, orbit_size) in rank order.
+        """
+        if self.top is not None:
+            ranked = sorted(((-self.sign * key, mask, orbit_size) for key, mask, orbit_size in self._heap),
+                            key=self._key)
+            return itertools.islice(self._label_ties(ranked), self.top)
+        if not self._run_files:
+            return self._label_ties(sorted(self._run, key=self._key))
+        self._spill()
+        return self._merged()
+
+    def _key(self, scored):
+        return self.sign * scored[0]
+
+    def _label_ties(self, ranked):
+        """
+        Yields (label, dist, mask, orbit_size) from the (dist, mask, orbit_size) ranked by distance,
+        labelling and ordering the colorings of each tie.
+        """
+        for dist, tie in itertools.groupby(ranked, key=lambda scored: scored[0]):
+            labelled = sorted((len(label), label, mask, orbit_size)
+                              for label, mask, orbit_size in ((self.label_func(mask), mask, orbit_size)
+                                                              for _, mask, orbit_size in tie))
+            for _, label, mask, orbit_size in labelled:
+                yield label, dist, mask, orbit_size
+
+    def _spill(self):
+        if not self._run:
+            return
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(dir=self.tmp_dir, prefix='ranked_')
+        dists = np.array([dist for dist, _, _ in self._run], dtype=np.float64)
+        masks = np.array([mask for _, mask, _ in self._run], dtype=np.uint64)
+        sizes = np.array([orbit_size for _, _, orbit_size in self._run], dtype=np.uint32)
+        order = np.argsort(self.sign * dists, kind='stable')
+        path = os.path.join(self._spill_dir, 'run_{}_'.format(len(self._run_files)))
+        np.save(path + 'dists.npy', dists[order])
+        np.save(path + 'masks.npy', masks[order])
+        np.save(path + 'orbit_sizes.npy', sizes[order])
+        self._run_files.append(path)
+        self._run = []
+
+    def _read_run(self, path):
+        dists = np.load(path + 'dists.npy', mmap_mode='r')
+        masks = np.load(path + 'masks.npy', mmap_mode='r')
+        sizes = np.load(path + 'orbit_sizes.npy', mmap_mode='r')
+        for start in range(0, len(dists), _READ_BLOCK_SIZE):
+            stop = start + _READ_BLOCK_SIZE
+            yield from zip(dists[start:stop].tolist(), masks[start:stop].tolist(), sizes[start:stop].tolist())
+
+    def _merged(self):
+        try:
+            yield from self._label_ties(heapq.merge(*(self._read_run(path) for path in self._run_files), key=self._key))
+        finally:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+            self._run_files = []
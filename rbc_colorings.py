@@ -10,22 +10,22 @@ in the parent folder.
 Counting colorings for rhombicuboctahedron. We write them to a folder titled `out_rbc`, inside this local povs_isomeriser
 directory. If the out directory already exists, the program will exit without writing anything. In this
 case, you will need to rename or delete the existing `out` directory.
-The run takes a few seconds.
+The run takes a few seconds (see benchmarks.py for the time of every stage). Pass --processes N
+(0 for one per CPU) to spread the enumeration over N processes; the output is the same. To split the run over several machines, run it with
+--shard I/N --shard-dir DIR for I from 0 to N - 1, and then once with --merge DIR.
 
-If you want to generate colorings for a different configuration, you will need to copy this file to
-a new file (let's call it new.py), and you will need to appropriately modify the functions below that
-define the rotations (construct_rbc_rots()) and the distances (distance_between_two_vertices(v0, v1)).
+The geometry itself (the vertices and their labels, the rotations and the distances) is read from
+the spec file geometries/rbc.json, which was written from the functions below (construct_rbc_rots()
+and distance_between_two_vertices(v0, v1)). If you want to generate colorings for a different
+configuration, write a spec file for it (see geometry.py and geometry.write_spec) and run
+python -m povs_isomeriser.colorings_driver path/to/spec.json
+The compiled spec is cached, so repeat runs skip building and checking the rotation group.
 Feel free to contact me on LinkedIn if you need any help.
 '''
-import datetime
-import os
-import sys
-import numpy as np
 from povs_isomeriser.rotation import Rotation
 from povs_isomeriser.compose_rotations import all_rotations_combos
-from povs_isomeriser.count_all_colorings import count_all_colorings
-from povs_isomeriser.average_distance import average_distance
-from povs_isomeriser.assert_rotations_and_distances import assert_rotations_and_distances
+from povs_isomeriser.colorings_driver import geometry_colorings, geometry_shard, parse_args, run
+from povs_isomeriser.geometry import load_geometry
 
 _VERTEX_LABELS = {'C2':1, 'B2':2, 'A2':3, 'B1':4, 'A1':5, 'C1':6,
                 'b2c2':1, 'a2c2':2, 'b1c2':3, 'a1c2':4,
@@ -164,46 +164,25 @@ def construct_rbc_rots():
     
     return all_rotations_combos([rot1, rot2, rot3])
 
-def rbc_colorings():
+def rbc_colorings(processes=1, shard_dir=None):
     """
-    Constructs all the different colorings.
+    Constructs all the different colorings from the built-in rbc spec (geometries/rbc.json).
     The colors are encoded as binary digits: 0s and 1s. We create the colorings by iterating
-    over the number of zeros, which ranges from 2 to 9 (inclusive).
+    over the number of zeros, which ranges from 1 to 9 (inclusive).
+    If shard_dir is given, the levels are merged from the partial results of a sharded run
+    (see rbc_shard) instead of being enumerated.
     """
-    FOLDER_NAME = 'out_rbc'
-    if os.path.isdir(FOLDER_NAME):
-        print (f"The output directory {FOLDER_NAME} alredy exists, you can see it inside this folder.\nPlease rename it"+
-                   " or delete it if you want to regenerate the output.\nOtherwise I am not doing anything. Exiting now.")
-        return
-    os.mkdir(FOLDER_NAME)
-    all_rots = construct_rbc_rots()
-    assert len(all_rots) == 24
-    assert_rotations_and_distances(all_rots, distance_between_two_vertices)
-    # number of zeros is number of vertices in a particular color, then ones is the number of the other color
-    # you can think of it as blue color=zero red color=one
-    for zeros in range(1, 10): 
-        sys.stdout.flush()
-        ones = 18 - zeros
-        unique_colorings, _ = count_all_colorings(all_rots, zeros, ones)
-        colorings_with_distances = []
-        for coloring in unique_colorings:    
-            zero_vertices = [p[0] for p in coloring if p[1] == '0']
-            dist = average_distance(zero_vertices, distance_between_two_vertices)
-            colorings_with_distances.append((coloring, dist))
-        unique_colorings = [(coloring_to_string(cl), dist) for cl, dist in colorings_with_distances]
-        unique_colorings = sorted(unique_colorings, key=lambda x: (-x[1], len(x[0]), x[0]))
-  
-        file_name = 'rbc_{}zeros_{}.txt'.format(zeros, len(unique_colorings))
-        with open(f'{FOLDER_NAME}/{file_name}', 'w') as out_file:
-                for ix, coloring in enumerate(unique_colorings, 1):
-                    out_file.write('{}. {} {}\n'.format(ix, coloring[0], np.round(coloring[1], 2)))
-                print (f'Writing {ix} colorings with {zeros} zeros to {file_name}')
-        sys.stdout.flush()
+    geometry_colorings(load_geometry('rbc'), processes, shard_dir)
+
+
+def rbc_shard(shard, num_shards, shard_dir, processes=1):
+    """
+    Runs only shard number shard (counting from 0) of num_shards of the enumeration and writes
+    its partial result to shard_dir. Once all the shards are done, rbc_colorings(shard_dir=shard_dir)
+    writes the output files.
+    """
+    geometry_shard(load_geometry('rbc'), shard, num_shards, shard_dir, processes)
 
-    
 
-    
 if __name__ == '__main__':
-    print ("Started at ", datetime.datetime.now())
-    rbc_colorings()
-    print ("Finished at ", datetime.datetime.now())
+    run(load_geometry('rbc'), parse_args(__doc__))
@@ -0,0 +1,149 @@
+'''
+Created on Oct 18, 2026
+
+A cache of ranked levels on disk, shared by the runs of all the geometries. An entry is the
+result table of a level (see result_files), stored under a key that hashes everything the table
+depends on: the rotation group (its sorted permutations), the distance matrix, the site classes
+and the labels (which order the ties), the number of zeros and the options of the ranking. Two
+specs that compile to the same arrays share their entries, and a changed spec misses.
+The entries are written atomically, so concurrent runs can share a cache folder; the folder is
+kept under a size cap by removing the least recently used entries, the time of the last use
+being the modification time of the file.
+'''
+import hashlib
+import json
+import os
+import numpy as np
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import default_cache_dir
+from povs_isomeriser.orderly_colorings import orderly_scored_streams
+from povs_isomeriser.ranked_output import RankedColorings
+from povs_isomeriser.result_files import load_results, result_table, write_results
+
+_KEY_VERSION = 1
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def result_key(geometry, zeros, top=None, smallest=False, min_dist=None):
+    """
+    The sha256 key of the ranked level of a geometry with the given options (see RankedColorings).
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([_KEY_VERSION, zeros, top, smallest, min_dist, geometry.class_names]).encode('utf-8'))
+    for array, dtype in ((geometry.perms, '<i8'), (geometry.distances, '<f8'), (geometry.site_classes, '<i8'),
+                         (geometry.labels, '<i8')):
+        array = np.ascontiguousarray(array, dtype=dtype)
+        digest.update(json.dumps(array.shape).encode('utf-8'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """
+    The cache in cache_dir (default: the results folder of geometry.default_cache_dir), holding
+    at most about max_bytes. hits, misses, writes and evictions count what this object did.
+    """
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), 'results')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.bin')
+
+    def get(self, key):
+        """
+        The (memory-mapped) result table stored under key, or None.
+        """
+        path = self._path(key)
+        try:
+            _, table = load_results(path)
+        except FileNotFoundError:  # never stored, or removed by another run
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:  # removed by another run since, or a read-only cache: the table is still good
+            pass
+        self.hits += 1
+        return table
+
+    def put(self, key, table, geometry, zeros):
+        """
+        Stores a result table under key, atomically, and then evicts the least recently used
+        entries until the cache fits in max_bytes.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        write_results(self._path(key), table, geometry, zeros)
+        self.writes += 1
+        self.evict()
+
+    def entries(self):
+        """
+        The list of (last use, size in bytes, path) of the entries, least recently used first.
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.bin'):
+                path = os.path.join(self.cache_dir, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, max_bytes=None):
+        """
+        Removes the least recently used entries until the total size is at most max_bytes
+        (default: the cap of the cache).
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:  # removed by another run
+                pass
+            total -= size
+
+    def clear(self):
+        self.evict(0)
+
+    def stats(self):
+        entries = self.entries()
+        return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes, 'evictions': self.evictions,
+                'entries': len(entries), 'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
+
+
+def ranked_results(geometry, zero_levels, top=None, smallest=False, min_dist=None, cache=None):
+    """
+    The result tables of the given levels of a geometry, ranked like the drivers rank them, as a
+    dictionary by number of zeros. The levels are looked up in cache (a ResultCache) first; the
+    geometry is only enumerated if some are missing, and those are stored.
+    """
+    cache = cache if cache is not None else ResultCache()
+    zero_levels = sorted(set(zero_levels))
+    keys = {zeros: result_key(geometry, zeros, top, smallest, min_dist) for zeros in zero_levels}
+    tables = {zeros: cache.get(keys[zeros]) for zeros in zero_levels}
+    missing = [zeros for zeros in zero_levels if tables[zeros] is None]
+    if missing:
+        colorings = BitmaskColorings(geometry.group)
+        label = lambda mask: geometry.indices_to_string(colorings.zero_indices(mask))
+        pair_distances = ExactPairDistances(geometry.distances)
+        for zeros, scored_masks in orderly_scored_streams(colorings, pair_distances, max(missing)):
+            if zeros in missing:
+                ranked = RankedColorings(label, top, smallest, min_dist).extend(scored_masks)
+                tables[zeros] = result_table(colorings, geometry, ranked)
+                cache.put(keys[zeros], tables[zeros], geometry, zeros)
+    return tables
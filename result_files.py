@@ -0,0 +1,132 @@
+'''
+Created on Oct 18, 2026
+
+A binary result file per level, next to (or instead of re-parsing) the text files. A result file
+is a small header followed by a fixed-width table with one row per coloring, in the rank order of
+the text file:
+    mask            the canonical mask of the coloring (uint64, see count_all_colorings)
+    distance        the exact average distance (float64, not rounded)
+    orbit_size      the number of colorings that are the same up to rotation (uint32)
+    class_counts    the number of zeros in every site class (uint8 each)
+The header is b'POVSRES' + format byte, the little-endian uint32 length of a JSON object with the
+geometry name and hash, the number of zeros, the number of rows and the site class names, and
+padding to a multiple of 64 bytes, after which the table can be memory-mapped with load_results.
+The text files are written as the tables are filled (see fill_result_table), or rendered from
+loaded tables (see text_rows).
+'''
+import bisect
+import itertools
+import json
+import os
+import struct
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.batch_colorings import unpack_keys
+
+_MAGIC = b'POVSRES'
+_FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_BLOCK_SIZE = 1 << 12
+
+
+def result_dtype(num_classes):
+    return np.dtype([('mask', '<u8'), ('distance', '<f8'), ('orbit_size', '<u4'),
+                     ('class_counts', 'u1', (num_classes,))])
+
+
+def result_file_name(file_prefix, zeros, num_colorings):
+    return '{}_{}zeros_{}.bin'.format(file_prefix, zeros, num_colorings)
+
+
+def result_table(colorings, geometry, ranked):
+    """
+    The table of a ranked level, a ranked_output.RankedColorings object, in rank order.
+    """
+    table = np.zeros(len(ranked), dtype=result_dtype(len(geometry.class_names)))
+    for _ in fill_result_table(table, colorings, geometry, ranked.rows()):
+        pass
+    return table
+
+
+def fill_result_table(table, colorings, geometry, ranked_rows, block_size=_BLOCK_SIZE):
+    """
+    Fills table, block_size rows at a time, from the len(table)
+    (label, average_distance, mask, orbit_size) ranked_rows (see ranked_output.RankedColorings.rows), and yields their (label, average_distance)
+    once their block is filled, so the text file can be written with the labels of the ranking.
+    The class counts of a block are its zeros (the unset bits of the masks) times the one-hot
+    matrix of the site classes of the vertices.
+    """
+    assert colorings.num_vertices <= 64, 'masks are stored as uint64'
+    one_hot = np.zeros((colorings.num_vertices, len(geometry.class_names)), dtype=np.uint8)
+    one_hot[np.arange(colorings.num_vertices), geometry.site_classes] = 1
+    ranked_rows = iter(ranked_rows)
+    for start in range(0, len(table), block_size):
+        rows = list(itertools.islice(ranked_rows, block_size))
+        assert len(rows) == min(block_size, len(table) - start), 'fewer rows than the table'
+        block = table[start:start + len(rows)]
+        block['mask'] = np.fromiter((mask for _, _, mask, _ in rows), dtype=np.uint64, count=len(rows))
+        block['distance'] = np.fromiter((dist for _, dist, _, _ in rows), dtype=np.float64, count=len(rows))
+        block['orbit_size'] = np.fromiter((orbit_size for _, _, _, orbit_size in rows), dtype=np.uint32,
+                                          count=len(rows))
+        block['class_counts'] = (1 - unpack_keys(block['mask'], colorings.num_vertices)) @ one_hot
+        yield from ((label, dist) for label, dist, _, _ in rows)
+    assert next(ranked_rows, None) is None, 'more rows than the table'
+
+
+def write_results(path, table, geometry, zeros):
+    """
+    Writes the table of a level to path, atomically.
+    """
+    header = json.dumps({'geometry': geometry.name, 'geometry_hash': geometry.hash, 'zeros': zeros,
+                         'count': len(table), 'class_names': geometry.class_names}).encode('utf-8')
+    prefix = _MAGIC + bytes([_FORMAT_VERSION]) + struct.pack('<I', len(header))
+    padding = -(len(prefix) + len(header)) % _ALIGNMENT
+    with atomic_write(path) as out_file:
+        out_file.write(prefix + header + b' ' * padding)
+        out_file.write(np.ascontiguousarray(table).tobytes())
+
+
+def load_results(path, geometry_hash=None):
+    """
+    Returns (header, table) of a result file, the table being memory-mapped read-only. If
+    geometry_hash is given, the file must be for that geometry.
+    """
+    with open(path, 'rb') as in_file:
+        prefix = in_file.read(len(_MAGIC) + 5)
+        if prefix[:len(_MAGIC)] != _MAGIC or prefix[len(_MAGIC)] != _FORMAT_VERSION:
+            raise Exception('{} is not a result file'.format(path))
+        header_size, = struct.unpack('<I', prefix[len(_MAGIC) + 1:])
+        header = json.loads(in_file.read(header_size).decode('utf-8'))
+    if geometry_hash is not None and header['geometry_hash'] != geometry_hash:
+        raise Exception('{} is for a different geometry'.format(path))
+    offset = len(prefix) + header_size
+    offset += -offset % _ALIGNMENT
+    dtype = result_dtype(len(header['class_names']))
+    if header['count'] == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(header['count'],))
+
+
+def distance_range(table, low=None, high=None, smallest=False):
+    """
+    The rows of a table ranked by decreasing distance (increasing with smallest) with
+    low <= distance <= high. The bounds are found by binary search, so only the selected rows
+    of a memory-mapped table are read.
+    """
+    distances = table['distance']
+    sign = 1 if smallest else -1
+    first, last = (low, high) if smallest else (high, low)
+    start = 0 if first is None else bisect.bisect_left(distances, sign * first, key=lambda dist: sign * dist)
+    stop = len(table) if last is None else bisect.bisect_right(distances, sign * last, key=lambda dist: sign * dist)
+    return table[start:stop]
+
+
+def text_rows(table, label_func):
+    """
+    Yields the (label, average_distance) rows of the text file of a table, labelling every mask
+    with label_func as it is written (see colorings_driver.write_colorings). This is for tables
+    that are loaded; a table that is being ranked yields its labels with fill_result_table.
+    """
+    for start in range(0, len(table), _BLOCK_SIZE):
+        block = table[start:start + _BLOCK_SIZE]
+        yield from ((label_func(mask), dist) for mask, dist in zip(block['mask'].tolist(), block['distance'].tolist()))
@@ -3,61 +3,189 @@ Created on Jul 2, 2017
 
 @author: Viktor Simjanoski
 '''
+import math
+
+
+class VertexTable(object):
+    """
+    A sorted table of vertex names together with the reverse lookup from a vertex to its
+    position. Tables are shared: all rotations over the same set of vertices refer to the
+    same VertexTable object, so their permutation arrays index the vertices in the same order.
+    """
+    __slots__ = ('vertices', 'index', '_hash')
+    _tables = {}
+
+    def __init__(self, vertices):
+        self.vertices = vertices
+        self.index = {v: ix for ix, v in enumerate(vertices)}
+        self._hash = hash(vertices)
+
+    @classmethod
+    def get(cls, vertices):
+        """
+        Returns the shared table for the given vertices (in any order).
+        """
+        vertices = tuple(sorted(vertices))
+        table = cls._tables.get(vertices)
+        if table is None:
+            table = cls._tables[vertices] = cls(vertices)
+        return table
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (VertexTable.get, (self.vertices,))
+
+
 class Rotation(object):
     """
     A class representing a rotation, which is encoded in the mapping field,
     which is a python dictionary expressing what vertex gets moved into the
     old position of what other vertex.
+    Internally the rotation is stored as an integer permutation over a shared VertexTable:
+    perm[i] is the index of mapping[vertices[i]]. The cycle structure is computed once,
+    so degree, power(n), inverse() and composition (rot1 * rot2 == rot1(rot2)) are all
+    O(n) operations on the permutation.
     """
+    __slots__ = ('_table', '_perm', '_mapping', '_cycles', '_degree', '_hash')
+
     def __init__(self, mapping):
         self._mapping = mapping
         self._assert()
-        self._init_degree()
-    
+        self._table = VertexTable.get(mapping)
+        index = self._table.index
+        self._init_perm(tuple(index[mapping[v]] for v in self._table.vertices))
+
+    @classmethod
+    def from_permutation(cls, perm, table):
+        """
+        Builds a rotation directly from a permutation of the indices of the VertexTable table.
+        """
+        assert len(perm) == len(table)
+        rot = cls.__new__(cls)
+        rot._mapping = None
+        rot._table = table
+        rot._init_perm(tuple(perm))
+        return rot
+
+    @classmethod
+    def identity(cls, table):
+        return cls.from_permutation(range(len(table)), table)
+
     def  _assert(self):
-        assert len(set(self._mapping.keys())) == len(self.mapping) 
+        assert len(set(self._mapping.keys())) == len(self.mapping)
         assert len(set(self._mapping.values())) == len(self.mapping)
         assert sorted(self.mapping.keys()) == sorted(self.mapping.values())
-        
-    def _init_degree(self):
+
+    def _init_perm(self, perm):
+        self._perm = perm
+        self._hash = hash(perm)
+        self._init_cycles()
+
+    def _init_cycles(self):
         """
-        What power gives the identity mapping (that doesn't change the object it is applied to)
+        Splits the permutation into cycles (fixed points included, as cycles of length 1).
+        The degree is the power that gives the identity mapping (that doesn't change the object
+        it is applied to), i.e. the least common multiple of the cycle lengths.
         You can think of it as equivalently the 360 degree rotation. So for example, if this Rotation
-        object corresponded to a 60-degree rotation, this function would return 6.
-        """
-        self._degree = 1
-        mapping = {k:v for k, v  in self.mapping.items()}
-        while not (all(k == v for k, v in mapping.items())):
-            mapping = {k:self.mapping[v] for k, v in mapping.items()}
-            self._degree += 1
-            if self._degree > 1000:
-                raise Exception('The degree of this rotation is too high')
-            
-            
+        object corresponded to a 60-degree rotation, the degree would be 6.
+        """
+        perm = self._perm
+        seen = [False] * len(perm)
+        cycles = []
+        for start in range(len(perm)):
+            if seen[start]:
+                continue
+            cycle = []
+            ix = start
+            while not seen[ix]:
+                seen[ix] = True
+                cycle.append(ix)
+                ix = perm[ix]
+            cycles.append(tuple(cycle))
+        self._cycles = tuple(cycles)
+        self._degree = math.lcm(*(len(cycle) for cycle in cycles)) if cycles else 1
+
     @property
     def mapping(self):
+        if self._mapping is None:
+            vertices = self._table.vertices
+            self._mapping = {v: vertices[p] for v, p in zip(vertices, self._perm)}
         return self._mapping
-    
+
+    @property
+    def table(self):
+        return self._table
+
+    @property
+    def vertices(self):
+        return self._table.vertices
+
+    @property
+    def perm(self):
+        return self._perm
+
+    @property
+    def cycles(self):
+        """
+        The cycles of the permutation, as tuples of vertex indices.
+        """
+        return self._cycles
+
+    @property
+    def cycle_type(self):
+        """
+        The cycle lengths, sorted in decreasing order.
+        """
+        return tuple(sorted((len(cycle) for cycle in self._cycles), reverse=True))
+
     def power(self, n):
         """
         Applying this same rotation n times
         """
-        mapping = {k:k for k in self.mapping}
-        for _ in range(n):
-            mapping = {k:self.mapping[v] for k, v in mapping.items()}
-        return Rotation(mapping)
-    
+        perm = [0] * len(self._perm)
+        for cycle in self._cycles:
+            shift = n % len(cycle)
+            for ix, v in enumerate(cycle):
+                perm[v] = cycle[(ix + shift) % len(cycle)]
+        return Rotation.from_permutation(perm, self._table)
+
+    def inverse(self):
+        perm = [0] * len(self._perm)
+        for ix, p in enumerate(self._perm):
+            perm[p] = ix
+        return Rotation.from_permutation(perm, self._table)
+
+    def __mul__(self, other):
+        """
+        self * other is the composed rotation self(other)
+        """
+        assert other._table is self._table
+        perm = self._perm
+        return Rotation.from_permutation([perm[p] for p in other._perm], self._table)
+
     @property
     def degree(self):
         return self._degree
-    
+
     def __getitem__(self, key):
         return self.mapping[key]
-     
+
     def __hash__(self):
-        return hash(tuple(sorted(self.mapping.items())))
-    
+        return self._hash
+
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._table is other._table and self._perm == other._perm
         return False
+
+    def __reduce__(self):
+        return (_rotation_from_permutation, (self._perm, self._table))
+
+
+def _rotation_from_permutation(perm, table):
+    return Rotation.from_permutation(perm, table)
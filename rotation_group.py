@@ -0,0 +1,149 @@
+'''
+Created on Oct 18, 2026
+
+A closed group of rotations with its elements numbered 0 to order - 1, so that group arithmetic
+is done with table lookups instead of composing Rotation objects: the Cayley table of the
+products, the inverses, the orders, the conjugacy classes and the cycle types of the elements
+are all computed once, when the group is built.
+'''
+import collections
+import numpy as np
+from povs_isomeriser.compose_rotations import all_rotations_combos
+
+
+class RotationGroup(object):
+    """
+    The rotations of a closed group, sorted by their permutations, so element 0 is the identity
+    and the elements are numbered like the rotations of BitmaskColorings.
+        perms       the (order, num vertices) array of the stacked permutations
+        products    the (order, order) Cayley table: products[a, b] is the element a * b, i.e. a(b)
+        inverses    inverses[a] is the inverse of element a
+        orders      orders[a] is the smallest n > 0 for which a ** n is the identity
+        cycle_types cycle_types[a] is the cycle type of element a (see Rotation.cycle_type)
+    """
+    def __init__(self, rotations):
+        self._init_elements(rotations)
+        order = len(self.elements)
+        self.products = np.zeros((order, order), dtype=np.intp)
+        index = {perm.tobytes(): ix for ix, perm in enumerate(self.perms)}
+        for a in range(order):
+            for b, perm in enumerate(self.perms[a][self.perms]):  # perms[a][perms[b]] is a(b)
+                product = index.get(perm.tobytes())
+                if product is None:
+                    raise Exception('The rotations are not closed under composition')
+                self.products[a, b] = product
+        self.inverses = np.nonzero(self.products == 0)[1]
+        self.orders = self._orders()
+        self.cycle_types = [rot.cycle_type for rot in self.elements]
+        self._powers = {}
+
+    def _init_elements(self, rotations):
+        self.elements = sorted(rotations, key=lambda rot: rot.perm)
+        table = self.elements[0].table
+        assert all(rot.table is table for rot in self.elements)
+        self._index = {rot.perm: ix for ix, rot in enumerate(self.elements)}
+        assert len(self._index) == len(self.elements), 'The rotations must be different'
+        order, num_vertices = len(self.elements), len(table)
+        assert self.elements[0].perm == tuple(range(num_vertices)), 'The identity must be in the group'
+        self.perms = np.array([rot.perm for rot in self.elements], dtype=np.intp).reshape(order, num_vertices)
+
+    @classmethod
+    def from_generators(cls, generators):
+        return cls(all_rotations_combos(generators))
+
+    @classmethod
+    def from_tables(cls, rotations, products, inverses, orders):
+        """
+        The group of rotations with the given tables of an earlier group of the same rotations
+        (see geometry.load_geometry, which stores them), without checking the closure or computing
+        the Cayley table again.
+        """
+        group = cls.__new__(cls)
+        group._init_elements(rotations)
+        order = len(group.elements)
+        assert products.shape == (order, order) and inverses.shape == orders.shape == (order,)
+        group.products = np.asarray(products, dtype=np.intp)
+        group.inverses = np.asarray(inverses, dtype=np.intp)
+        group.orders = np.asarray(orders, dtype=np.intp)
+        group.cycle_types = [rot.cycle_type for rot in group.elements]
+        group._powers = {}
+        return group
+
+    @classmethod
+    def of(cls, rotations):
+        """
+        rotations itself if it is a RotationGroup, and the group of the closed set rotations otherwise.
+        """
+        return rotations if isinstance(rotations, cls) else cls(rotations)
+
+    def _orders(self):
+        elements = np.arange(len(self.elements))
+        orders = np.zeros(len(self.elements), dtype=np.intp)
+        power = elements
+        n = 1
+        while not orders.all():
+            orders[(power == 0) & (orders == 0)] = n
+            power = self.products[power, elements]
+            n += 1
+        return orders
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __getitem__(self, element):
+        return self.elements[element]
+
+    def index(self, rotation):
+        """
+        The element number of a rotation.
+        """
+        return self._index[rotation.perm]
+
+    def power(self, element, n):
+        """
+        The element number of element ** n (n may be negative). The powers of an element are
+        tabulated the first time they are needed.
+        """
+        powers = self._powers.get(element)
+        if powers is None:
+            powers = [0]
+            for _ in range(self.orders[element] - 1):
+                powers.append(int(self.products[element, powers[-1]]))
+            self._powers[element] = powers
+        return powers[n % len(powers)]
+
+    def subgroup(self, generators):
+        """
+        The sorted element numbers of the subgroup generated by the given element numbers.
+        """
+        found = set([0])
+        frontier = [0]
+        while frontier:
+            new_elements = set(self.products[np.ix_(generators, frontier)].ravel().tolist()) - found
+            found |= new_elements
+            frontier = list(new_elements)
+        return sorted(found)
+
+    def conjugacy_classes(self):
+        """
+        The conjugacy classes, as sorted tuples of element numbers, in the order of their smallest element.
+        """
+        # conjugates[h, g] is h g h^-1
+        conjugates = self.products[self.products, self.inverses[:, None]]
+        classes = []
+        seen = set()
+        for element in range(len(self.elements)):
+            if element not in seen:
+                conjugacy_class = tuple(sorted(set(conjugates[:, element].tolist())))
+                classes.append(conjugacy_class)
+                seen.update(conjugacy_class)
+        return classes
+
+    def cycle_index(self):
+        """
+        The number of elements of every cycle type, see cycle_index.cycle_index.
+        """
+        return dict(collections.Counter(self.cycle_types))
@@ -0,0 +1,106 @@
+'''
+Created on Oct 18, 2026
+
+Splitting an enumeration into independent shards that can run on different machines, and
+merging their partial results. The (level, combination rank range) tasks are numbered in a
+fixed order and shard i of N takes every N-th task starting from task i, so a shard always does
+the same work and can be rerun on its own.
+'''
+import os
+import numpy as np
+from povs_isomeriser.atomic_files import atomic_write
+from povs_isomeriser.parallel_colorings import rank_ranges, map_ranges
+
+DEFAULT_CHUNK_SIZE = 1 << 14
+
+
+def shard_tasks(num_vertices, zero_levels, shard, num_shards, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    The (zeros, start, stop) tasks of shard number shard (counting from 0) out of num_shards.
+    """
+    assert 0 <= shard < num_shards, (shard, num_shards)
+    tasks = [(zeros, start, stop) for zeros in zero_levels
+             for start, stop in rank_ranges(num_vertices, zeros, chunk_size)]
+    return tasks[shard::num_shards]
+
+
+def shard_file_name(shard, num_shards):
+    return 'shard_{}_of_{}.npz'.format(shard, num_shards)
+
+
+def run_shard(colorings, distances, zero_levels, shard, num_shards, shard_dir,
+              chunk_size=DEFAULT_CHUNK_SIZE, processes=1, geometry_hash=''):
+    """
+    Canonicalizes the combinations of one shard and writes the canonical masks with their number
+    of zeros, average distance and orbit size to shard_dir/shard_{shard}_of_{num_shards}.npz,
+    together with the hash of the geometry (see geometry.spec_hash).
+    The file is written atomically, so a failed shard leaves no partial file behind.
+    Returns the path of the file.
+    """
+    assert colorings.num_vertices <= 64, 'masks are stored as uint64'
+    tasks = shard_tasks(colorings.num_vertices, zero_levels, shard, num_shards, chunk_size)
+    zeros_column, keys, scores, orbit_sizes = [], [], [], []
+    for (zeros, _, _), scored_masks in zip(tasks, map_ranges(colorings.group, distances, tasks, processes)):
+        for mask, dist, orbit_size in scored_masks:
+            zeros_column.append(zeros)
+            keys.append(mask)
+            scores.append(dist)
+            orbit_sizes.append(orbit_size)
+
+    os.makedirs(shard_dir, exist_ok=True)
+    path = os.path.join(shard_dir, shard_file_name(shard, num_shards))
+    with atomic_write(path) as out_file:
+        np.savez(out_file, shard=shard, num_shards=num_shards, chunk_size=chunk_size, geometry_hash=geometry_hash,
+                 zero_levels=np.array(list(zero_levels), dtype=np.int64),
+                 vertices=np.array([str(v) for v in colorings.vertices]),
+                 zeros=np.array(zeros_column, dtype=np.uint8), keys=np.array(keys, dtype=np.uint64),
+                 scores=np.array(scores, dtype=np.float64),
+                 orbit_sizes=np.array(orbit_sizes, dtype=np.uint32))
+    return path
+
+
+def load_shards(colorings, shard_dir, geometry_hash=None):
+    """
+    Loads all the shard files in shard_dir and checks that they belong to the same run of the same
+    geometry (the one with geometry_hash, if given) and that none is missing. Returns (zero_levels, zeros, keys, scores, orbit_sizes),
+    the columns being concatenated over all the shards.
+    """
+    file_names = sorted(f for f in os.listdir(shard_dir) if f.startswith('shard_') and f.endswith('.npz'))
+    if not file_names:
+        raise Exception('No shard files in {}'.format(shard_dir))
+    shards = []
+    for file_name in file_names:
+        with np.load(os.path.join(shard_dir, file_name)) as data:
+            shards.append({key: data[key] for key in data.files})
+    first = shards[0]
+    num_shards = int(first['num_shards'])
+    for data in shards:
+        if (int(data['num_shards']) != num_shards or int(data['chunk_size']) != int(first['chunk_size'])
+                or data['zero_levels'].tolist() != first['zero_levels'].tolist()):
+            raise Exception('The shard files in {} come from different runs'.format(shard_dir))
+        if (data['vertices'].tolist() != [str(v) for v in colorings.vertices]
+                or geometry_hash is not None and str(data['geometry_hash']) != geometry_hash):
+            raise Exception('The shard files in {} are for a different geometry'.format(shard_dir))
+    missing = sorted(set(range(num_shards)) - set(int(data['shard']) for data in shards))
+    if missing:
+        raise Exception('Missing shards {} of {} in {}'.format(missing, num_shards, shard_dir))
+    return (first['zero_levels'].tolist(),) + tuple(
+        np.concatenate([data[column] for data in shards]) for column in ('zeros', 'keys', 'scores', 'orbit_sizes'))
+
+
+def merged_scored_levels(colorings, shard_dir, geometry_hash=None):
+    """
+    The list of (zeros, scored_masks) for every level of the sharded run in shard_dir, like
+    orderly_colorings.orderly_scored_levels gives them: the (mask, average_distance, orbit_size) of
+    all the canonical masks with that many zeros, deduplicated and sorted by mask.
+    """
+    zero_levels, zeros_column, keys, scores, orbit_sizes = load_shards(colorings, shard_dir, geometry_hash)
+    levels = []
+    for zeros in zero_levels:
+        level = zeros_column == zeros
+        level_keys, first = np.unique(keys[level], return_index=True)
+        level_scores = scores[level][first]
+        level_orbit_sizes = orbit_sizes[level][first]
+        levels.append((zeros, [(int(key), float(score), int(orbit_size))
+                               for key, score, orbit_size in zip(level_keys, level_scores, level_orbit_sizes)]))
+    return levels
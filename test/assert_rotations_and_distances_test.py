@@ -0,0 +1,37 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+from povs_isomeriser.rotation import Rotation
+from povs_isomeriser.assert_rotations_and_distances import assert_rotations_and_distances
+from povs_isomeriser import rbc_colorings, pseudo_rbc_colorings
+
+
+class AssertRotationsAndDistancesTest(unittest.TestCase):
+
+    def test_rbc(self):
+        assert_rotations_and_distances(rbc_colorings.construct_rbc_rots(),
+                                       rbc_colorings.distance_between_two_vertices)
+
+    def test_pseudo_rbc(self):
+        assert_rotations_and_distances(pseudo_rbc_colorings.construct_pseudo_rbc_rots(),
+                                       pseudo_rbc_colorings.distance_between_two_vertices)
+
+    def test_distance_changed(self):
+        rot = Rotation({1:2, 2:3, 3:1})
+        distance_func = lambda x, y: 1.0 if {x, y} == {1, 2} else 2.0
+        with self.assertRaises(AssertionError) as context:
+            assert_rotations_and_distances([rot], distance_func)
+        self.assertIn('rotation 0 moves 1-2 (1.0) to 2-3 (2.0)', str(context.exception))
+        assert_rotations_and_distances([rot], distance_func, tol=1.5)
+
+    def test_edge_changed(self):
+        # swaps A1 with B1 but leaves their edges where they are
+        rot = Rotation({'A1':'B1', 'B1':'A1', 'C1':'C1', 'a1c1':'a1c1', 'b1c1':'b1c1'})
+        with self.assertRaises(AssertionError) as context:
+            assert_rotations_and_distances([rot], lambda x, y: 1.0)
+        self.assertIn('rotation 0 moves A1-C1 to B1-C1 but a1c1 to a1c1', str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
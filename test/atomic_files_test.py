@@ -0,0 +1,45 @@
+'''
+Created on Oct 18, 2026
+'''
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from povs_isomeriser.atomic_files import atomic_write
+
+
+class AtomicFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'file.txt')
+        self.umask = os.umask(0o022)
+
+    def tearDown(self):
+        os.umask(self.umask)
+        shutil.rmtree(self.dir)
+
+    def test_permissions(self):
+        with atomic_write(self.path, 'w') as out_file:
+            out_file.write('a')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+        os.umask(0o007)
+        with atomic_write(self.path) as out_file:
+            out_file.write(b'b')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o660)
+
+    def test_failed_write(self):
+        with atomic_write(self.path, 'w') as out_file:
+            out_file.write('old')
+        with self.assertRaises(ZeroDivisionError):
+            with atomic_write(self.path, 'w') as out_file:
+                out_file.write('new')
+                1 / 0
+        self.assertEqual(os.listdir(self.dir), ['file.txt'])
+        with open(self.path) as in_file:
+            self.assertEqual(in_file.read(), 'old')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,12 @@ Created on Jul 7, 2017
 
 @author: Viktor Simjanoski
 '''
+import itertools
 import unittest
-from povs_isomeriser.average_distance import average_distance
+import numpy as np
+from povs_isomeriser.average_distance import average_distance, average_distance_from_matrix
+from povs_isomeriser.distance_matrix import compile_distance_matrix
+from povs_isomeriser.rbc_colorings import _VERTEX_LABELS, distance_between_two_vertices
 
 class AverageDistanceTest(unittest.TestCase):
 
@@ -19,6 +23,28 @@ class AverageDistanceTest(unittest.TestCase):
         distance_func = lambda x, y:  abs(x - y)
         self.assertAlmostEqual(average_distance(points, distance_func), 5.0 / 3, places=7)
 
+    def test_check(self):
+        points = [1, 2, 3]
+        distance_func = lambda x, y: x - y if x > y else 2 * (y - x)
+        self.assertAlmostEqual(average_distance(points, distance_func), 8.0 / 3, places=7)
+        with self.assertRaises(AssertionError):
+            average_distance(points, distance_func, check=True)
+
+    def test_from_matrix(self):
+        points = [1, 2, 3, 4]
+        distance_func = lambda x, y:  abs(x - y)
+        distances = compile_distance_matrix(points, distance_func)
+        self.assertEqual(average_distance_from_matrix([0, 1, 2, 3], distances), 5.0 / 3)
+        self.assertEqual(average_distance_from_matrix(np.array([0, 2]), distances), 2.0)
+        self.assertEqual(average_distance_from_matrix([3], distances), 0.0)
+
+    def test_from_matrix_same_as_func(self):
+        vertices = sorted(_VERTEX_LABELS)
+        distances = compile_distance_matrix(vertices, distance_between_two_vertices)
+        for indices in itertools.combinations(range(0, 18, 2), 5):
+            self.assertEqual(average_distance_from_matrix(indices, distances),
+                             average_distance([vertices[ix] for ix in indices], distance_between_two_vertices))
+
 
 if __name__ == "__main__":
     unittest.main()
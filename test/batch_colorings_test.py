@@ -0,0 +1,50 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+import numpy as np
+from povs_isomeriser.rotation import Rotation
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.count_all_colorings import BitmaskColorings, count_all_colorings
+from povs_isomeriser.batch_colorings import batch_unique_masks, pack_keys, unpack_keys, \
+    canonical_keys, permutation_matrix, combination_blocks
+from povs_isomeriser.rbc_colorings import construct_rbc_rots
+
+
+class BatchColoringsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.colorings = BitmaskColorings(construct_rbc_rots())
+
+    def test_pack_keys(self):
+        colors = np.array([[0, 1, 1], [1, 0, 0]], dtype=np.uint8)
+        self.assertEqual(list(pack_keys(colors)), [3, 4])
+        masks = [0, 1, 2 ** 17 + 5, 2 ** 18 - 1]
+        self.assertEqual(list(pack_keys(unpack_keys(masks, 18))), masks)
+
+    def test_canonical_keys(self):
+        perms = permutation_matrix(self.colorings)
+        masks = [self.colorings.to_mask(zero_indices) for zero_indices in [(3, 7, 11), (0, 17), (5,)]]
+        keys = canonical_keys(unpack_keys(masks, 18), perms)
+        self.assertEqual(list(keys), [self.colorings.canonical(mask) for mask in masks])
+
+    def test_blocks(self):
+        blocks = list(combination_blocks(5, 2, block_size=3))
+        self.assertEqual([len(block) for block in blocks], [3, 3, 3, 1])
+        self.assertEqual(blocks[0].tolist(), [[0, 1], [0, 2], [0, 3]])
+        self.assertEqual([block.shape for block in combination_blocks(5, 0)], [(1, 0)])
+
+    def test_same_as_python(self):
+        for zeros in range(0, 10):
+            masks = batch_unique_masks(self.colorings, zeros, block_size=1000)
+            self.assertEqual(masks.tolist(), list(self.colorings.unique_masks(zeros)))
+
+    def test_count_all_colorings(self):
+        all_rotations = all_rotations_combos([Rotation({1:2, 2:3, 3:4, 4:5, 5:6, 6:1})])
+        for zeros in range(7):
+            self.assertEqual(count_all_colorings(all_rotations, zeros, 6 - zeros, block_size=4),
+                             count_all_colorings(all_rotations, zeros, 6 - zeros))
+
+
+if __name__ == "__main__":
+    unittest.main()
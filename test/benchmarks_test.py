@@ -0,0 +1,30 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+from povs_isomeriser.benchmarks import cage_coordinates, run_benchmarks, compare, _case_tables
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def test_cages(self):
+        for name, num_vertices, group_order in (('cube', 8, 24), ('icosahedron', 12, 60),
+                                                ('truncated_octahedron', 24, 24), ('icosidodecahedron', 30, 60),
+                                                ('truncated_icosahedron', 60, 60)):
+            self.assertEqual(len(cage_coordinates(name)), num_vertices)
+            _, rotations, _ = _case_tables(name)
+            self.assertEqual(len(rotations), group_order, name)
+
+    def test_run_and_compare(self):
+        results = run_benchmarks([('cube', 3), ('rbc', 2)])
+        stages = [(r['geometry'], r['stage'], r['zeros']) for r in results['results']]
+        self.assertEqual(stages[:6], [('cube', 'group', None), ('cube', 'check', None), ('cube', 'tables', None),
+                                      ('cube', 'enumerate', 1), ('cube', 'score', 1), ('cube', 'write', 1)])
+        self.assertEqual([r['colorings'] for r in results['results'] if r['stage'] == 'write'], [1, 3, 3, 2, 10])
+        self.assertEqual(compare(results, results), [])
+        slower = {'memory': False, 'results': [dict(r, seconds=r['seconds'] * 2 + 0.01) for r in results['results']]}
+        self.assertEqual(len(compare(slower, results)), len(results['results']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+'''
+Created on Oct 18, 2026
+'''
+import contextlib
+import functools
+import io
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from povs_isomeriser.checkpoint import (checkpointed_scored_levels, load_checkpoint, write_checkpoint,
+                                        CHECKPOINT_FILE_NAME)
+from povs_isomeriser.colorings_driver import geometry_colorings
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.isomer_index import IsomerIndex
+from povs_isomeriser.result_files import load_results
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingClock(object):
+    """
+    A clock that ticks one second per call and raises Interrupted on call number stop.
+    """
+    def __init__(self, stop=None):
+        self.calls = 0
+        self.stop = stop
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls == self.stop:
+            raise Interrupted()
+        return float(self.calls)
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = load_geometry('rbc', False)
+        self.colorings = BitmaskColorings(self.geometry.rotations)
+        self.pair_distances = ExactPairDistances(self.geometry.distances)
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, CHECKPOINT_FILE_NAME)
+        self.expected = list(orderly_scored_levels(self.colorings, self.pair_distances, 6))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def levels(self, clock, resume=False):
+        return checkpointed_scored_levels(self.colorings, self.pair_distances, 6, self.path, self.geometry.hash,
+                                          interval=1.0, resume=resume, clock=clock)
+
+    def test_levels(self):
+        self.assertEqual(list(self.levels(InterruptingClock())), self.expected)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_after_interruption(self):
+        levels = self.levels(InterruptingClock(stop=250))
+        done = []
+        with self.assertRaises(Interrupted):
+            for level in levels:
+                done.append(level)
+        finished, _, next_parent, children = load_checkpoint(self.path, self.geometry.hash, 6)
+        self.assertEqual(finished, len(done))
+        self.assertGreater(next_parent, 0)
+        self.assertGreater(len(children), 0)
+        resumed = list(self.levels(InterruptingClock(), resume=True))
+        self.assertEqual(done + resumed, self.expected)
+        self.assertEqual(resumed[0][0], len(done) + 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_wrong_geometry(self):
+        write_checkpoint(self.path, 'another hash', 6, 1, [], 0, [])
+        with self.assertRaises(Exception):
+            list(self.levels(InterruptingClock(), resume=True))
+        with self.assertRaises(Exception):
+            load_checkpoint(self.path, self.geometry.hash, 7)
+
+
+class DriverResumeTest(unittest.TestCase):
+    """
+    The output files of rbc up to 6 zeros, written straight through and by a run that is
+    interrupted in the middle of a level and resumed.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def geometry(self, folder_name):
+        geometry = load_geometry('rbc', False)
+        geometry.folder_name = os.path.join(self.dir, folder_name)
+        geometry.max_zeros = 6
+        return geometry
+
+    def run_driver(self, geometry, checkpoint_clock=None, **options):
+        levels = functools.partial(checkpointed_scored_levels, clock=checkpoint_clock)
+        with mock.patch('povs_isomeriser.colorings_driver.checkpointed_scored_levels', levels), \
+                contextlib.redirect_stdout(io.StringIO()):
+            geometry_colorings(geometry, checkpoint_interval=1.0 if checkpoint_clock else None, **options)
+
+    def files(self, geometry):
+        files = {}
+        for file_name in os.listdir(geometry.folder_name):
+            with open(os.path.join(geometry.folder_name, file_name), 'rb') as in_file:
+                files[file_name] = in_file.read()
+        return files
+
+    def assert_resumed_like_straight(self, name, **options):
+        straight = self.geometry(name + '_straight')
+        self.run_driver(straight, **options)
+        resumed = self.geometry(name + '_resumed')
+        with self.assertRaises(Interrupted):
+            self.run_driver(resumed, InterruptingClock(stop=250), **options)
+        self.assertIn(CHECKPOINT_FILE_NAME, os.listdir(resumed.folder_name))
+        text_files = lambda geometry: [file_name for file_name in self.files(geometry) if file_name.endswith('.txt')]
+        self.assertLess(len(text_files(resumed)), len(text_files(straight)))
+        self.run_driver(resumed, InterruptingClock(), resume=True, **options)
+        self.assertEqual(self.files(resumed), self.files(straight))
+        return self.files(straight)
+
+    def test_default(self):
+        files = self.assert_resumed_like_straight('default')
+        self.assertEqual(len(files), 6)
+        reference_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'out_rbc')
+        for file_name, content in files.items():
+            with open(os.path.join(reference_dir, file_name), 'rb') as in_file:
+                self.assertEqual(content, in_file.read(), file_name)
+
+    def test_top_binary(self):
+        files = self.assert_resumed_like_straight('top', top=5, binary=True)
+        self.assertEqual(len(files), 12)
+        geometry = self.geometry('top_straight')
+        lines = files['rbc_6zeros_5.txt'].decode('utf-8').splitlines()
+        _, table = load_results(os.path.join(geometry.folder_name, 'rbc_6zeros_5.bin'), geometry.hash)
+        colorings = BitmaskColorings(geometry.group)
+        for rank, (line, mask) in enumerate(zip(lines, table['mask'].tolist()), 1):
+            label = geometry.indices_to_string(colorings.zero_indices(mask))
+            self.assertTrue(line.startswith('{}. {} '.format(rank, label)), line)
+
+    def test_index(self):
+        files = self.assert_resumed_like_straight('index', index=True)
+        self.assertEqual(len(files), 12)
+        geometry = self.geometry('index_straight')
+        lines = files['rbc_5zeros_380.txt'].decode('utf-8').splitlines()
+        index = IsomerIndex(geometry, geometry.folder_name)
+        for zero_indices in itertools.combinations(range(len(geometry.vertices)), 5):
+            rank, label, _ = index.lookup([geometry.vertices[ix] for ix in zero_indices])
+            self.assertTrue(lines[rank - 1].startswith('{}. {} '.format(rank, label)), label)
+
+    def test_smallest_min_dist(self):
+        files = self.assert_resumed_like_straight('smallest', smallest=True, min_dist=500.0, binary=True)
+        for file_name, content in files.items():
+            if file_name.endswith('.txt'):
+                distances = [float(line.split()[-1]) for line in content.decode('utf-8').splitlines()]
+                self.assertTrue(all(dist >= 500.0 for dist in distances), file_name)
+                self.assertEqual(distances, sorted(distances))
+
+
+if __name__ == "__main__":
+    unittest.main()
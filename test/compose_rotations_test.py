@@ -3,6 +3,7 @@ Created on Jul 3, 2017
 
 @author: Viktor Simjanoski
 '''
+import itertools
 import unittest
 from povs_isomeriser.rotation import Rotation
 from povs_isomeriser.compose_rotations import compose_rotations, \
@@ -55,6 +56,28 @@ class ComposeRotationsTest(unittest.TestCase):
         all_rots = all_rotations_combos([rot1, rot2, rot3])
         self.assertEqual(len(all_rots), 24)
 
+    def test_all_combos_same_as_products(self):
+        rot1 = Rotation(mapping={'A1':'B1', 'B1':'A2', 'A2':'B2', 'B2':'A1', 'C1':'C1', 'C2':'C2'})
+        rot2 = Rotation(mapping={'A1':'C1', 'C1':'A2', 'A2':'C2', 'C2':'A1', 'B1':'B1', 'B2':'B2'})
+        rot3 = Rotation(mapping={'B1':'C1', 'C1':'B2', 'B2':'C2', 'C2':'B1', 'A1':'A1', 'A2':'A2'})
+        products = set()
+        for rots in itertools.permutations([rot1, rot2, rot3]):
+            for powers in itertools.product(*[range(rot.degree) for rot in rots]):
+                products.add(compose_rotations([rot.power(p) for rot, p in zip(rots, powers)]))
+        self.assertEqual(all_rotations_combos([rot1, rot2, rot3]), products)
+        
+    def test_all_combos_redundant(self):
+        rot1 = Rotation(mapping={1:2, 2:3, 3:4, 4:1})
+        all_rots = all_rotations_combos([rot1, rot1.power(2), rot1.power(3), rot1.inverse()])
+        self.assertEqual(all_rots, set(rot1.power(p) for p in range(4)))
+        
+    def test_all_combos_icosahedral(self):
+        # the rotation group of the icosahedron is isomorphic to A5, generated by a 5-cycle and a 3-cycle
+        rot1 = Rotation(mapping={1:2, 2:3, 3:4, 4:5, 5:1})
+        rot2 = Rotation(mapping={1:2, 2:3, 3:1, 4:4, 5:5})
+        all_rots = all_rotations_combos([rot1, rot2])
+        self.assertEqual(len(all_rots), 60)
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
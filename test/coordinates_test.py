@@ -0,0 +1,85 @@
+'''
+Created on Oct 18, 2026
+'''
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from povs_isomeriser.coordinates import (read_xyz, coordinate_distances, point_group_permutations,
+                                         geometry_from_coordinates, generators, write_coordinates_spec)
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.cycle_index import count_colorings_by_zeros
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.rbc_colorings import construct_rbc_rots
+
+
+def _rbc_sites():
+    """
+    The sites of the rbc geometry: the 6 vertices of an octahedron and the 12 midpoints of its edges.
+    """
+    names, coords = [], []
+    for axis in range(3):
+        for sign in (1, -1):
+            coords.append(2 * sign * np.eye(3)[axis])
+            names.append('M{}'.format(len(names) + 1))
+    for axis0, axis1 in itertools.combinations(range(3), 2):
+        for sign0, sign1 in itertools.product((1, -1), repeat=2):
+            coords.append(sign0 * np.eye(3)[axis0] + sign1 * np.eye(3)[axis1])
+            names.append('m{}'.format(len(names) + 1))
+    return names, np.array(coords)
+
+
+class CoordinatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_point_groups(self):
+        tetrahedron = [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]
+        self.assertEqual(len(point_group_permutations(tetrahedron)), 12)
+        square = [[1, 0, 0], [0, 1, 0], [-1, 0, 0], [0, -1, 0]]
+        self.assertEqual(len(point_group_permutations(square)), 8)
+        self.assertEqual(len(point_group_permutations(square, species='ABAB')), 4)
+        self.assertEqual(len(point_group_permutations(square, species='AABB')), 2)
+        self.assertRaises(AssertionError, point_group_permutations, [[0, 0, 1], [0, 0, 2], [0, 0, -3]])
+
+    def test_rbc(self):
+        names, coords = _rbc_sites()
+        noisy = coords + 1e-5 * np.random.RandomState(0).rand(*coords.shape)
+        rotations, distances, orbits = geometry_from_coordinates(names, noisy)
+        self.assertEqual(sorted(rot.cycle_type for rot in rotations),
+                         sorted(rot.cycle_type for rot in construct_rbc_rots()))
+        self.assertEqual([len(orbit) for orbit in orbits], [6, 12])
+        self.assertEqual(all_rotations_combos(generators(rotations)), set(rotations))
+        # equivalent pairs get exactly the same distance despite the noise
+        self.assertEqual(len(set(distances[0].tolist())), len(set(np.round(coordinate_distances(coords)[0], 6))))
+        order = np.argsort(names)
+        self.assertLess(np.abs(distances - coordinate_distances(noisy[order])).max(), 1e-4)
+
+    def test_spec(self):
+        names, coords = _rbc_sites()
+        path = os.path.join(self.tmp_dir, 'cage.json')
+        spec = write_coordinates_spec(path, 'cage', names, coords, class_names=['4', '2'], decimals=6)
+        self.assertEqual(spec['group_order'], 24)
+        self.assertEqual(spec['site_classes'][0]['labels'], {'M1': 1, 'M2': 2, 'M3': 3, 'M4': 4, 'M5': 5, 'M6': 6})
+        geometry = load_geometry(path, False)
+        self.assertEqual(count_colorings_by_zeros(geometry.rotations), count_colorings_by_zeros(construct_rbc_rots()))
+
+    def test_read_xyz(self):
+        path = os.path.join(self.tmp_dir, 'cluster.xyz')
+        with open(path, 'w') as xyz_file:
+            xyz_file.write('3\ncomment\nW 0.0 0.0 0.0\nO 1.0 0.0 0.0\nO -1.0 0.5 0.0\n')
+        names, species, coords = read_xyz(path, elements=['O'])
+        self.assertEqual(names, ['O1', 'O2'])
+        self.assertEqual(species, ['O', 'O'])
+        self.assertEqual(coords.tolist(), [[1.0, 0.0, 0.0], [-1.0, 0.5, 0.0]])
+        self.assertEqual(read_xyz(path)[0], ['W1', 'O1', 'O2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,12 @@ Created on Jul 3, 2017
 
 @author: Viktor Simjanoski
 '''
+import itertools
 import unittest
 from povs_isomeriser.compose_rotations import all_rotations_combos
 from povs_isomeriser.rotation import Rotation
-from povs_isomeriser.count_all_colorings import count_all_colorings
+from povs_isomeriser.count_all_colorings import count_all_colorings, BitmaskColorings
+from povs_isomeriser.rotation_group import RotationGroup
 
 
 class CountAllColoringsTest(unittest.TestCase):
@@ -33,6 +35,66 @@ class CountAllColoringsTest(unittest.TestCase):
             unique_colorings, _ = count_all_colorings(all_rots, zeros=zeros, ones=ones)
             all_ways +=len(unique_colorings)
         self.assertEqual(all_ways, 10)
+
+    def test_all_colorings(self):
+        all_rotations = all_rotations_combos([Rotation({1:2, 2:3, 3:4, 4:1})])
+        unique_colorings, all_colorings = count_all_colorings(all_rotations, zeros=2, ones=2)
+        self.assertEqual(unique_colorings, set([((1, '0'), (2, '0'), (3, '1'), (4, '1')),
+                                                ((1, '0'), (2, '1'), (3, '0'), (4, '1'))]))
+        self.assertEqual(all_colorings, set(['0011', '0110', '1100', '1001', '0101', '1010']))
+
+
+class BitmaskColoringsTest(unittest.TestCase):
+
+    def setUp(self):
+        rot1 = Rotation(mapping={'A1':'B1', 'B1':'A2', 'A2':'B2', 'B2':'A1', 'C1':'C1', 'C2':'C2'})
+        rot2 = Rotation(mapping={'A1':'C1', 'C1':'A2', 'A2':'C2', 'C2':'A1', 'B1':'B1', 'B2':'B2'})
+        self.all_rots = all_rotations_combos([rot1, rot2])
+        self.colorings = BitmaskColorings(self.all_rots)
+
+    def test_masks(self):
+        mask = self.colorings.to_mask((0, 2))
+        self.assertEqual(self.colorings.to_string(mask), '010111')
+        self.assertEqual(self.colorings.zero_indices(mask), (0, 2))
+        self.assertEqual(self.colorings.to_coloring(mask), (('A1', '0'), ('A2', '1'), ('B1', '0'),
+                                                             ('B2', '1'), ('C1', '1'), ('C2', '1')))
+
+    def test_rotate(self):
+        for ix, rot in enumerate(self.colorings.rotations):
+            for zero_indices in itertools.combinations(range(6), 2):
+                coloring = dict(self.colorings.to_coloring(self.colorings.to_mask(zero_indices)))
+                rotated = ''.join(coloring[rot[v]] for v in self.colorings.vertices)
+                rotated_mask = self.colorings.rotate(self.colorings.to_mask(zero_indices), ix)
+                self.assertEqual(self.colorings.to_string(rotated_mask), rotated)
+
+    def test_unique_masks(self):
+        # adjacent and opposite faces of the cube
+        masks = list(self.colorings.unique_masks(2))
+        self.assertEqual([self.colorings.zero_indices(mask) for mask in masks], [(0, 1), (0, 2)])
+        self.assertEqual(len(self.colorings.orbit(masks[0])), 3)
+        self.assertEqual(len(self.colorings.orbit(masks[1])), 12)
+        self.assertTrue(all(self.colorings.canonical(m) == masks[0] for m in self.colorings.orbit(masks[0])))
+
+    def test_canonical_orbit_size(self):
+        for zeros in range(7):
+            for zero_indices in itertools.combinations(range(6), zeros):
+                mask = self.colorings.to_mask(zero_indices)
+                size = len(self.colorings.orbit(mask)) if self.colorings.is_canonical(mask) else 0
+                self.assertEqual(self.colorings.canonical_orbit_size(mask), size)
+                self.assertEqual(self.colorings.canonical_orbit_size_counted(mask)[0], size)
+
+    def test_rotation_sets(self):
+        group = RotationGroup(self.all_rots)
+        self.assertIs(BitmaskColorings(group).group, group)
+        self.assertEqual(self.colorings.rotations, group.elements)
+        self.assertEqual(self.colorings.perms.tolist(), group.perms.tolist())
+        # a set that is not closed is accepted, but it has no group
+        rot = Rotation({1:2, 2:3, 3:4, 4:1})
+        colorings = BitmaskColorings([rot, Rotation.identity(rot.table)])
+        self.assertEqual(colorings.to_string(colorings.rotate(colorings.to_mask((0, 1)), 1)), '0110')
+        with self.assertRaises(Exception) as context:
+            colorings.group
+        self.assertIn('not closed', str(context.exception))
             
 
 
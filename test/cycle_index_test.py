@@ -0,0 +1,50 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+from povs_isomeriser.rotation import Rotation
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.count_all_colorings import count_all_colorings
+from povs_isomeriser.cycle_index import cycle_index, count_colorings, count_colorings_by_zeros, \
+    pattern_inventory
+from povs_isomeriser.rbc_colorings import construct_rbc_rots
+from povs_isomeriser.pseudo_rbc_colorings import construct_pseudo_rbc_rots
+
+
+class CycleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        rot1 = Rotation(mapping={'A1':'B1', 'B1':'A2', 'A2':'B2', 'B2':'A1', 'C1':'C1', 'C2':'C2'})
+        rot2 = Rotation(mapping={'A1':'C1', 'C1':'A2', 'A2':'C2', 'C2':'A1', 'B1':'B1', 'B2':'B2'})
+        self.cube_rots = all_rotations_combos([rot1, rot2])
+
+    def test_cycle_index_cube(self):
+        # rotations of the cube acting on its faces
+        self.assertEqual(cycle_index(self.cube_rots), {(1, 1, 1, 1, 1, 1): 1, (4, 1, 1): 6,
+                                                       (2, 2, 1, 1): 3, (3, 3): 8, (2, 2, 2): 6})
+
+    def test_cube(self):
+        self.assertEqual(count_colorings_by_zeros(self.cube_rots), [1, 1, 2, 2, 2, 1, 1])
+        for zeros in range(7):
+            unique_colorings, _ = count_all_colorings(self.cube_rots, zeros, 6 - zeros)
+            self.assertEqual(count_colorings(self.cube_rots, (zeros, 6 - zeros)), len(unique_colorings))
+
+    def test_three_colors(self):
+        inventory = pattern_inventory(self.cube_rots, num_colors=3)
+        self.assertEqual(sum(inventory.values()), 57)
+        self.assertEqual(inventory[(2, 2, 2)], 6)
+        self.assertEqual(count_colorings(self.cube_rots, (2, 2, 2)), 6)
+        self.assertEqual(count_colorings(self.cube_rots, (1, 2, 3)), 3)
+
+    def test_rbc(self):
+        counts = count_colorings_by_zeros(construct_rbc_rots())
+        self.assertEqual(counts[1:10], [2, 10, 42, 142, 380, 811, 1368, 1872, 2088])
+
+    def test_pseudo_rbc(self):
+        counts = count_colorings_by_zeros(construct_pseudo_rbc_rots())
+        self.assertEqual(counts[1:10], [3, 25, 104, 406, 1080, 2374, 3992, 5550, 6098])
+        self.assertEqual(pattern_inventory(construct_pseudo_rbc_rots())[(9, 9)], 6098)
+
+
+if __name__ == "__main__":
+    unittest.main()
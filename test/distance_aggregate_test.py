@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+'''
+import collections
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_aggregate import (DistanceAggregate, aggregate_levels, read_aggregates,
+                                                write_aggregates)
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+
+
+class DistanceAggregateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = load_geometry('rbc', False)
+        self.colorings = BitmaskColorings(self.geometry.group)
+        self.levels = dict(orderly_scored_levels(self.colorings, ExactPairDistances(self.geometry.distances), 5))
+
+    def test_update(self):
+        dists = [dist for _, dist, _ in self.levels[5]]
+        aggregate = DistanceAggregate(300.0, 700.0, 8).update(dists)
+        self.assertEqual(aggregate.count, len(dists))
+        self.assertEqual(aggregate.minimum, min(dists))
+        self.assertEqual(aggregate.maximum, max(dists))
+        self.assertEqual(aggregate.ties, collections.Counter(dists))
+        self.assertEqual(aggregate.histogram.tolist(), np.histogram(dists, aggregate.bin_edges())[0].tolist())
+        self.assertEqual(aggregate.underflow + aggregate.overflow, 0)
+        aggregate.add(1000.0)
+        self.assertEqual((aggregate.overflow, aggregate.maximum), (1, 1000.0))
+
+    def test_merge(self):
+        dists = [dist for _, dist, _ in self.levels[5]]
+        whole = DistanceAggregate(300.0, 700.0).update(dists)
+        merged = DistanceAggregate(300.0, 700.0)
+        for start in range(0, len(dists), 37):
+            merged.merge(DistanceAggregate(300.0, 700.0).update(dists[start:start + 37]))
+        merged.merge(DistanceAggregate(300.0, 700.0))
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+        with self.assertRaises(Exception):
+            merged.merge(DistanceAggregate(300.0, 700.0, 10))
+
+    def test_levels(self):
+        serial = dict(aggregate_levels(self.colorings, self.geometry.distances, 5, num_bins=12))
+        pooled = dict(aggregate_levels(self.colorings, self.geometry.distances, 5, processes=2, num_bins=12))
+        self.assertEqual(sorted(serial), list(range(1, 6)))
+        for zeros, scored_masks in self.levels.items():
+            self.assertEqual(serial[zeros].ties, collections.Counter(dist for _, dist, _ in scored_masks))
+            self.assertEqual(serial[zeros].to_dict(), pooled[zeros].to_dict())
+
+    def test_file(self):
+        aggregates = dict(aggregate_levels(self.colorings, self.geometry.distances, 4))
+        folder_name = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder_name, 'rbc_distances.json')
+            write_aggregates(path, aggregates, 'rbc', decimals=0)
+            loaded = read_aggregates(path)
+        finally:
+            shutil.rmtree(folder_name)
+        self.assertEqual(sorted(loaded), sorted(aggregates))
+        for zeros, aggregate in aggregates.items():
+            self.assertEqual(loaded[zeros].to_dict(), aggregate.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
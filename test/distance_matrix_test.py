@@ -0,0 +1,66 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+import numpy as np
+from povs_isomeriser.distance_matrix import compile_distance_matrix, matrix_distance_func, \
+    metric_violations, validate_distance_matrix, ExactPairDistances, PairDistances
+from povs_isomeriser.average_distance import average_distance
+from povs_isomeriser.pseudo_rbc_colorings import _VERTEX_LABELS, distance_between_two_vertices
+
+
+class DistanceMatrixTest(unittest.TestCase):
+
+    def test_compile(self):
+        distances = compile_distance_matrix([1, 2, 4], lambda x, y: abs(x - y))
+        self.assertEqual(distances.tolist(), [[0, 1, 3], [1, 0, 2], [3, 2, 0]])
+
+    def test_pseudo_rbc(self):
+        vertices = sorted(_VERTEX_LABELS)
+        distances = compile_distance_matrix(vertices, distance_between_two_vertices)
+        self.assertEqual(distances.shape, (18, 18))
+        self.assertTrue((distances == distances.T).all())
+        distance_func = matrix_distance_func(vertices, distances)
+        self.assertEqual(distance_func('X1', 'X2'), 8.1092)
+        self.assertEqual(distance_func('a1x2', 'A1'), distance_between_two_vertices('A1', 'a1x2'))
+
+    def test_validate(self):
+        vertices = sorted(_VERTEX_LABELS)
+        distances = compile_distance_matrix(vertices, distance_between_two_vertices)
+        validate_distance_matrix(distances, vertices)
+        self.assertEqual(metric_violations(distances), ([], []))
+
+    def test_violations(self):
+        distances = np.array([[0, 1, 5], [1, 0, 1], [5, 1.5, 0]])
+        asymmetric, violations = metric_violations(distances)
+        self.assertEqual(asymmetric, [(1, 2)])
+        self.assertEqual(violations, [(0, 1, 2), (2, 1, 0)])
+        with self.assertRaises(AssertionError) as context:
+            validate_distance_matrix(distances, ['a', 'b', 'c'])
+        self.assertIn('b-c: 1.0 vs 1.5', str(context.exception))
+        with self.assertRaises(AssertionError) as context:
+            validate_distance_matrix((distances + distances.T) / 2, ['a', 'b', 'c'])
+        self.assertIn('a-b-c: 1.0 + 1.25 < 5.0', str(context.exception))
+
+    def test_exact_pair_distances(self):
+        distances = np.array([[0, 0.1, 0.2], [0.1, 0, 0.3], [0.2, 0.3, 0]])
+        pair_distances = ExactPairDistances(distances)
+        self.assertEqual(pair_distances.average_distance((0, 1, 2)), 0.2)
+        self.assertEqual(pair_distances.average_distance((2, 0, 1)), 0.2)
+        self.assertEqual(pair_distances.average_distance((1,)), 0.0)
+        total = pair_distances.add_point(pair_distances.total((0, 1)), (0, 1), 2)
+        self.assertEqual(total, pair_distances.total((0, 1, 2)))
+        self.assertEqual(pair_distances.average(total, 3), 0.2)
+
+    def test_pair_distances(self):
+        distances = np.array([[0, 0.1, 0.2], [0.1, 0, 0.3], [0.2, 0.3, 0]])
+        pair_distances = PairDistances(distances)
+        distance_func = matrix_distance_func([0, 1, 2], distances)
+        self.assertEqual(pair_distances.average_distance((0, 1, 2)), average_distance((0, 1, 2), distance_func))
+        self.assertNotEqual(pair_distances.average_distance((0, 1, 2)), 0.2)  # (0.1 + 0.2) + 0.3 rounds up
+        self.assertEqual(pair_distances.average_distance((1,)), 0.0)
+        self.assertEqual(ExactPairDistances(distances).average_distance((0, 1, 2)), 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
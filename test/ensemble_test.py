@@ -0,0 +1,83 @@
+'''
+Created on Oct 18, 2026
+'''
+import math
+import unittest
+import numpy as np
+from povs_isomeriser.batch_colorings import orbit_sizes, stabilizer_matrix
+from povs_isomeriser.count_all_colorings import BitmaskColorings, count_all_colorings
+from povs_isomeriser.ensemble import ensemble, ensemble_average
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orderly_colorings import orderly_levels
+
+
+class StabilizerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = load_geometry('rbc', False)
+        self.colorings = BitmaskColorings(self.geometry.group)
+
+    def test_orbit_sizes(self):
+        n = self.colorings.num_vertices
+        group = self.colorings.group
+        for zeros, masks in orderly_levels(self.colorings, 4):
+            sizes = orbit_sizes(self.colorings, masks, block_size=7)
+            self.assertEqual(int(sizes.sum()), math.comb(n, zeros))
+            stabilizers = stabilizer_matrix(self.colorings, masks)
+            for mask, size, row in zip(masks, sizes, stabilizers):
+                orbit, stabilizer = self.colorings.orbit_and_stabilizer(mask)
+                self.assertEqual(len(orbit), size)
+                self.assertEqual(stabilizer, tuple(np.flatnonzero(row).tolist()))
+                self.assertEqual(list(stabilizer), group.subgroup(list(stabilizer)))
+
+    def test_count_all_colorings(self):
+        n = self.colorings.num_vertices
+        unique, _, stabilizers = count_all_colorings(self.geometry.rotations, 2, n - 2, stabilizers=True)
+        self.assertEqual(set(stabilizers), unique)
+        self.assertEqual(sum(size for size, _ in stabilizers.values()), math.comb(n, 2))
+        for size, stabilizer in stabilizers.values():
+            self.assertEqual(size * len(stabilizer), len(self.colorings.rotations))
+
+
+class EnsembleTest(unittest.TestCase):
+
+    def test_populations(self):
+        energies = np.array([0.0, 1.0, 1.0, 3.0])
+        sizes = np.array([1, 2, 4, 8])
+        result = ensemble(energies, sizes, 2.0)
+        weights = sizes * np.exp(-energies / 2.0)
+        np.testing.assert_allclose(result.populations, weights / weights.sum())
+        np.testing.assert_allclose(result.mean_energy, (weights * energies).sum() / weights.sum())
+        np.testing.assert_allclose(result.free_energy, -2.0 * np.log(weights.sum()))
+        np.testing.assert_allclose(result.entropy, (result.mean_energy - result.free_energy) / 2.0)
+        np.testing.assert_allclose(ensemble_average(energies, result.populations), result.mean_energy)
+
+    def test_limits(self):
+        energies = np.array([5.0, 2.0, 2.0, 7.0])
+        sizes = np.array([3, 1, 2, 6])
+        cold = ensemble(energies, sizes, 0.0)
+        np.testing.assert_allclose(cold.populations, [0, 1 / 3, 2 / 3, 0])
+        self.assertEqual(cold.free_energy, 2.0)
+        np.testing.assert_allclose(cold.entropy, np.log(3))
+        hot = ensemble(energies, sizes, 1e12)
+        np.testing.assert_allclose(hot.populations, sizes / sizes.sum())
+        np.testing.assert_allclose(hot.entropy, np.log(sizes.sum()))
+
+    def test_temperatures(self):
+        energies = -np.linspace(1000.0, 1010.0, 50)  # large energies do not overflow the weights
+        sizes = np.arange(1, 51)
+        temperatures = np.array([0.0, 0.5, 3.0])
+        result = ensemble(energies, sizes, temperatures)
+        self.assertEqual(result.populations.shape, (3, 50))
+        for ix, temperature in enumerate(temperatures):
+            single = ensemble(energies, sizes, temperature)
+            np.testing.assert_allclose(result.populations[ix], single.populations)
+            np.testing.assert_allclose(result.free_energy[ix], single.free_energy)
+        values = np.stack([energies, sizes], axis=1)
+        self.assertEqual(ensemble_average(values, result.populations).shape, (3, 2))
+        with self.assertRaises(Exception):
+            ensemble(energies, sizes, -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
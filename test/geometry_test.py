@@ -0,0 +1,85 @@
+'''
+Created on Oct 18, 2026
+'''
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import compile_distance_matrix
+from povs_isomeriser.geometry import load_geometry, read_spec, spec_hash, write_spec, builtin_geometries
+from povs_isomeriser import rbc_colorings, pseudo_rbc_colorings
+
+
+class GeometryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_builtin(self):
+        self.assertEqual(builtin_geometries(), ['pseudo_rbc', 'rbc'])
+
+    def _assert_same_as_driver(self, name, driver, construct_rots):
+        geometry = load_geometry(name, self.cache_dir)
+        rots = construct_rots()
+        self.assertEqual(set(geometry.rotations), set(rots))
+        self.assertEqual(geometry.vertices, next(iter(rots)).vertices)
+        np.testing.assert_array_equal(geometry.distances,
+                                      compile_distance_matrix(geometry.vertices, driver.distance_between_two_vertices))
+        colorings = BitmaskColorings(rots)
+        for mask in colorings.unique_masks(3):
+            coloring = colorings.to_coloring(mask)
+            self.assertEqual(geometry.coloring_to_string(coloring), driver.coloring_to_string(coloring))
+            self.assertEqual(geometry.indices_to_string(colorings.zero_indices(mask)),
+                             driver.coloring_to_string(coloring))
+
+    def test_rbc(self):
+        self._assert_same_as_driver('rbc', rbc_colorings, rbc_colorings.construct_rbc_rots)
+
+    def test_pseudo_rbc(self):
+        self._assert_same_as_driver('pseudo_rbc', pseudo_rbc_colorings, pseudo_rbc_colorings.construct_pseudo_rbc_rots)
+
+    def test_cache(self):
+        geometry = load_geometry('rbc', self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), ['rbc_{}.npz'.format(geometry.hash[:16])])
+        cached = load_geometry('rbc', self.cache_dir)
+        self.assertEqual(cached.hash, geometry.hash)
+        self.assertEqual(cached.rotations, geometry.rotations)
+        np.testing.assert_array_equal(cached.distances, geometry.distances)
+        with np.load(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])) as data:
+            self.assertTrue({'products', 'inverses', 'orders', 'site_classes', 'labels'} <= set(data.files))
+        for name in ('products', 'inverses', 'orders'):
+            np.testing.assert_array_equal(getattr(cached.group, name), getattr(geometry.group, name))
+        np.testing.assert_array_equal(cached.site_classes, geometry.site_classes)
+        np.testing.assert_array_equal(cached.labels, geometry.labels)
+        self.assertEqual(load_geometry('rbc', False).rotations, geometry.rotations)
+
+    def test_changed_spec(self):
+        spec = read_spec('rbc')
+        path = os.path.join(self.cache_dir, 'spec.json')
+        write_spec(path, 'rbc', [(c['name'], c['labels']) for c in spec['site_classes']], spec['generators'],
+                   distances=load_geometry('rbc', False).distances, group_order=24, output=spec['output'])
+        self.assertEqual(spec_hash(read_spec(path)), spec_hash(spec))
+        spec['distances'][0][2] += 1.0
+        with open(path, 'w') as spec_file:
+            json.dump(spec, spec_file)
+        self.assertNotEqual(spec_hash(read_spec(path)), spec_hash(read_spec('rbc')))
+        self.assertRaises(AssertionError, load_geometry, path, self.cache_dir)
+
+    def test_missing_distance(self):
+        spec = read_spec('pseudo_rbc')
+        del spec['distances'][5]
+        path = os.path.join(self.cache_dir, 'spec.json')
+        with open(path, 'w') as spec_file:
+            json.dump(spec, spec_file)
+        with self.assertRaisesRegex(AssertionError, 'Missing distances: A1-'):
+            load_geometry(path, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+'''
+Created on Oct 18, 2026
+'''
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from povs_isomeriser.colorings_driver import geometry_colorings
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.cycle_index import count_colorings_by_zeros
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.instrumentation import Instrumentation
+from povs_isomeriser.orderly_colorings import orderly_levels
+from povs_isomeriser.rbc_colorings import construct_rbc_rots
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_progress(self):
+        clock = FakeClock()
+        stream = io.StringIO()
+        reports = []
+        instrumentation = Instrumentation(stream, progress_interval=1.0, progress_callback=reports.append, clock=clock)
+        for step in range(30):
+            clock.now = step * 0.25
+            instrumentation.progress('enumerate', step * 10, 1000)
+        self.assertEqual([report['done'] for report in reports], [0, 40, 80, 120, 160, 200, 240, 280])
+        self.assertEqual(reports[-1]['rate'], 40.0)
+        self.assertEqual(reports[-1]['eta_seconds'], 18.0)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines, reports)
+
+    def test_stages(self):
+        clock = FakeClock()
+        instrumentation = Instrumentation(clock=clock)
+        with instrumentation.stage('tables', zeros=3):
+            clock.now += 2.0
+        items = list(instrumentation.timed('enumerate', iter([(1, 'a'), (2, 'bc')]), lambda item: {'zeros': item[0]}))
+        self.assertEqual(items, [(1, 'a'), (2, 'bc')])
+        self.assertEqual([(e['stage'], e['seconds'], e['zeros']) for e in instrumentation.events],
+                         [('tables', 2.0, 3), ('enumerate', 0.0, 1), ('enumerate', 0.0, 2)])
+
+    def test_timed_streams(self):
+        clock = FakeClock()
+        instrumentation = Instrumentation(clock=clock)
+
+        def items(n):
+            for item in range(n):
+                clock.now += 0.5
+                yield item
+
+        def streams():
+            for key, n in ((1, 2), (2, 4), (3, None)):
+                clock.now += 1.0
+                yield key, None if n is None else items(n)
+        for key, stream in instrumentation.timed_streams('enumerate', streams(), lambda key: {'zeros': key}):
+            with instrumentation.stage('write', zeros=key):
+                clock.now += 3.0
+                if stream is not None:
+                    self.assertEqual(list(stream), list(range(2 * key)))
+        self.assertEqual([(e['stage'], e['seconds'], e['zeros']) for e in instrumentation.events],
+                         [('enumerate', 2.0, 1), ('write', 3.0, 1), ('enumerate', 3.0, 2), ('write', 3.0, 2),
+                          ('enumerate', 1.0, 3), ('write', 3.0, 3)])
+
+    def test_driver_counters(self):
+        expected = count_colorings_by_zeros(BitmaskColorings(construct_rbc_rots()).rotations)
+        folder_name = tempfile.mkdtemp()
+        counters = []
+        try:
+            for checkpoint_interval in (None, 60.0):
+                geometry = load_geometry('rbc', False)
+                geometry.folder_name = os.path.join(folder_name, str(checkpoint_interval))
+                geometry.max_zeros = 4
+                instrumentation = Instrumentation()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    geometry_colorings(geometry, instrumentation=instrumentation,
+                                       checkpoint_interval=checkpoint_interval)
+                stages = [(e['stage'], e['zeros']) for e in instrumentation.events
+                          if e['event'] == 'stage' and e['stage'] != 'tables']
+                self.assertEqual(stages, [(stage, zeros) for zeros in range(1, 5) for stage in ('enumerate', 'write')])
+                counters.append(instrumentation.counters)
+        finally:
+            shutil.rmtree(folder_name)
+        self.assertEqual(counters[0]['representatives'], sum(expected[1:5]))
+        self.assertGreater(counters[0]['combinations'], 0)
+        self.assertEqual(counters[1], counters[0])
+
+    def test_orderly_counters(self):
+        colorings = BitmaskColorings(construct_rbc_rots())
+        instrumentation = Instrumentation(progress_interval=0.0)
+        expected = count_colorings_by_zeros(colorings.rotations)
+        instrumentation.totals['representatives'] = sum(expected[1:5])
+        levels = list(orderly_levels(colorings, 4, instrumentation))
+        self.assertEqual(levels, list(orderly_levels(colorings, 4)))
+        counters = instrumentation.counters
+        self.assertEqual(counters['representatives'], sum(expected[1:5]))
+        # every canonical parent with last zero at ix tries the vertices after ix
+        parents = [colorings.full_mask] + [mask for _, masks in levels[:3] for mask in masks]
+        visited = sum(colorings.num_vertices - (colorings.zero_indices(mask) or (-1,))[-1] - 1 for mask in parents)
+        self.assertEqual(counters['combinations'], visited)
+        self.assertGreaterEqual(counters['rotations'], counters['combinations'])
+        self.assertLessEqual(counters['rotations'], counters['combinations'] * 24)
+        self.assertEqual(instrumentation.events[-1]['event'], 'progress')
+        self.assertEqual(instrumentation.summary()['representatives'], sum(expected[1:5]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+'''
+Created on Oct 18, 2026
+'''
+import contextlib
+import io
+import random
+import shutil
+import tempfile
+import unittest
+from povs_isomeriser.colorings_driver import geometry_colorings, parse_args
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.isomer_index import build_index, IsomerIndex
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.ranked_output import RankedColorings
+
+
+class IsomerIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index_dir = tempfile.mkdtemp()
+        self.geometry = load_geometry('pseudo_rbc', False)
+        build_index(self.geometry, [3, 4], self.index_dir)
+        self.isomer_index = IsomerIndex(self.geometry, self.index_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.index_dir)
+
+    def test_lookup(self):
+        colorings = BitmaskColorings(self.geometry.rotations)
+        label = lambda mask: self.geometry.indices_to_string(colorings.zero_indices(mask))
+        levels = dict(orderly_scored_levels(colorings, ExactPairDistances(self.geometry.distances), 4))
+        ranked = list(RankedColorings(label).extend(levels[4]))
+        rng = random.Random(0)
+        for _ in range(20):
+            mask = colorings.to_mask(sorted(rng.sample(range(colorings.num_vertices), 4)))
+            sites = [colorings.vertices[ix] for ix in colorings.zero_indices(mask)]
+            rank, pattern_label, dist = self.isomer_index.lookup(sites)
+            self.assertEqual(ranked[rank - 1], (pattern_label, dist))
+            self.assertEqual(pattern_label, label(colorings.canonical(mask)))
+
+    def test_batch(self):
+        rng = random.Random(1)
+        vertices = self.geometry.vertices
+        patterns = [rng.sample(vertices, rng.choice([3, 4])) for _ in range(500)]
+        ranks, distances, keys = self.isomer_index.lookup_batch(patterns)
+        for ix in range(0, 500, 37):
+            rank, _, dist = self.isomer_index.lookup(patterns[ix])
+            self.assertEqual((int(ranks[ix]), float(distances[ix])), (rank, dist))
+            self.assertEqual(int(keys[ix]), self.isomer_index.colorings.canonical(
+                self.isomer_index.colorings.to_mask(sorted(self.geometry.table.index[v] for v in patterns[ix]))))
+
+    def test_missing(self):
+        with self.assertRaisesRegex(Exception, 'No index for 2 zeros'):
+            self.isomer_index.lookup(['A1', 'B1'])
+        rbc_index = IsomerIndex(load_geometry('rbc', False), self.index_dir)
+        rbc_index.geometry.file_prefix = 'pseudo_rbc'
+        with self.assertRaisesRegex(Exception, 'different geometry'):
+            rbc_index.lookup(['A1', 'B1', 'C1'])
+
+    def test_selection_rejected(self):
+        # an index of the selected colorings only would not find the others
+        self.assertTrue(parse_args('', ['--index', '--smallest', '--binary']).index)
+        for options in (['--top', '5'], ['--min-distance', '500']):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                parse_args('', ['--index'] + options)
+        with self.assertRaisesRegex(Exception, 'isomer index'):
+            geometry_colorings(self.geometry, top=5, index=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+import numpy as np
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orbit_sampling import OrbitSampler, estimate
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+
+
+class OrbitSamplingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = load_geometry('rbc', False)
+        self.colorings = BitmaskColorings(self.geometry.group)
+        self.levels = dict(orderly_scored_levels(self.colorings, ExactPairDistances(self.geometry.distances), 5))
+
+    def sampler(self, seed=7):
+        return OrbitSampler(self.geometry.group, distances=self.geometry.distances, seed=seed, batch_size=1000)
+
+    def test_batch(self):
+        zero_indices, average_distances, stabilizer_orders = self.sampler().sample_batch(5, 200)
+        pair_distances = ExactPairDistances(self.geometry.distances)
+        for indices, dist, order in zip(zero_indices.tolist(), average_distances, stabilizer_orders):
+            self.assertEqual(len(set(indices)), 5)
+            self.assertAlmostEqual(dist, pair_distances.average_distance(indices))
+            _, stabilizer = self.colorings.orbit_and_stabilizer(self.colorings.to_mask(indices))
+            self.assertEqual(order, len(stabilizer))
+
+    def test_seed(self):
+        first = self.sampler(seed=3).sample(4, 2500)
+        second = self.sampler(seed=3).sample(4, 2500)
+        np.testing.assert_array_equal(first[0], second[0])
+        np.testing.assert_array_equal(first[1], second[1])
+
+    def test_uniform_over_orbits(self):
+        scored = self.levels[5]
+        exact = np.array([dist for _, dist, _ in scored])
+        values, weights = self.sampler().sample(5, 40000)
+        result = estimate(values, weights, quantiles=(0.1, 0.5, 0.9), confidence=0.999)
+        self.assertEqual(result.samples, 40000)
+        self.assertLessEqual(result.mean_interval[0], exact.mean())
+        self.assertLessEqual(exact.mean(), result.mean_interval[1])
+        for q, (low, high) in zip(result.quantiles, result.quantile_intervals):  # the sums may differ in the last bit
+            self.assertLessEqual(low, np.quantile(exact, q, method='inverted_cdf') + 1e-9)
+            self.assertLessEqual(np.quantile(exact, q, method='inverted_cdf'), high + 1e-9)
+        self.assertAlmostEqual(result.histogram.sum(), 1.0)
+        exact_histogram = np.histogram(exact, result.bin_edges)[0] / len(exact)
+        self.assertTrue((np.abs(result.histogram - exact_histogram) < 0.02).all())
+
+    def test_uniform_over_patterns(self):
+        scored = self.levels[4]
+        exact = np.array([dist for _, dist, _ in scored])
+        sizes = np.array([orbit_size for _, _, orbit_size in scored])
+        values, weights = self.sampler().sample(4, 20000, uniform_over='patterns')
+        result = estimate(values, weights, confidence=0.999)
+        self.assertEqual(result.effective_samples, 20000)
+        pattern_mean = (sizes * exact).sum() / sizes.sum()
+        self.assertLessEqual(result.mean_interval[0], pattern_mean)
+        self.assertLessEqual(pattern_mean, result.mean_interval[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+'''
+Created on Oct 18, 2026
+'''
+import unittest
+from povs_isomeriser.rotation import Rotation
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.cycle_index import count_colorings_by_zeros
+from povs_isomeriser.distance_matrix import compile_distance_matrix, ExactPairDistances
+from povs_isomeriser.average_distance import average_distance_from_matrix
+from povs_isomeriser.orderly_colorings import orderly_masks, orderly_levels, orderly_scored_levels, \
+    orderly_scored_streams
+from povs_isomeriser.pseudo_rbc_colorings import construct_pseudo_rbc_rots, distance_between_two_vertices
+
+
+class OrderlyColoringsTest(unittest.TestCase):
+
+    def test_cube(self):
+        rot1 = Rotation(mapping={'A1':'B1', 'B1':'A2', 'A2':'B2', 'B2':'A1', 'C1':'C1', 'C2':'C2'})
+        rot2 = Rotation(mapping={'A1':'C1', 'C1':'A2', 'A2':'C2', 'C2':'A1', 'B1':'B1', 'B2':'B2'})
+        colorings = BitmaskColorings(all_rotations_combos([rot1, rot2]))
+        levels = list(orderly_levels(colorings, 6))
+        self.assertEqual([zeros for zeros, _ in levels], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([len(masks) for _, masks in levels], [1, 2, 2, 2, 1, 1])
+
+    def test_same_as_enumeration(self):
+        all_rots = construct_pseudo_rbc_rots()
+        colorings = BitmaskColorings(all_rots)
+        expected_counts = count_colorings_by_zeros(all_rots)
+        for zeros, masks in orderly_levels(colorings, 6):
+            self.assertEqual(masks, list(colorings.unique_masks(zeros)))
+            self.assertEqual(len(masks), expected_counts[zeros])
+
+    def test_stream(self):
+        colorings = BitmaskColorings(all_rotations_combos([Rotation({1:2, 2:3, 3:4, 4:1})]))
+        self.assertEqual([(zeros, colorings.zero_indices(mask)) for zeros, mask in orderly_masks(colorings, 4)],
+                         [(1, (0,)), (2, (0, 1)), (2, (0, 2)), (3, (0, 1, 2)), (4, (0, 1, 2, 3))])
+
+    def test_scored(self):
+        all_rots = construct_pseudo_rbc_rots()
+        colorings = BitmaskColorings(all_rots)
+        distances = compile_distance_matrix(colorings.vertices, distance_between_two_vertices)
+        pair_distances = ExactPairDistances(distances)
+        levels = list(orderly_scored_levels(colorings, pair_distances, 5))
+        self.assertEqual([(zeros, [mask for mask, _, _ in scored]) for zeros, scored in levels],
+                         list(orderly_levels(colorings, 5)))
+        for zeros, scored in levels:
+            for mask, dist, orbit_size in scored:
+                self.assertEqual(orbit_size, len(colorings.orbit(mask)))
+                zero_indices = colorings.zero_indices(mask)
+                self.assertEqual(dist, pair_distances.average_distance(zero_indices))
+                self.assertAlmostEqual(dist, average_distance_from_matrix(zero_indices, distances), places=10)
+        streams = [(zeros, list(scored)) for zeros, scored in orderly_scored_streams(colorings, pair_distances, 5)]
+        self.assertEqual(streams, levels)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+'''
+Created on Oct 18, 2026
+'''
+import itertools
+import math
+import unittest
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import compile_distance_matrix, ExactPairDistances
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.parallel_colorings import rank_combination, unrank_combination, \
+    combinations_range, canonical_range, rank_ranges, parallel_scored_levels
+from povs_isomeriser.pseudo_rbc_colorings import construct_pseudo_rbc_rots, distance_between_two_vertices
+
+
+class ParallelColoringsTest(unittest.TestCase):
+
+    def test_rank_unrank(self):
+        for size in range(0, 6):
+            for rank, combination in enumerate(itertools.combinations(range(7), size)):
+                self.assertEqual(rank_combination(combination, 7), rank)
+                self.assertEqual(unrank_combination(rank, 7, size), combination)
+
+    def test_combinations_range(self):
+        combinations = list(itertools.combinations(range(8), 3))
+        self.assertEqual(list(combinations_range(8, 3, 10, 30)), combinations[10:30])
+        self.assertEqual(list(combinations_range(8, 3, 50, 56)), combinations[50:])
+        self.assertEqual(list(combinations_range(8, 0, 0, 1)), [()])
+        self.assertEqual(rank_ranges(8, 3, 20), [(0, 20), (20, 40), (40, 56)])
+
+    def test_same_as_orderly(self):
+        all_rots = construct_pseudo_rbc_rots()
+        colorings = BitmaskColorings(all_rots)
+        distances = compile_distance_matrix(colorings.vertices, distance_between_two_vertices)
+        pair_distances = ExactPairDistances(distances)
+        expected = list(orderly_scored_levels(colorings, pair_distances, 5))
+        split = [canonical_range(colorings, pair_distances, 4, start, stop)
+                 for start, stop in rank_ranges(18, 4, 1000)]
+        self.assertEqual(list(itertools.chain(*split)), expected[3][1])
+        self.assertEqual(len(split), math.ceil(math.comb(18, 4) / 1000))
+        self.assertEqual(list(parallel_scored_levels(all_rots, distances, range(1, 6), processes=2)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+'''
+Created on Oct 18, 2026
+'''
+import os
+import shutil
+import tempfile
+import unittest
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import compile_distance_matrix, ExactPairDistances
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.ranked_output import RankedColorings
+from povs_isomeriser.rbc_colorings import construct_rbc_rots, distance_between_two_vertices, coloring_to_string
+
+
+class RankedOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.colorings = BitmaskColorings(construct_rbc_rots())
+        distances = compile_distance_matrix(self.colorings.vertices, distance_between_two_vertices)
+        self.scored_masks = dict(orderly_scored_levels(self.colorings, ExactPairDistances(distances), 5))[5]
+        self.labelled = []
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _label(self, mask):
+        self.labelled.append(mask)
+        return coloring_to_string(self.colorings.to_coloring(mask))
+
+    def _expected(self, reverse=False):
+        ranked = [(self._label(mask), dist) for mask, dist, _ in self.scored_masks]
+        self.labelled = []
+        sign = 1 if reverse else -1
+        return sorted(ranked, key=lambda x: (sign * x[1], len(x[0]), x[0]))
+
+    def test_in_memory(self):
+        ranked = RankedColorings(self._label).extend(self.scored_masks)
+        self.assertEqual(len(ranked), len(self.scored_masks))
+        self.assertEqual(list(ranked), self._expected())
+
+    def test_spilled(self):
+        ranked = RankedColorings(self._label, run_size=10, tmp_dir=self.tmp_dir).extend(self.scored_masks)
+        self.assertEqual(len(os.listdir(self.tmp_dir)), 1)
+        self.assertEqual(list(ranked), self._expected())
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        smallest = RankedColorings(self._label, smallest=True, run_size=7, tmp_dir=self.tmp_dir)
+        self.assertEqual(list(smallest.extend(self.scored_masks)), self._expected(reverse=True))
+        orbit_sizes = {mask: orbit_size for mask, _, orbit_size in self.scored_masks}
+        spilled = RankedColorings(self._label, run_size=10, tmp_dir=self.tmp_dir).extend(self.scored_masks)
+        for _, _, mask, orbit_size in spilled.rows():
+            self.assertEqual(orbit_size, orbit_sizes[mask])
+
+    def test_top(self):
+        expected = self._expected()
+        for top in (1, 5, 17, len(expected), len(expected) + 3):
+            ranked = RankedColorings(self._label, top=top).extend(self.scored_masks)
+            self.assertEqual(len(ranked), min(top, len(expected)))
+            self.assertEqual(list(ranked), expected[:top])
+        # only the kept colorings and the ties for the last place are labelled
+        self.labelled = []
+        list(RankedColorings(self._label, top=5).extend(self.scored_masks))
+        last = expected[4][1]
+        self.assertEqual(len(self.labelled), sum(1 for _, dist in expected if dist >= last))
+        smallest = RankedColorings(self._label, top=9, smallest=True).extend(self.scored_masks)
+        self.assertEqual(list(smallest), self._expected(reverse=True)[:9])
+
+    def test_min_dist(self):
+        expected = [coloring for coloring in self._expected() if coloring[1] >= 600]
+        ranked = RankedColorings(self._label, min_dist=600).extend(self.scored_masks)
+        self.assertEqual(len(ranked), len(expected))
+        self.assertEqual(list(ranked), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
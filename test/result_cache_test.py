@@ -0,0 +1,87 @@
+'''
+Created on Oct 18, 2026
+'''
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from povs_isomeriser.colorings_driver import geometry_colorings
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.result_cache import ResultCache, ranked_results, result_key
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = load_geometry('rbc', False)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_keys(self):
+        key = result_key(self.geometry, 3)
+        self.assertEqual(key, result_key(load_geometry('rbc', False), 3))
+        other_keys = [result_key(self.geometry, 4), result_key(self.geometry, 3, top=5),
+                      result_key(self.geometry, 3, smallest=True), result_key(self.geometry, 3, min_dist=400.0),
+                      result_key(load_geometry('pseudo_rbc', False), 3)]
+        self.assertEqual(len(set(other_keys + [key])), 6)
+
+    def test_hits_and_misses(self):
+        cache = ResultCache(self.dir)
+        tables = ranked_results(self.geometry, [2, 4], top=20, cache=cache)
+        self.assertEqual((cache.hits, cache.misses, cache.writes), (0, 2, 2))
+        self.assertEqual([len(tables[2]), len(tables[4])], [10, 20])
+        self.assertTrue((np.diff(tables[4]['distance']) <= 0).all())
+        again = ranked_results(self.geometry, [4, 2], top=20, cache=cache)
+        self.assertEqual((cache.hits, cache.misses, cache.writes), (2, 2, 2))
+        for zeros in (2, 4):
+            for field in ('mask', 'distance', 'orbit_size', 'class_counts'):
+                np.testing.assert_array_equal(again[zeros][field], tables[zeros][field])
+        ranked_results(self.geometry, [2, 3], top=20, cache=cache)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (3, 3, 3))
+
+    def test_eviction(self):
+        tables = ranked_results(self.geometry, [3, 4, 5], cache=ResultCache(self.dir))
+        cache = ResultCache(self.dir)
+        keys = [result_key(self.geometry, zeros) for zeros in (3, 4, 5)]
+        for age, key in zip((30, 20, 10), keys):  # 3 zeros is the least recently used
+            path = os.path.join(self.dir, key + '.bin')
+            os.utime(path, (os.path.getmtime(path) - age,) * 2)
+        self.assertIsNotNone(cache.get(keys[0]))  # now 4 zeros is
+        sizes = {path: size for _, size, path in cache.entries()}
+        cache.max_bytes = sum(sizes.values()) - 1
+        cache.put(keys[2], tables[5], self.geometry, 5)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_driver(self):
+        self.geometry.folder_name = os.path.join(self.dir, 'out_rbc')
+        self.geometry.max_zeros = 5
+        cache_dir = os.path.join(self.dir, 'results')
+        outputs = []
+        for run in range(2):
+            cache = ResultCache(cache_dir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                geometry_colorings(self.geometry, binary=True, cache=cache)
+            outputs.append({})
+            for file_name in os.listdir(self.geometry.folder_name):
+                with open(os.path.join(self.geometry.folder_name, file_name), 'rb') as in_file:
+                    outputs[-1][file_name] = in_file.read()
+            self.assertEqual((cache.hits, cache.misses), (0, 5) if run == 0 else (5, 0))
+        self.assertEqual(len(outputs[0]), 10)
+        self.assertEqual(outputs[1], outputs[0])
+        reference_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'out_rbc')
+        with open(os.path.join(reference_dir, 'rbc_5zeros_380.txt'), 'rb') as in_file:
+            self.assertEqual(outputs[1]['rbc_5zeros_380.txt'], in_file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+'''
+Created on Oct 18, 2026
+'''
+import math
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from povs_isomeriser.batch_colorings import orbit_sizes
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import ExactPairDistances
+from povs_isomeriser.geometry import load_geometry
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.ranked_output import RankedColorings
+from povs_isomeriser.result_files import result_table, write_results, load_results, distance_range, text_rows, \
+    fill_result_table, result_dtype
+
+
+class ResultFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.geometry = load_geometry('pseudo_rbc', False)
+        self.colorings = BitmaskColorings(self.geometry.rotations)
+        pair_distances = ExactPairDistances(self.geometry.distances)
+        self.scored_masks = dict(orderly_scored_levels(self.colorings, pair_distances, 4))[4]
+        self.label = lambda mask: self.geometry.indices_to_string(self.colorings.zero_indices(mask))
+        self.ranked = RankedColorings(self.label).extend(self.scored_masks)
+        self.table = result_table(self.colorings, self.geometry, self.ranked)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_table(self):
+        self.assertEqual(len(self.table), len(self.scored_masks))
+        self.assertEqual(int(self.table['orbit_size'].sum()), math.comb(18, 4))
+        self.assertEqual(self.table['class_counts'].sum(axis=1).tolist(), [4] * len(self.table))
+        self.assertEqual(list(text_rows(self.table, self.label)), list(self.ranked))
+        self.assertTrue((np.diff(self.table['distance']) <= 0).all())
+
+    def test_fill(self):
+        labelled = []
+        def label(mask):
+            labelled.append(mask)
+            return self.label(mask)
+        ranked = RankedColorings(label).extend(self.scored_masks)
+        table = np.zeros(len(ranked), dtype=result_dtype(len(self.geometry.class_names)))
+        rows = list(fill_result_table(table, self.colorings, self.geometry, ranked.rows(), block_size=100))
+        self.assertEqual(rows, list(self.ranked))
+        self.assertEqual(sorted(labelled), sorted(mask for mask, _, _ in self.scored_masks))  # every label made once
+        for field in self.table.dtype.names:
+            np.testing.assert_array_equal(table[field], self.table[field])
+        np.testing.assert_array_equal(table['orbit_size'], orbit_sizes(self.colorings, table['mask']))
+        for mask, counts in zip(table['mask'].tolist(), table['class_counts']):
+            classes = self.geometry.site_classes[list(self.colorings.zero_indices(mask))]
+            self.assertEqual(counts.tolist(), np.bincount(classes, minlength=3).tolist())
+
+    def test_round_trip(self):
+        path = os.path.join(self.tmp_dir, 'pseudo_rbc_4zeros.bin')
+        write_results(path, self.table, self.geometry, 4)
+        header, table = load_results(path, self.geometry.hash)
+        self.assertIsInstance(table, np.memmap)
+        self.assertEqual(header['zeros'], 4)
+        self.assertEqual(header['class_names'], ['2', '3', '4'])
+        for field in self.table.dtype.names:
+            np.testing.assert_array_equal(table[field], self.table[field])
+        with self.assertRaisesRegex(Exception, 'different geometry'):
+            load_results(path, load_geometry('rbc', False).hash)
+
+    def test_distance_range(self):
+        distances = self.table['distance']
+        low, high = np.percentile(distances, 25), np.percentile(distances, 75)
+        selected = distance_range(self.table, low, high)
+        self.assertEqual(selected['mask'].tolist(), self.table['mask'][(distances >= low) & (distances <= high)].tolist())
+        self.assertEqual(len(distance_range(self.table, low=low)), int((distances >= low).sum()))
+        self.assertEqual(len(distance_range(self.table, high=high)), int((distances <= high).sum()))
+        ascending = self.table[::-1]
+        self.assertEqual(sorted(distance_range(ascending, low, high, smallest=True)['mask'].tolist()),
+                         sorted(selected['mask'].tolist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+'''
+import collections
+import unittest
+from povs_isomeriser.compose_rotations import all_rotations_combos
+from povs_isomeriser.cycle_index import cycle_index
+from povs_isomeriser.rbc_colorings import construct_rbc_rots
+from povs_isomeriser.rotation import Rotation
+from povs_isomeriser.rotation_group import RotationGroup
+
+
+class RotationGroupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rotations = construct_rbc_rots()
+        self.group = RotationGroup(self.rotations)
+
+    def test_elements(self):
+        self.assertEqual(len(self.group), 24)
+        self.assertEqual(set(self.group), self.rotations)
+        self.assertEqual(self.group[0], Rotation.identity(self.group[0].table))
+        for element, rot in enumerate(self.group):
+            self.assertEqual(self.group.index(rot), element)
+            self.assertEqual(tuple(self.group.perms[element]), rot.perm)
+
+    def test_products_and_inverses(self):
+        group = self.group
+        for a, rot_a in enumerate(group):
+            self.assertEqual(group[group.inverses[a]], rot_a.inverse())
+            for b, rot_b in enumerate(group):
+                self.assertEqual(group[group.products[a, b]], rot_a * rot_b)
+
+    def test_orders_and_powers(self):
+        group = self.group
+        for element, rot in enumerate(group):
+            self.assertEqual(group.orders[element], rot.degree)
+            for n in range(-3, 7):
+                self.assertEqual(group[group.power(element, n)], rot.power(n))
+        # the rotation group of the cube: 1 identity, 9 of order 2, 8 of order 3 and 6 of order 4
+        self.assertEqual(collections.Counter(group.orders.tolist()), {1: 1, 2: 9, 3: 8, 4: 6})
+
+    def test_conjugacy_classes(self):
+        classes = self.group.conjugacy_classes()
+        self.assertEqual(classes[0], (0,))
+        self.assertEqual(sorted(len(c) for c in classes), [1, 3, 6, 6, 8])
+        self.assertEqual(sorted(e for c in classes for e in c), list(range(24)))
+        for conjugacy_class in classes:
+            self.assertEqual(len(set(self.group.cycle_types[e] for e in conjugacy_class)), 1)
+            self.assertEqual(len(set(self.group.orders[list(conjugacy_class)])), 1)
+
+    def test_cycle_index(self):
+        self.assertEqual(self.group.cycle_index(), cycle_index(self.rotations))
+        self.assertEqual(cycle_index(self.group), cycle_index(self.rotations))
+
+    def test_subgroup(self):
+        group = self.group
+        for a in range(len(group)):
+            for b in range(a, len(group), 5):
+                expected = all_rotations_combos([group[a], group[b]])
+                self.assertEqual([group[e] for e in group.subgroup([a, b])],
+                                 sorted(expected, key=lambda rot: rot.perm))
+
+    def test_from_tables(self):
+        group = RotationGroup.from_tables(list(self.rotations)[::-1], self.group.products, self.group.inverses,
+                                          self.group.orders)
+        self.assertEqual(group.elements, self.group.elements)
+        self.assertEqual(group.conjugacy_classes(), self.group.conjugacy_classes())
+        self.assertEqual(group.power(5, -1), self.group.inverses[5])
+
+    def test_not_closed(self):
+        rot = Rotation({1: 2, 2: 3, 3: 1})
+        RotationGroup([Rotation.identity(rot.table), rot, rot.power(2)])
+        with self.assertRaises(Exception):
+            RotationGroup([Rotation.identity(rot.table), rot])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Created on Jul 2, 2017
 
 @author: Viktor Simjanoski
 '''
+import pickle
 import unittest
 from povs_isomeriser.rotation import Rotation
 
@@ -59,6 +60,44 @@ class RotationTest(unittest.TestCase):
         rot8 = rot.power(8)
         self.assertEqual(rot8, Rotation({1:1, 2:2, 3:3, 4:4}))
 
+    def test_mapping(self):
+        mapping = {'A1':'B1', 'B1':'A2', 'A2':'B2', 'B2':'A1', 'C1':'C1', 'C2':'C2'}
+        rot = Rotation(mapping)
+        self.assertEqual(rot.mapping, mapping)
+        self.assertEqual(rot.vertices, ('A1', 'A2', 'B1', 'B2', 'C1', 'C2'))
+        self.assertEqual(rot.perm, (2, 3, 1, 0, 4, 5))
+        self.assertEqual(rot.power(3).mapping, {'A1':'B2', 'B2':'A2', 'A2':'B1', 'B1':'A1', 'C1':'C1', 'C2':'C2'})
+        self.assertEqual(rot['B2'], 'A1')
+
+    def test_cycles(self):
+        rot = Rotation(mapping={1:2, 2:3, 3:1, 4:5, 5:4, 6:6})
+        self.assertEqual(rot.cycles, ((0, 1, 2), (3, 4), (5,)))
+        self.assertEqual(rot.cycle_type, (3, 2, 1))
+        self.assertEqual(rot.degree, 6)
+        self.assertEqual(rot.power(6), Rotation({k:k for k in range(1, 7)}))
+        self.assertEqual(rot.power(-1), rot.power(5))
+
+    def test_inverse_and_compose(self):
+        rot1 = Rotation(mapping={1:3, 2:4, 3:1, 4:2})
+        rot2 = Rotation(mapping={1:2, 2:3, 3:4, 4:1})
+        self.assertEqual(rot1 * rot2, Rotation({1:4, 2:1, 3:2, 4:3}))
+        self.assertEqual(rot2.inverse(), Rotation({2:1, 3:2, 4:3, 1:4}))
+        self.assertEqual(rot2 * rot2.inverse(), Rotation({k:k for k in range(1, 5)}))
+
+    def test_shared_table(self):
+        rot1 = Rotation(mapping={1:2, 2:1, 3:3})
+        rot2 = Rotation(mapping={3:3, 2:2, 1:1})
+        self.assertIs(rot1.table, rot2.table)
+        self.assertNotEqual(rot1, Rotation(mapping={1:2, 2:1}))
+        self.assertEqual(Rotation.from_permutation((1, 0, 2), rot1.table), rot1)
+
+    def test_pickle(self):
+        rot = Rotation(mapping={1:2, 2:3, 3:1})
+        copy = pickle.loads(pickle.dumps(rot))
+        self.assertEqual(copy, rot)
+        self.assertIs(copy.table, rot.table)
+        self.assertEqual(copy.mapping, rot.mapping)
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -0,0 +1,56 @@
+'''
+Created on Oct 18, 2026
+'''
+import os
+import shutil
+import tempfile
+import unittest
+from povs_isomeriser.count_all_colorings import BitmaskColorings
+from povs_isomeriser.distance_matrix import compile_distance_matrix, ExactPairDistances
+from povs_isomeriser.orderly_colorings import orderly_scored_levels
+from povs_isomeriser.shard_colorings import shard_tasks, run_shard, load_shards, merged_scored_levels
+from povs_isomeriser.pseudo_rbc_colorings import construct_pseudo_rbc_rots, distance_between_two_vertices
+
+
+class ShardColoringsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.colorings = BitmaskColorings(construct_pseudo_rbc_rots())
+        self.distances = compile_distance_matrix(self.colorings.vertices, distance_between_two_vertices)
+        self.shard_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.shard_dir)
+
+    def test_tasks(self):
+        tasks = [shard_tasks(18, range(1, 6), shard, 3, chunk_size=500) for shard in range(3)]
+        all_tasks = sorted(task for shard in tasks for task in shard)
+        self.assertEqual(sum(stop - start for _, start, stop in all_tasks), 18 + 153 + 816 + 3060 + 8568)
+        self.assertEqual(tasks[1], shard_tasks(18, range(1, 6), 1, 3, chunk_size=500))
+
+    def test_merge(self):
+        for shard in range(3):
+            run_shard(self.colorings, self.distances, range(1, 6), shard, 3, self.shard_dir, chunk_size=500)
+        expected = list(orderly_scored_levels(self.colorings, ExactPairDistances(self.distances), 5))
+        self.assertEqual(merged_scored_levels(self.colorings, self.shard_dir), expected)
+        _, zeros, keys, _, orbit_sizes = load_shards(self.colorings, self.shard_dir)
+        self.assertEqual(list(orbit_sizes[:3]), [len(self.colorings.orbit(int(key))) for key in keys[:3]])
+        # every orbit once: the orbit sizes of a level add up to C(18, zeros)
+        self.assertEqual(int(orbit_sizes[zeros == 2].sum()), 153)
+
+    def test_missing_shard(self):
+        run_shard(self.colorings, self.distances, range(1, 3), 1, 2, self.shard_dir)
+        with self.assertRaises(Exception) as context:
+            load_shards(self.colorings, self.shard_dir)
+        self.assertIn('Missing shards [0] of 2', str(context.exception))
+        self.assertEqual(os.listdir(self.shard_dir), ['shard_1_of_2.npz'])
+
+    def test_geometry_hash(self):
+        run_shard(self.colorings, self.distances, range(1, 3), 0, 1, self.shard_dir, geometry_hash='abc')
+        self.assertEqual(len(load_shards(self.colorings, self.shard_dir, 'abc')[1]), 28)
+        with self.assertRaisesRegex(Exception, 'for a different geometry'):
+            load_shards(self.colorings, self.shard_dir, 'abd')
+
+
+if __name__ == "__main__":
+    unittest.main()